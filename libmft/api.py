@@ -64,23 +64,40 @@ needs to be correctly processed to show all the data
 
 .. moduleauthor:: Júlio Dantas <jldantas@gmail.com>
 '''
+import io
+import queue
+import asyncio
 import struct
 import logging
+import threading
 
+from array import array as _array
+from bisect import bisect_left as _bisect_left, bisect_right as _bisect_right
 from collections import defaultdict as _defaultdict
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as _FutureTimeoutError
+from functools import lru_cache, partial as _partial
 from operator import itemgetter as _itemgetter
+from sys import intern as _intern
 
 from libmft.util.functions import convert_filetime, apply_fixup_array, flatten, \
-    get_file_size as _get_file_size, get_file_reference
-from libmft.flagsandtypes import MftSignature, AttrTypes, MftUsageFlags
+    get_file_size as _get_file_size, get_file_reference, merge_dataruns, convert_to_filetime
+from libmft.flagsandtypes import MftSignature, AttrTypes, AttrFlags, MftUsageFlags
 from libmft.attribute import StandardInformation, FileName, IndexRoot, Data, \
     AttributeList, Bitmap, ObjectID, VolumeName, VolumeInformation, ReparsePoint, \
-    EaInformation, LoggedToolStream, SecurityDescriptor, Ea
-from libmft.attribute import ResidentAttrHeader, NonResidentAttrHeader, get_attr_info as _get_attr_info
-from libmft.exceptions import FixUpError, DataStreamError, EntryError, MFTError, HeaderError
+    EaInformation, LoggedToolStream, SecurityDescriptor, Ea, Timestamps
+from libmft.attribute import ResidentAttrHeader, NonResidentAttrHeader, get_attr_info as _get_attr_info, \
+    create_projection_parser, _create_projection_func
+from libmft.exceptions import FixUpError, DataStreamError, EntryError, MFTError, HeaderError, \
+    MFTException
 
 _MOD_LOGGER = logging.getLogger(__name__)
+_ATTR_TYPE = struct.Struct("<I")
+_ATTR_END_MARKER = 0xFFFFFFFF
+_ATTR_LENGTH = struct.Struct("<2I")
+_FIXUP_INFO = struct.Struct("<2H")
+_DATA_SIZES = struct.Struct("<3Q") #allocated, real and initialized size of a non resident stream
+_NAMES_HEADER = struct.Struct("<4H") #sequence number, hard links, first attribute, flags
+_FN_TIMESTAMPS = struct.Struct("<4Q") #created, changed, mft changed and accessed of a FILE_NAME
 
 
 class MFTConfig():
@@ -92,8 +109,9 @@ class MFTConfig():
     interpreted. That it is possible to configure the library to be as fast as
     possible.
 
-    Warning:
-        The option of parsing the MFT from an image has not been implemented!
+    Note:
+        To parse the MFT from an image of the volume, use
+        ``libmft.volume.NTFSVolume``.
 
     Attributes:
         entry_size (int): Size of a MFT entry. If it is zero the library will
@@ -112,6 +130,25 @@ class MFTConfig():
         load_dataruns (bool): Enables or disables the parsing of dataruns. If
             you don't have the disk image, loading the dataruns  is pretty useless
             and quite computationally intensive and should be disabled.
+        intern_names (bool): Enables or disables the sharing of names (file
+            names, attribute names and datastream names) between entries. When
+            enabled, equal names point to the same (interned) ``str`` object,
+            which is released once no entry uses it. Default is ``True``.
+        skip_unallocated (bool): If ``True`` and the bitmap of the MFT is
+            available, iterating over the ``MFT`` only reads the records
+            marked as allocated. Default is ``False``.
+        read_ahead (int): Number of buffers read in advance, by a background
+            thread, when iterating over the ``MFT``. ``0`` disables the read
+            ahead. Default is ``0``.
+        read_ahead_size (int): Size, in bytes, of each read ahead buffer.
+            Default is 4MB.
+        async_workers (int): Number of threads used by the asynchronous
+            methods of the ``MFT``. Default is ``2``.
+        async_batch_size (int): Number of entries that are read by a thread
+            before they are given to the event loop. Default is ``64``.
+        header_filter (:obj:`HeaderFilter`): If set, iterating over the
+            ``MFT`` only parses the records accepted by the filter. Default
+            is ``None``.
         load_std_info (bool): Enables or disables the parsing of the
             STANDARD_INFORMATION attribute.
         load_attr_list (bool): Enables or disables the parsing of the
@@ -151,6 +188,13 @@ class MFTConfig():
         self.ignore_signature_check = True
         self.create_initial_information = True
         self.load_dataruns = True
+        self.intern_names = True
+        self.skip_unallocated = False
+        self.read_ahead = 0
+        self.read_ahead_size = 4 * 1024 * 1024
+        self.async_workers = 2
+        self.async_batch_size = 64
+        self.header_filter = None
 
         # the "load attributes" is actually a set object with the entries
         # this allows quick comparison to check if we should parse an attribute
@@ -191,9 +235,143 @@ class MFTConfig():
         return (f'{self.__class__.__name__}(entry_size={self.entry_size}, '
                 f'apply_fixup_array={self.apply_fixup_array}, ignore_signature_check={self.ignore_signature_check}, '
                 f'create_initial_information={self.create_initial_information}, '
-                f'load_dataruns={self.load_dataruns}, _load_attrs={self._load_attrs})'
+                f'load_dataruns={self.load_dataruns}, intern_names={self.intern_names}, '
+                f'skip_unallocated={self.skip_unallocated}, read_ahead={self.read_ahead}, '
+                f'read_ahead_size={self.read_ahead_size}, async_workers={self.async_workers}, '
+                f'async_batch_size={self.async_batch_size}, header_filter={self.header_filter}, '
+                f'_load_attrs={self._load_attrs})'
+               )
+
+class HeaderFilter():
+    '''Selects MFT records based only on the record header.
+
+    The test is done directly on the raw bytes of the record, before the fix
+    up array is applied and before any object is created, so the records that
+    are not needed cost almost nothing. All the fields are in the first
+    sector of the record, not affected by the fix up array.
+
+    Every condition that is not ``None`` has to be true for the record to be
+    accepted. Empty records are never accepted.
+
+    Args:
+        in_use (bool): Only records in use (``True``) or not in use (``False``)
+        directory (bool): Only directories (``True``) or only files (``False``)
+        start (int): First record number
+        end (int): Last record number (exclusive)
+        min_lsn (int): Minimum log file sequence number (LSN)
+        max_lsn (int): Maximum log file sequence number (LSN), inclusive
+        has_base (bool): Only extension records (``True``) or only base
+            records (``False``)
+        baad (bool): Only records with the 'BAAD' signature (``True``) or
+            without it (``False``)
+        predicate (callable): Called as ``predicate(record_number, header)``,
+            where ``header`` is the tuple unpacked by ``MFTHeader._REPR``.
+            The record is accepted if it returns ``True``.
+    '''
+    __slots__ = ("in_use", "directory", "start", "end", "min_lsn", "max_lsn",
+                 "has_base", "baad", "predicate")
+
+    def __init__(self, in_use=None, directory=None, start=None, end=None,
+                 min_lsn=None, max_lsn=None, has_base=None, baad=None, predicate=None):
+        '''See class docstring.'''
+        self.in_use = in_use
+        self.directory = directory
+        self.start = start
+        self.end = end
+        self.min_lsn = min_lsn
+        self.max_lsn = max_lsn
+        self.has_base = has_base
+        self.baad = baad
+        self.predicate = predicate
+
+    def clamp(self, start, end):
+        '''Limits a range of record numbers to the range of the filter.
+
+        Returns:
+            tuple(int, int): The new start and end
+        '''
+        if self.start is not None:
+            start = max(start, self.start)
+        if self.end is not None:
+            end = min(end, self.end)
+        return start, max(start, end)
+
+    def matches(self, record_number, record):
+        '''Tests if a record is accepted by the filter.
+
+        Args:
+            record_number (int): The record number
+            record (buffer): The raw content of the record
+
+        Returns:
+            bool: ``True`` if the record is accepted, ``False`` otherwise
+        '''
+        header = MFTHeader._REPR.unpack_from(record, 0)
+        signature, lsn, flags, base_ref = header[0], header[3], header[7], header[10]
+        if signature == b"\x00\x00\x00\x00":
+            return False
+        if self.start is not None and record_number < self.start:
+            return False
+        if self.end is not None and record_number >= self.end:
+            return False
+        if self.in_use is not None and self.in_use != bool(flags & MftUsageFlags.IN_USE):
+            return False
+        if self.directory is not None and self.directory != bool(flags & MftUsageFlags.DIRECTORY):
+            return False
+        if self.min_lsn is not None and lsn < self.min_lsn:
+            return False
+        if self.max_lsn is not None and lsn > self.max_lsn:
+            return False
+        if self.has_base is not None and self.has_base != bool(base_ref & 0x0000FFFFFFFFFFFF):
+            return False
+        if self.baad is not None and self.baad != (signature == b"BAAD"):
+            return False
+        if self.predicate is not None:
+            return bool(self.predicate(record_number, header))
+        return True
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(in_use={self.in_use}, directory={self.directory}, '
+                f'start={self.start}, end={self.end}, min_lsn={self.min_lsn}, max_lsn={self.max_lsn}, '
+                f'has_base={self.has_base}, baad={self.baad}, predicate={self.predicate})'
                )
 
+def _intern_attribute(attr):
+    '''Replaces the names of an attribute by the interned ones.
+
+    The same names show up over and over in a MFT: DOS and Win32 names for the
+    same file, hard links, names repeated in the INDEX_ROOT entries and
+    stream/index names like ``$I30``, ``$SDH`` or ``Zone.Identifier``. Each
+    name is replaced by the interned one (``sys.intern``), so the duplicates
+    are dropped right after the attribute is parsed. Interned names are
+    released once no entry references them.
+
+    The attribute name (for any attribute) is always processed, plus the
+    names inside the contents of FILE_NAME, ATTRIBUTE_LIST and INDEX_ROOT.
+
+    Args:
+        attr (:obj:`Attribute`): The attribute to be processed
+    '''
+    header = attr.header
+    if header.attr_name is not None:
+        header.attr_name = _intern(header.attr_name)
+
+    content = attr.content
+    if content is None:
+        return
+    attr_type = header.attr_type_id
+    if attr_type is AttrTypes.FILE_NAME:
+        content.name = _intern(content.name)
+    elif attr_type is AttrTypes.ATTRIBUTE_LIST:
+        for entry in content:
+            if entry.name is not None:
+                entry.name = _intern(entry.name)
+    elif attr_type is AttrTypes.INDEX_ROOT:
+        for entry in content.index_entry_list:
+            if isinstance(entry.content, FileName):
+                entry.content.name = _intern(entry.content.name)
+
 class MFTHeader():
     '''Represent the MFT header present in all MFT entries.
 
@@ -285,12 +463,27 @@ class MFTHeader():
             binary_view (memoryview of bytearray) - A binary stream with the
                 information of the attribute
 
+        Returns:
+            MFTHeader: New object using hte binary stream as source
+        '''
+        return cls.create_from_buffer(ignore_signature_check, binary_view, 0)
+
+    @classmethod
+    def create_from_buffer(cls, ignore_signature_check, buffer, offset):
+        '''Creates a new object MFTHeader from a buffer, where the header
+        starts at ``offset``.
+
+        Args:
+            buffer (memoryview of bytearray) - A binary stream with the
+                information of the entry
+            offset (int) - Where the entry starts in the buffer
+
         Returns:
             MFTHeader: New object using hte binary stream as source
         '''
         sig, fx_offset, fx_count, lsn, seq_number, hard_link_count, first_attr_offset, \
         usage_flags, entry_len, alloc_len, base_record, next_attr_id, record_n = \
-            cls._REPR.unpack(binary_view[:cls._REPR.size])
+            cls._REPR.unpack_from(buffer, offset)
 
         baad = None
         if not ignore_signature_check:
@@ -351,7 +544,11 @@ class Datastream():
             this is the size of the file
         alloc_size (int): Allocated size, in bytes, on the disk. This is supposed
             to be different from ``size`` in case of a sparse file
+        init_size (int): Initialized size, in bytes. Everything after it is
+            read as zeros
         cluster_count (int): Number of clusters allocated for the datastream
+        flags (:obj:`AttrFlags`): Flags of the DATA attributes of the
+            datastream (compressed, encrypted or sparse)
     '''
     def __init__(self, name=None):
         '''Initialize on datastream. The only parameter accepted is the
@@ -361,18 +558,22 @@ class Datastream():
         self.name = name
         self.size = 0 #logical size
         self.alloc_size = 0 #allocated size
+        self.init_size = 0 #initialized size
         self.cluster_count = 0
+        self.flags = AttrFlags(0)
         self._data_runs = None #data runs only exist if the attribute is non resident
         #the _data_runs variable stores a tuple with the format:
         #(start_vcn, dataruns). We use the start_vcn to sort the dataruns in
         #the correct order
         self._content = None
         self._data_runs_sorted = False
+        self._extents = None #cache of the merged dataruns, see _get_extents
+        self._extent_vcns = None
 
     def _get_content(self):
-        '''Returns the content of a resident datastream'''
-        #TODO add the ability to load from non-resident when disk image is available
-        if not self.is_resident():
+        '''Returns the content of a resident datastream. For non resident
+        datastreams, use ``open()``.'''
+        if not self.is_resident:
             raise DataStreamError("Non resident datastream don't have content")
 
         return self._content
@@ -398,9 +599,77 @@ class Datastream():
 
         return [data[1] for data in self._data_runs]
 
+    def _get_extents(self):
+        '''Returns the dataruns merged in extents, in order. The result is
+        computed once and kept until more data is added to the datastream.
+        '''
+        if self._data_runs is None:
+            raise DataStreamError("Resident datastream don't have extents")
+
+        if self._extents is None:
+            if not self._data_runs_sorted:
+                self._data_runs.sort(key=_itemgetter(0))
+                self._data_runs_sorted = True
+            self._extents = merge_dataruns(self._data_runs)
+            self._extent_vcns = _array("Q", (extent[0] for extent in self._extents))
+
+        return self._extents
+
+    def get_lcn(self, vcn):
+        '''Returns the cluster on the disk (LCN) of a cluster of the
+        datastream (VCN). The extent is found by binary search.
+
+        Args:
+            vcn (int): The cluster in the datastream
+
+        Returns:
+            int: The LCN or ``None`` if the cluster is sparse
+        '''
+        extents = self._get_extents()
+        index = _bisect_right(self._extent_vcns, vcn) - 1
+        if index >= 0:
+            start_vcn, lcn, count = extents[index]
+            if vcn < start_vcn + count:
+                return None if lcn is None else lcn + vcn - start_vcn
+        raise DataStreamError(f"VCN {vcn} is not mapped by the datastream")
+
+    def open(self, volume, cache_clusters=64):
+        '''Opens the datastream for reading.
+
+        Resident datastreams are read from the loaded content, non resident
+        ones are read from the image of the volume, following the dataruns.
+
+        Note:
+            Compressed (LZNT1) and encrypted (EFS) datastreams are not
+            supported. Their clusters on the disk are not the content of the
+            file, so ``DataStreamError`` is raised instead of returning them.
+
+        Args:
+            volume (:obj:`NTFSVolume`): The volume where the datastream is
+            cache_clusters (int): Number of clusters kept in cache by the
+                reader. ``0`` disables the cache
+
+        Returns:
+            A read only, seekable, file like object with the content of the
+            datastream
+        '''
+        from libmft.volume import NonResidentStream #volume depends on this module
+
+        if self.is_resident:
+            if self._content is None:
+                raise DataStreamError("Content of the datastream was not loaded")
+            return io.BytesIO(self._content)
+        if self.flags & AttrFlags.COMPRESSED:
+            raise DataStreamError(f"Datastream '{self.name}' is compressed, compressed datastreams can't be read")
+        if self.flags & AttrFlags.ENCRYPTED:
+            raise DataStreamError(f"Datastream '{self.name}' is encrypted, encrypted datastreams can't be read")
+        return NonResidentStream(volume.file_pointer, self._get_extents(), volume.cluster_size,
+            self.size, volume.volume_offset, self.init_size, cache_clusters)
+
     content = property(_get_content, doc="The content of a resident datastream")
     is_resident = property(_is_resident, doc="True if the datastream is resident, False otherwise")
     dataruns = property(_get_dataruns, doc="Dataruns associated with a datastream")
+    extents = property(_get_extents, doc="List of (start VCN, LCN, cluster count) with the contiguous dataruns merged")
 
     def add_data_attribute(self, data_attr):
         '''Interprets a DATA attribute and add it to the datastream.'''
@@ -409,6 +678,8 @@ class Datastream():
         if data_attr.header.attr_name != self.name:
             raise DataStreamError(f"Data from a different stream '{data_attr.header.attr_name}' cannot be add to this stream")
 
+        self.flags |= data_attr.header.flags
+
         if data_attr.header.non_resident:
             nonr_header = data_attr.header
             if self._data_runs is None:
@@ -418,10 +689,12 @@ class Datastream():
             if not nonr_header.start_vcn: #start_vcn == 0
                 self.size = nonr_header.curr_sstream
                 self.alloc_size = nonr_header.alloc_sstream
+                self.init_size = nonr_header.init_sstream
             self._data_runs.append((nonr_header.start_vcn, nonr_header.data_runs))
             self._data_runs_sorted = False
+            self._extents = None
         else: #if it is resident
-            self.size = self.alloc_size = data_attr.header.content_len
+            self.size = self.alloc_size = self.init_size = data_attr.header.content_len
             self._pending_processing = None
             #respects mft_config["load_data"]
             self._content = data_attr.content.content
@@ -436,12 +709,15 @@ class Datastream():
 
         if self.cluster_count < source_ds.cluster_count:
             self.cluster_count = source_ds.cluster_count
+        self.flags |= source_ds.flags
         if self.size == 0 and source_ds.size:
             self.size = source_ds.size
             self.alloc_size = source_ds.alloc_size
+            self.init_size = source_ds.init_size
         if source_ds._data_runs:
             self._data_runs += source_ds._data_runs
             self._data_runs_sorted = False
+            self._extents = None
 
     def __iadd__(self, other):
         if isinstance(other, Data):
@@ -458,7 +734,7 @@ class Datastream():
 
     def __repr__(self):
         'Return a nicely formatted representation string'
-        return f'{self.__class__.__name__}(name={self.name}, size={self.size}, alloc_size={self.alloc_size}, cluster_count={self.cluster_count}, _data_runs={self._data_runs}, _content={self._content}, _data_runs_sorted={self._data_runs_sorted})'
+        return f'{self.__class__.__name__}(name={self.name}, size={self.size}, alloc_size={self.alloc_size}, init_size={self.init_size}, cluster_count={self.cluster_count}, flags={str(self.flags)}, _data_runs={self._data_runs}, _content={self._content}, _data_runs_sorted={self._data_runs_sorted})'
 
 class Attribute():
     '''Represents an MFT Attribute.
@@ -485,21 +761,21 @@ class Attribute():
             anything as long as it inherits from the base class. For a full
             list consult the ``attribute`` module documentation.
     '''
-    _dispatcher = {AttrTypes.STANDARD_INFORMATION : StandardInformation.create_from_binary,
-                   AttrTypes.ATTRIBUTE_LIST : AttributeList.create_from_binary,
-                   AttrTypes.FILE_NAME : FileName.create_from_binary,
-                   AttrTypes.OBJECT_ID : ObjectID.create_from_binary,
-                   AttrTypes.SECURITY_DESCRIPTOR : SecurityDescriptor.create_from_binary,
-                   AttrTypes.VOLUME_NAME : VolumeName.create_from_binary,
-                   AttrTypes.VOLUME_INFORMATION : VolumeInformation.create_from_binary,
-                   AttrTypes.DATA : Data.create_from_binary,
-                   AttrTypes.INDEX_ROOT : IndexRoot.create_from_binary,
-                   AttrTypes.INDEX_ALLOCATION : FileName.create_from_binary,
-                   AttrTypes.BITMAP : Bitmap.create_from_binary,
-                   AttrTypes.REPARSE_POINT : ReparsePoint.create_from_binary,
-                   AttrTypes.EA_INFORMATION : EaInformation.create_from_binary,
-                   AttrTypes.EA : Ea.create_from_binary,
-                   AttrTypes.LOGGED_TOOL_STREAM : LoggedToolStream,
+    _dispatcher = {AttrTypes.STANDARD_INFORMATION : StandardInformation.create_from_buffer,
+                   AttrTypes.ATTRIBUTE_LIST : AttributeList.create_from_buffer,
+                   AttrTypes.FILE_NAME : FileName.create_from_buffer,
+                   AttrTypes.OBJECT_ID : ObjectID.create_from_buffer,
+                   AttrTypes.SECURITY_DESCRIPTOR : SecurityDescriptor.create_from_buffer,
+                   AttrTypes.VOLUME_NAME : VolumeName.create_from_buffer,
+                   AttrTypes.VOLUME_INFORMATION : VolumeInformation.create_from_buffer,
+                   AttrTypes.DATA : Data.create_from_buffer,
+                   AttrTypes.INDEX_ROOT : IndexRoot.create_from_buffer,
+                   AttrTypes.INDEX_ALLOCATION : FileName.create_from_buffer,
+                   AttrTypes.BITMAP : Bitmap.create_from_buffer,
+                   AttrTypes.REPARSE_POINT : ReparsePoint.create_from_buffer,
+                   AttrTypes.EA_INFORMATION : EaInformation.create_from_buffer,
+                   AttrTypes.EA : Ea.create_from_buffer,
+                   AttrTypes.LOGGED_TOOL_STREAM : LoggedToolStream.create_from_buffer,
     }
 
     def __init__(self, header=None, content=None):
@@ -519,11 +795,19 @@ class Attribute():
 
     @classmethod
     def create_from_binary(cls, non_resident, load_dataruns, binary_view):
+        return cls.create_from_buffer(non_resident, load_dataruns, binary_view, 0)
+
+    @classmethod
+    def create_from_buffer(cls, non_resident, load_dataruns, buffer, offset):
+        '''Creates an Attribute from a buffer, where the attribute starts at
+        ``offset``. The header and the content are read in place, without
+        slicing the buffer.
+        '''
         if not non_resident:
-            header = ResidentAttrHeader.create_from_binary(binary_view)
-            content = cls._dispatcher[header.attr_type_id](binary_view[header.content_offset:header.content_offset+header.content_len])
+            header = ResidentAttrHeader.create_from_buffer(buffer, offset)
+            content = cls._dispatcher[header.attr_type_id](buffer, offset + header.content_offset, header.content_len)
         else:
-            header = NonResidentAttrHeader.create_from_binary(load_dataruns, binary_view)
+            header = NonResidentAttrHeader.create_from_buffer(load_dataruns, buffer, offset)
             content = None
 
         return cls(header, content)
@@ -609,8 +893,8 @@ class MFTEntry():
         #test if the entry is empty
         if bin_view[0:4] != b"\x00\x00\x00\x00":
             try:
-                header = MFTHeader.create_from_binary(mft_config.ignore_signature_check,
-                            bin_view[:MFTHeader.get_representation_size()])
+                header = MFTHeader.create_from_buffer(mft_config.ignore_signature_check,
+                            bin_view, 0)
             except HeaderError as e:
                 e.update_entry_number(entry_number)
                 e.update_entry_binary(binary_data)
@@ -625,7 +909,7 @@ class MFTEntry():
             if mft_config.apply_fixup_array:
                 apply_fixup_array(bin_view, header.fx_offset, header.fx_count, header.entry_alloc_len)
 
-            entry._load_attributes(mft_config, bin_view[header.first_attr_offset:])
+            entry._load_attributes(mft_config, bin_view, header.first_attr_offset)
 
         bin_view.release() #release the underlying buffer
 
@@ -653,7 +937,7 @@ class MFTEntry():
             self.data_streams.append(stream)
         stream.add_data_attribute(data_attr)
 
-    def _load_attributes(self, mft_config, attrs_view):
+    def _load_attributes(self, mft_config, entry_view, offset):
         '''Loads all the attributes of an entry.
 
         Once executed, all the attributes should have been loaded in the
@@ -662,18 +946,22 @@ class MFTEntry():
         Args:
             mft_config (:obj:`MFTConfig`) - An instance of MFTConfig, as this tells
                 how the library will interpret data.
-            attrs_view (memoryview(bytearray)) - A binary stream that starts at
-                the first attribute until the end of the entry
+            entry_view (memoryview(bytearray)) - A binary stream with the
+                whole entry
+            offset (int) - Offset of the first attribute in the entry
         '''
-        offset = 0
         load_attrs = mft_config.attribute_load_list
+        end_marker = _ATTR_END_MARKER
+        intern_names = mft_config.intern_names
 
-        while (attrs_view[offset:offset+4] != b'\xff\xff\xff\xff'):
-            attr_type, attr_len, non_resident = _get_attr_info(attrs_view[offset:])
+        while _ATTR_TYPE.unpack_from(entry_view, offset)[0] != end_marker:
+            attr_type, attr_len, non_resident = _get_attr_info(entry_view, offset)
             if attr_type in load_attrs:
                 # pass all the information to the attr, as we don't know how
                 # much content the attribute has
-                attr = Attribute.create_from_binary(non_resident, mft_config.load_dataruns, attrs_view[offset:])
+                attr = Attribute.create_from_buffer(non_resident, mft_config.load_dataruns, entry_view, offset)
+                if intern_names:
+                    _intern_attribute(attr)
                 if not attr.header.attr_type_id is AttrTypes.DATA:
                     self.attrs[attr.header.attr_type_id].append(attr) #add an attribute
                 else:
@@ -754,6 +1042,34 @@ class MFTEntry():
         else:
             return None
 
+    def get_security_descriptor(self, secure=None):
+        '''Returns the security descriptor that applies to the entry.
+
+        If the entry has a SECURITY_DESCRIPTOR attribute, its content is
+        returned. Otherwise, the ``security_id`` from the STANDARD_INFORMATION
+        is resolved using ``secure``.
+
+        Args:
+            secure (:obj:`libmft.secure.Secure`) - The security descriptors of
+                the volume. If not provided, only the SECURITY_DESCRIPTOR
+                attribute is considered.
+
+        Returns:
+            :obj:`SecurityDescriptor`: The security descriptor or None if it
+                can't be found
+        '''
+        sd_attrs = self.get_attributes(AttrTypes.SECURITY_DESCRIPTOR)
+        if sd_attrs and sd_attrs[0].content is not None:
+            return sd_attrs[0].content
+
+        std_info = self.get_attributes(AttrTypes.STANDARD_INFORMATION)
+        if secure is not None and std_info:
+            security_id = std_info[0].content.security_id
+            if security_id is not None:
+                return secure.get(security_id)
+
+        return None
+
     def get_main_filename_attr(self):
         '''Returns the main filename attribute of the entry.
 
@@ -805,6 +1121,436 @@ class MFTEntry():
         return self.__class__.__name__ + '(header={}, attrs={}, data_stream={})'.format(
             self.header, self.attrs, self.data_streams)
 
+def _select_main_name(candidates):
+    '''Selects the main FILE_NAME from the raw information of all of them,
+    using the same rules as ``MFTEntry.get_main_filename_attr``.
+
+    Args:
+        candidates (list(tuple)): One tuple per FILE_NAME, starting with the
+            attribute id, the raw parent reference and the name type
+
+    Returns:
+        tuple: The tuple of the main FILE_NAME or ``None``
+    '''
+    main = None
+    for candidate in candidates:
+        if main is None or candidate[0] < main[0]:
+            main = candidate
+    for candidate in candidates:
+        if candidate[1] == main[1] and candidate[2] < main[2]:
+            main = candidate
+    return main
+
+class Projection():
+    '''Interprets only some fields of the MFT records.
+
+    The projection maps where the fields are to the list of fields. Each
+    source is compiled into a specialized parser that unpacks only the
+    requested fields, so narrow queries do not create the whole entry.
+
+    The possible sources are:
+
+    - ``HEADER``: ``lsn``, ``seq_number``, ``hard_link_count``,
+      ``usage_flags``, ``base_record_ref`` and ``base_record_seq``
+    - ``STANDARD_INFORMATION`` and ``FILE_NAME``: the fields of the content
+      classes, see ``libmft.attribute.create_projection_parser``. The
+      FILE_NAME is the main one (see ``MFTEntry.get_main_filename_attr``).
+    - ``DATA``: ``size``, ``alloc_size`` and ``init_size`` of the unnamed
+      stream
+
+    If the record has an ATTRIBUTE_LIST, the attributes stored in the
+    extension records are also looked at, when ``parse`` is given a way to
+    read them (``MFT.iter_projection`` does it). Fields of attributes that
+    are not present are ``None``.
+
+    Args:
+        projection (dict(str : list(str))): The sources and their fields. For
+            example, ``{"FILE_NAME" : ["name", "parent_ref"],
+            "STANDARD_INFORMATION" : ["timestamps.created"]}``
+
+    Attributes:
+        columns (tuple(str)): Names of the values returned by ``parse``, in
+            the ``SOURCE.field`` format
+    '''
+    _HEADER_LAYOUT = (48, {
+        "lsn" : (8, "Q", "{}"),
+        "seq_number" : (16, "H", "{}"),
+        "hard_link_count" : (18, "H", "{}"),
+        "usage_flags" : (22, "H", "MftUsageFlags({})"),
+        "base_record_ref" : (32, "Q", "{} & 0x0000FFFFFFFFFFFF"),
+        "base_record_seq" : (32, "Q", "{} >> 48"),
+    })
+    '''Layout of the projectable fields of the ``MFTHeader``'''
+    _DATA_FIELDS = ("size", "alloc_size", "init_size")
+    _ATTR_TYPES = (AttrTypes.STANDARD_INFORMATION.value, AttrTypes.FILE_NAME.value, AttrTypes.DATA.value,
+                   AttrTypes.ATTRIBUTE_LIST.value)
+
+    def __init__(self, projection):
+        '''See class docstring.'''
+        self._parts = []
+        columns = []
+        for source, fields in projection.items():
+            if isinstance(source, AttrTypes):
+                source = source.name
+            fields = tuple(fields)
+            if source == "HEADER":
+                parser = _create_projection_func("project_header", self._HEADER_LAYOUT,
+                            fields, {"MftUsageFlags" : MftUsageFlags})
+            elif source == "DATA":
+                unknown = [field for field in fields if field not in self._DATA_FIELDS]
+                if unknown:
+                    raise ValueError(f"Unknown fields for DATA: {', '.join(unknown)}")
+                parser = _itemgetter(*[self._DATA_FIELDS.index(field) for field in fields])
+            elif source in ("STANDARD_INFORMATION", "FILE_NAME"):
+                parser = create_projection_parser(AttrTypes[source], fields)
+            else:
+                raise ValueError(f"Invalid projection source '{source}'")
+            self._parts.append((source, parser, len(fields)))
+            columns.extend([f"{source}.{field}" for field in fields])
+        self.columns = tuple(columns)
+        self._walk_attributes = any(source != "HEADER" for source, _, _ in self._parts)
+
+    def parse(self, record, read_extensions=None):
+        '''Interprets the fields of a record.
+
+        Args:
+            record (buffer): Content of the record, with the fix up array
+                already applied
+            read_extensions (callable): Called with the offset of the
+                ATTRIBUTE_LIST, if the record has one, and returns the
+                extension records (see ``MFT._extension_records``). If
+                ``None``, only the record itself is looked at.
+
+        Returns:
+            tuple: The values, in the same order as ``columns``
+        '''
+        word, dword, qword = EntryView._WORD.unpack_from, _ATTR_TYPE.unpack_from, EntryView._QWORD.unpack_from
+        std_info_type, fn_type, data_type, attr_list_type = self._ATTR_TYPES
+        std_info, data, candidates = None, None, []
+
+        buffers, index = [record], 0
+        while self._walk_attributes and index < len(buffers):
+            buffer = buffers[index]
+            offset, record_len = word(buffer, 20)[0], len(buffer)
+            while offset + 8 <= record_len:
+                attr_type, attr_len = _ATTR_LENGTH.unpack_from(buffer, offset)
+                if attr_type == _ATTR_END_MARKER or not attr_len:
+                    break
+                if attr_type == std_info_type and std_info is None:
+                    std_info = (buffer, offset + word(buffer, offset + 20)[0], dword(buffer, offset + 16)[0])
+                elif attr_type == fn_type:
+                    content = offset + word(buffer, offset + 20)[0]
+                    candidates.append((word(buffer, offset + 14)[0], qword(buffer, content)[0],
+                                       buffer[content+65], buffer, content, dword(buffer, offset + 16)[0]))
+                elif attr_type == data_type and not buffer[offset+9]:
+                    if not buffer[offset+8]:
+                        data = (dword(buffer, offset + 16)[0], ) * 3
+                    elif not qword(buffer, offset + 16)[0]:
+                        alloc_size, size, init_size = _DATA_SIZES.unpack_from(buffer, offset + 40)
+                        data = (size, alloc_size, init_size)
+                elif attr_type == attr_list_type and not index and read_extensions is not None:
+                    buffers.extend(read_extensions(offset))
+                offset += attr_len
+            index += 1
+
+        values = ()
+        for source, parser, count in self._parts:
+            if source == "HEADER":
+                part = parser(record, 0, len(record))
+            elif source == "STANDARD_INFORMATION":
+                part = parser(*std_info) if std_info is not None else None
+            elif source == "FILE_NAME":
+                main = _select_main_name(candidates)
+                part = parser(*main[3:]) if main is not None else None
+            else:
+                part = parser(data) if data is not None else None
+                if count == 1 and part is not None:
+                    part = (part, )
+            values += part if part is not None else (None, ) * count
+        return values
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(columns={self.columns})'
+
+class TimestampIndex():
+    '''Sorted index of the timestamps of the entries.
+
+    For each timestamp, the values of all the entries are kept, as FILETIME,
+    in a sorted ``array`` with the record numbers in a second array, in the
+    same order. Finding the entries in a time window is a binary search.
+
+    The timestamps are named ``si.created``, ``si.changed``,
+    ``si.mft_changed``, ``si.accessed`` (STANDARD_INFORMATION),
+    ``fn.created``, ``fn.changed``, ``fn.mft_changed``, ``fn.accessed``
+    (main FILE_NAME, the same as the query columns) and ``fn_all.created``,
+    ``fn_all.changed``, ``fn_all.mft_changed``, ``fn_all.accessed`` (every
+    FILE_NAME, including hard links and DOS names, so a record can be in the
+    index more than once). The attributes in extension records are indexed
+    under the number of their base record. Entries that don't have the
+    attribute are not indexed.
+
+    An empty index is created for each ``MFT`` and the timestamps are added
+    with ``build`` or, when needed, by ``MFT.between``.
+    '''
+    _NAMES = ("created", "changed", "mft_changed", "accessed")
+    _MARGIN = 100
+    '''int: Maximum difference, in FILETIME units, between a timestamp and
+    its conversion to ``datetime`` and back'''
+    TIMESTAMPS = {f"{prefix}.{name}" : (source, f"raw_timestamps.{name}")
+                  for prefix, source in (("si", "STANDARD_INFORMATION"), ("fn", "FILE_NAME"),
+                                         ("fn_all", "FILE_NAMES"))
+                  for name in ("created", "changed", "mft_changed", "accessed")}
+    '''dict(str : tuple(str, str)): Source and projection field of each
+    timestamp. ``FILE_NAMES`` means all the FILE_NAME attributes.'''
+
+    def __init__(self):
+        '''See class docstring.'''
+        self._indexes = {} #timestamp -> (array of FILETIME, array of record numbers)
+
+    @staticmethod
+    def _file_name_timestamps(record, read_extensions):
+        '''Returns the raw timestamps of all the FILE_NAME attributes of a
+        record, including the ones in its extension records.'''
+        word = EntryView._WORD.unpack_from
+        fn_type, attr_list_type = AttrTypes.FILE_NAME.value, AttrTypes.ATTRIBUTE_LIST.value
+        timestamps = []
+
+        buffers, index = [record], 0
+        while index < len(buffers):
+            buffer = buffers[index]
+            offset, record_len = word(buffer, 20)[0], len(buffer)
+            while offset + 8 <= record_len:
+                attr_type, attr_len = _ATTR_LENGTH.unpack_from(buffer, offset)
+                if attr_type == _ATTR_END_MARKER or not attr_len:
+                    break
+                if attr_type == fn_type:
+                    content = offset + word(buffer, offset + 20)[0]
+                    timestamps.append(_FN_TIMESTAMPS.unpack_from(buffer, content + 8))
+                elif attr_type == attr_list_type and not index:
+                    buffers.extend(read_extensions(offset))
+                offset += attr_len
+            index += 1
+        return timestamps
+
+    def build(self, mft, which=None):
+        '''Indexes timestamps of a MFT. All the requested timestamps that are
+        not indexed yet are read with a single pass.
+
+        Args:
+            mft (:obj:`MFT`): The MFT
+            which (list(str)): The timestamps. If ``None``, all of them.
+        '''
+        which = [name for name in (which if which is not None else self.TIMESTAMPS)
+                 if name not in self._indexes]
+        for name in which:
+            if name not in self.TIMESTAMPS:
+                raise ValueError(f"Unknown timestamp '{name}'. Valid values are: {', '.join(self.TIMESTAMPS)}")
+        if not which:
+            return
+        projection, all_names = {}, []
+        for name in which:
+            source, field = self.TIMESTAMPS[name]
+            if source == "FILE_NAMES":
+                all_names.append((name, self._NAMES.index(name.partition(".")[2])))
+            else:
+                projection.setdefault(source, []).append(field)
+        projection = Projection(projection) if projection else None
+        positions = [(name, projection.columns.index(".".join(self.TIMESTAMPS[name])))
+                     for name in which if self.TIMESTAMPS[name][0] != "FILE_NAMES"]
+
+        times = {name : _array("Q") for name in which}
+        records = {name : _array("Q") for name in which}
+        #the extension records are read through the ATTRIBUTE_LIST of their
+        #base records, so they are not indexed on their own
+        for record_number, record in mft._iter_raw_records(0, None, HeaderFilter(has_base=False)):
+            read_extensions = _partial(mft._extension_records, record_number, record)
+            if projection is not None:
+                values = projection.parse(record, read_extensions)
+                for name, position in positions:
+                    if values[position] is not None:
+                        times[name].append(values[position])
+                        records[name].append(record_number)
+            if all_names:
+                for timestamps in self._file_name_timestamps(record, read_extensions):
+                    for name, position in all_names:
+                        times[name].append(timestamps[position])
+                        records[name].append(record_number)
+
+        for name in which:
+            #the record number (at most 48 bits) is packed with the timestamp,
+            #so only one list is sorted
+            keys = [(time << 48) | record_number for time, record_number
+                    in zip(times.pop(name), records.pop(name))]
+            keys.sort()
+            self._indexes[name] = (_array("Q", (key >> 48 for key in keys)),
+                                   _array("Q", (key & 0xFFFFFFFFFFFF for key in keys)))
+            _MOD_LOGGER.info("%d timestamps indexed for %s", len(keys), name)
+            del keys
+
+    def between(self, which, start=None, end=None):
+        '''Returns the entries that have a timestamp in a time window.
+
+        A ``datetime`` has a precision of one microsecond, while a FILETIME
+        has a precision of 100 nanoseconds. If a limit is a ``datetime``, the
+        timestamps are compared after being converted to ``datetime``, the
+        same way the entries do, so the result is the same as comparing the
+        timestamps of the entries.
+
+        Args:
+            which (str): The timestamp
+            start (datetime or int): Start of the window (inclusive), as a
+                ``datetime`` or FILETIME. If ``None``, there is no start.
+            end (datetime or int): End of the window (inclusive), as a
+                ``datetime`` or FILETIME. If ``None``, there is no end.
+
+        Returns:
+            array: The record numbers, ordered by the timestamp
+        '''
+        times, records = self._indexes[which]
+        low, high = 0, len(times)
+        if isinstance(start, int):
+            low = _bisect_left(times, start)
+        elif start is not None:
+            #the conversion to datetime rounds, the values close to the limit
+            #are converted to find the exact position
+            low = _bisect_left(times, convert_to_filetime(start) - self._MARGIN)
+            while low < high and convert_filetime(times[low]) < start:
+                low += 1
+        if isinstance(end, int):
+            high = _bisect_right(times, end)
+        elif end is not None:
+            high = _bisect_right(times, convert_to_filetime(end) + self._MARGIN)
+            while high > low and convert_filetime(times[high-1]) > end:
+                high -= 1
+        return records[low:high]
+
+    def __contains__(self, which):
+        return which in self._indexes
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(indexed={tuple(self._indexes)})'
+
+class EntryView():
+    '''Read only view over the raw content of one MFT record.
+
+    Returned by ``MFT.iter_views``. The same object is reused for all the
+    records and the values are decoded from the record only when they are
+    requested, so going over the MFT creates almost no objects. The view is
+    valid only until the next record is requested, the returned values can
+    be kept.
+
+    Only the base record is looked at, attributes stored in extension records
+    are not visible.
+
+    Attributes:
+        record_number (int): The number of the current record
+    '''
+    _ATTR_HEADER = struct.Struct("<2I2BH2xH")
+    ''' Attribute type - 4
+        Attribute length - 4
+        Non resident flag - 1
+        Name length - 1
+        Offset to the name - 2
+        Flags - 2 (not used)
+        Attribute id - 2
+    '''
+    _RESIDENT = struct.Struct("<IH")
+    ''' Content length - 4
+        Offset to the content - 2
+    '''
+    _QWORD = struct.Struct("<Q")
+    _WORD = struct.Struct("<H")
+    __slots__ = ("record_number", "_view", "_main_fn")
+
+    def __init__(self):
+        '''See class docstring.'''
+        self._set_record(None, None)
+
+    def _set_record(self, record_number, view):
+        self.record_number = record_number
+        self._view = view
+        self._main_fn = False #False = not searched yet
+
+    def _attributes(self, attr_type):
+        '''Yields the offset of all the attributes of a type'''
+        view, attr_type = self._view, attr_type.value
+        offset = self._WORD.unpack_from(view, 20)[0]
+        while offset + 8 <= len(view):
+            current_type, attr_len = _ATTR_LENGTH.unpack_from(view, offset)
+            if current_type == _ATTR_END_MARKER or not attr_len:
+                break
+            if current_type == attr_type:
+                yield offset
+            offset += attr_len
+
+    def _content_offset(self, offset):
+        return offset + self._RESIDENT.unpack_from(self._view, offset + 16)[1]
+
+    def _main_file_name(self):
+        '''Finds the content of the main FILE_NAME, using the same rules as
+        ``MFTEntry.get_main_filename_attr``.'''
+        if self._main_fn is False:
+            view = self._view
+            candidates = []
+            for offset in self._attributes(AttrTypes.FILE_NAME):
+                attr_id = self._ATTR_HEADER.unpack_from(view, offset)[5]
+                content = self._content_offset(offset)
+                candidates.append((attr_id, self._QWORD.unpack_from(view, content)[0], view[content+65], content))
+            main = _select_main_name(candidates)
+            self._main_fn = main[3] if main is not None else None
+        return self._main_fn
+
+    @property
+    def flags(self):
+        '''MftUsageFlags: Usage flags of the record'''
+        return MftUsageFlags(self._WORD.unpack_from(self._view, 22)[0])
+
+    @property
+    def main_name(self):
+        '''str: Name of the main FILE_NAME or ``None``'''
+        content = self._main_file_name()
+        if content is None:
+            return None
+        name_len = self._view[content+64]
+        return str(self._view[content+66:content+66+(2*name_len)], "utf_16_le")
+
+    @property
+    def parent_ref(self):
+        '''int: Parent record of the main FILE_NAME or ``None``'''
+        content = self._main_file_name()
+        if content is None:
+            return None
+        return self._QWORD.unpack_from(self._view, content)[0] & 0x0000FFFFFFFFFFFF
+
+    @property
+    def si_times(self):
+        '''Timestamps: Timestamps of the STANDARD_INFORMATION or ``None``'''
+        for offset in self._attributes(AttrTypes.STANDARD_INFORMATION):
+            filetimes = Timestamps._REPR.unpack_from(self._view, self._content_offset(offset))
+            return Timestamps([convert_filetime(filetime) for filetime in filetimes])
+        return None
+
+    @property
+    def data_size(self):
+        '''int: Size of the unnamed DATA attribute or ``None``'''
+        view = self._view
+        for offset in self._attributes(AttrTypes.DATA):
+            _, _, non_resident, name_len, _, _ = self._ATTR_HEADER.unpack_from(view, offset)
+            if name_len:
+                continue
+            if not non_resident:
+                return self._RESIDENT.unpack_from(view, offset + 16)[0]
+            #only the first part of the stream has the size
+            if not self._QWORD.unpack_from(view, offset + 16)[0]:
+                return self._QWORD.unpack_from(view, offset + 48)[0]
+        return None
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(record_number={self.record_number})'
+
 class MFT():
     '''Represents a MFT.
 
@@ -812,16 +1558,25 @@ class MFT():
     another. With this class it is possible to get all these relations and
     access it in a standard way.
 
+    The allocation status of the records is kept by the ``$MFT:$BITMAP``
+    attribute. If it is resident in the record 0 it is loaded automatically,
+    otherwise the extracted stream can be provided.
+
     Args:
         file_pointer (?): Pointer to a file opened in read and binary mode
         mft_config (:obj:`MFTConfig`): Configuration for the library. If none
             is provided, the default configuration is provided.
+        bitmap_file_pointer (?): Pointer to a file with the contents of the
+            ``$MFT:$BITMAP`` attribute, opened in read and binary mode. Optional.
 
     Attributes:
-        TODO?
+        bitmap (:obj:`Bitmap`): Allocation status of the records or ``None``
+            if it is not available. It is loaded the first time it is needed.
+        timestamp_index (:obj:`TimestampIndex`): The timestamps already
+            indexed, see ``between``
     '''
 
-    def __init__(self, file_pointer, mft_config=MFTConfig()):
+    def __init__(self, file_pointer, mft_config=MFTConfig(), bitmap_file_pointer=None):
         '''See class docstring.'''
         self.file_pointer = file_pointer
         self.mft_config = mft_config
@@ -829,6 +1584,9 @@ class MFT():
         self._entries_parent_child = _defaultdict(list) #holds the relation ship between parent and child
         self._entries_child_parent = {} #holds the relation between child and parent
         self._number_valid_entries = 0
+        self._fp_lock = threading.Lock() #the read ahead thread shares the file
+        self._executor = None #created by the first asynchronous call
+        self.timestamp_index = TimestampIndex()
 
         if not self.mft_entry_size: #if entry size is zero, try to autodetect
             _MOD_LOGGER.info("Trying to detect MFT size entry")
@@ -837,6 +1595,46 @@ class MFT():
 
         if self.mft_config.create_initial_information:
             self._load_relationship_info()
+        #the bitmap is loaded only if the allocation status is needed
+        self._bitmap_file_pointer = bitmap_file_pointer
+        self._bitmap = None
+        self._bitmap_loaded = False
+
+    def _get_bitmap(self):
+        if not self._bitmap_loaded:
+            self._bitmap = self._load_bitmap(self._bitmap_file_pointer)
+            self._bitmap_file_pointer, self._bitmap_loaded = None, True
+        return self._bitmap
+
+    def _set_bitmap(self, bitmap):
+        self._bitmap, self._bitmap_file_pointer, self._bitmap_loaded = bitmap, None, True
+
+    bitmap = property(_get_bitmap, _set_bitmap, doc="Allocation status of the records or ``None``")
+
+    def _load_bitmap(self, bitmap_file_pointer):
+        '''Loads the bitmap of the MFT, either from the file provided or from
+        the resident BITMAP attribute of the record 0.
+
+        Returns:
+            :obj:`Bitmap`: The bitmap or ``None`` if it is not available
+        '''
+        if bitmap_file_pointer is not None:
+            bitmap_file_pointer.seek(0)
+            return Bitmap(bitmap_file_pointer.read())
+        if not self.mft_config.load_bitmap:
+            return None
+
+        try:
+            entry = self._read_full_entry(0)
+        except MFTException as e:
+            _MOD_LOGGER.warning("Could not read the record 0 to load the MFT bitmap: %s", e)
+            return None
+        if entry is not None and entry.has_attribute(AttrTypes.BITMAP):
+            for attr in entry.get_attributes(AttrTypes.BITMAP):
+                if not attr.header.attr_name and attr.content is not None:
+                    return attr.content
+        _MOD_LOGGER.info("MFT bitmap is not resident, all records will be read")
+        return None
 
     def _load_relationship_info(self):
         """Maps parent and child entries in the MFT.
@@ -880,7 +1678,9 @@ class MFT():
             else:
                 self._number_valid_entries += 1
 
-    def _read_full_entry(self, entry_number):
+    def _read_full_entry(self, entry_number, record=None):
+        '''Reads an entry and merges its extension records. If the content of
+        the record has already been read, it can be passed as ``record``.'''
         if entry_number in self._entries_parent_child:
             extras = self._entries_parent_child[entry_number]
         else:
@@ -888,12 +1688,16 @@ class MFT():
         entry = None
         binary = bytearray(self.mft_entry_size)
 
-        self.file_pointer.seek(self.mft_entry_size * entry_number)
-        self.file_pointer.readinto(binary)
-        entry = MFTEntry.create_from_binary(self.mft_config, binary, entry_number)
+        if record is None:
+            with self._fp_lock:
+                self.file_pointer.seek(self.mft_entry_size * entry_number)
+                self.file_pointer.readinto(binary)
+            record = binary
+        entry = MFTEntry.create_from_binary(self.mft_config, record, entry_number)
         for number in extras:
-            self.file_pointer.seek(self.mft_entry_size * number)
-            self.file_pointer.readinto(binary)
+            with self._fp_lock:
+                self.file_pointer.seek(self.mft_entry_size * number)
+                self.file_pointer.readinto(binary)
             temp_entry = MFTEntry.create_from_binary(self.mft_config, binary, number)
             entry.merge_entries(temp_entry)
 
@@ -971,25 +1775,615 @@ class MFT():
         orphan, path = self._compute_full_path(fn_attr.content.parent_ref, fn_attr.content.parent_seq)
         return (orphan, "\\".join([path, fn_attr.content.name]))
 
-    def splice_generator(self, start, end):
+    def _record_ranges(self, start, end, allocated):
+        '''Returns the ranges of record numbers between ``start`` and ``end``
+        that match the allocation status. Records past the end of the bitmap
+        are considered unallocated.'''
+        if allocated:
+            runs = self.bitmap.allocated_runs()
+        else:
+            runs = self.bitmap.free_runs()
+            runs.append((len(self.bitmap) * 8, end))
+
+        for run_start, run_len in runs:
+            first, last = max(run_start, start), min(run_start + run_len, end)
+            if first < last:
+                yield range(first, last)
+
+    def _read_ahead(self, ranges):
+        '''Reads the records of the ranges in a background thread, in big
+        chunks, while the records already read are yielded.
+
+        Yields:
+            tuple(int, memoryview): The record number and its content. The
+                content is valid only until the next record is requested.
+        '''
+        entry_size = self.mft_entry_size
+        records_per_chunk = max(self.mft_config.read_ahead_size // entry_size, 1)
+        free_buffers = queue.Queue()
+        for _ in range(self.mft_config.read_ahead + 1):
+            free_buffers.put(bytearray(records_per_chunk * entry_size))
+        full_buffers = queue.Queue(self.mft_config.read_ahead)
+        stop = threading.Event()
+
+        def reader():
+            try:
+                for numbers in ranges:
+                    for first in range(numbers.start, numbers.stop, records_per_chunk):
+                        count = min(records_per_chunk, numbers.stop - first)
+                        buffer = free_buffers.get()
+                        if buffer is None or stop.is_set():
+                            return
+                        with memoryview(buffer) as view, self._fp_lock:
+                            self.file_pointer.seek(first * entry_size)
+                            read = self.file_pointer.readinto(view[:count * entry_size])
+                        full_buffers.put((first, read // entry_size, buffer))
+                full_buffers.put(None)
+            except Exception as e:
+                full_buffers.put(e)
+
+        thread = threading.Thread(target=reader, name="libmft-read-ahead", daemon=True)
+        thread.start()
+        try:
+            while True:
+                chunk = full_buffers.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                first, count, buffer = chunk
+                with memoryview(buffer) as view:
+                    for i in range(count):
+                        yield first + i, view[i * entry_size:(i + 1) * entry_size]
+                free_buffers.put(buffer)
+        finally:
+            #unblocks the thread, if the iteration is interrupted
+            stop.set()
+            free_buffers.put(None)
+            while thread.is_alive():
+                try:
+                    full_buffers.get(timeout=0.01)
+                except queue.Empty:
+                    pass
+
+    def _read_chunks(self, ranges):
+        '''Same as ``_read_ahead``, but the chunks are read by the caller's
+        thread.
+
+        Yields:
+            tuple(int, memoryview): The record number and its content. The
+                content is valid only until the next record is requested.
+        '''
+        entry_size = self.mft_entry_size
+        records_per_chunk = max(self.mft_config.read_ahead_size // entry_size, 1)
+        buffer = bytearray(records_per_chunk * entry_size)
+
+        with memoryview(buffer) as view:
+            for numbers in ranges:
+                for first in range(numbers.start, numbers.stop, records_per_chunk):
+                    count = min(records_per_chunk, numbers.stop - first)
+                    with self._fp_lock:
+                        self.file_pointer.seek(first * entry_size)
+                        read = self.file_pointer.readinto(view[:count * entry_size])
+                    for i in range(read // entry_size):
+                        yield first + i, view[i * entry_size:(i + 1) * entry_size]
+
+    def _scan_ranges(self, start, end, header_filter):
+        '''Returns the ranges of records that have to be read to go from
+        ``start`` to ``end``, based on the configuration, the filter and the
+        bitmap.'''
+        skip_unallocated = self.mft_config.skip_unallocated
+        if header_filter is not None:
+            start, end = header_filter.clamp(start, end)
+            skip_unallocated = skip_unallocated or header_filter.in_use is True
+        if skip_unallocated and self.bitmap is not None:
+            return self._record_ranges(start, end, True)
+        return (range(start, end), )
+
+    def _scan_records(self, ranges):
+        '''Reads the records of the ranges in chunks, by a background thread
+        if ``MFTConfig.read_ahead`` is enabled.'''
+        if self.mft_config.read_ahead:
+            return self._read_ahead(ranges)
+        return self._read_chunks(ranges)
+
+    def splice_generator(self, start, end, header_filter=None):
+        '''Iterates over the valid entries between ``start`` and ``end``. If
+        ``MFTConfig.skip_unallocated`` is enabled and the bitmap is available,
+        only the allocated records are read. If ``MFTConfig.read_ahead`` is
+        enabled, the records are read by a background thread.
+
+        If a ``HeaderFilter`` is provided (or set in ``MFTConfig.header_filter``),
+        the records are read in chunks and only the ones accepted by the
+        filter are parsed.'''
         entry = None
+        if header_filter is None:
+            header_filter = self.mft_config.header_filter
+
+        ranges = self._scan_ranges(start, end, header_filter)
+        if self.mft_config.read_ahead or header_filter is not None:
+            for i, record in self._scan_records(ranges):
+                if i not in self._entries_child_parent and \
+                    (header_filter is None or header_filter.matches(i, record)):
+                    entry = self._read_full_entry(i, record)
+                    if entry is not None:
+                        yield entry
+        else:
+            for numbers in ranges:
+                for i in numbers:
+                    if i not in self._entries_child_parent:
+                        entry = self[i]
+                        if entry is not None:
+                            yield entry
+
+    def _iter_raw_records(self, start, end, header_filter):
+        '''Iterates over the content of the valid base records, accepted by
+        the filter, with the fix up array applied.
+
+        Yields:
+            tuple(int, memoryview): The record number and its content. The
+                content is valid only until the next record is requested.
+        '''
+        if end is None:
+            end = self.total_amount_entries
+        if header_filter is None:
+            header_filter = self.mft_config.header_filter
+        apply_fixup = self.mft_config.apply_fixup_array
+        child_parent = self._entries_child_parent
+        qword = EntryView._QWORD.unpack_from
+
+        for i, record in self._scan_records(self._scan_ranges(start, end, header_filter)):
+            if i in child_parent or record[:4] == b"\x00\x00\x00\x00":
+                continue
+            #without the prepass, the extension records are only known by the header
+            if qword(record, 32)[0] & 0x0000FFFFFFFFFFFF:
+                continue
+            if header_filter is not None and not header_filter.matches(i, record):
+                continue
+            if apply_fixup:
+                fx_offset, fx_count = _FIXUP_INFO.unpack_from(record, 4)
+                apply_fixup_array(record, fx_offset, fx_count, len(record))
+            yield i, record
+
+    def _extension_records(self, number, record, list_offset):
+        '''Reads the extension records of a base record.
+
+        The extension records come from the relationship prepass, if it was
+        done, otherwise from the ATTRIBUTE_LIST at ``list_offset``, as long as
+        it is resident. Only the records that point back to the base record
+        are returned.
 
-        for i in range(start, end):
-            if i not in self._entries_child_parent:
-                entry = self[i]
-                if entry is not None:
-                    yield entry
+        Returns:
+            list(bytearray): The extension records, with the fix up array
+                applied
+        '''
+        if number in self._entries_parent_child:
+            numbers = self._entries_parent_child[number]
+        elif not record[list_offset+8]:
+            content = list_offset + EntryView._WORD.unpack_from(record, list_offset + 20)[0]
+            length = _ATTR_TYPE.unpack_from(record, list_offset + 16)[0]
+            try:
+                attr_list = AttributeList.create_from_buffer(record, content, length)
+            except (struct.error, ValueError) as e:
+                _MOD_LOGGER.warning("Invalid ATTRIBUTE_LIST in the record %d: %s", number, e)
+                return []
+            numbers = sorted({entry.file_ref for entry in attr_list
+                              if entry.file_ref != number and entry.file_ref < self.total_amount_entries})
+        else:
+            _MOD_LOGGER.debug("Non resident ATTRIBUTE_LIST in the record %d, extension records not read", number)
+            return []
+
+        extensions = []
+        for ext_number in numbers:
+            buffer = bytearray(self.mft_entry_size)
+            with self._fp_lock:
+                self.file_pointer.seek(self.mft_entry_size * ext_number)
+                self.file_pointer.readinto(buffer)
+            if buffer[:4] == b"\x00\x00\x00\x00" or \
+                    EntryView._QWORD.unpack_from(buffer, 32)[0] & 0x0000FFFFFFFFFFFF != number:
+                continue
+            if self.mft_config.apply_fixup_array:
+                fx_offset, fx_count = _FIXUP_INFO.unpack_from(buffer, 4)
+                apply_fixup_array(memoryview(buffer), fx_offset, fx_count, len(buffer))
+            extensions.append(buffer)
+        return extensions
+
+    def iter_views(self, start=0, end=None, header_filter=None):
+        '''Iterates over the valid records without creating entries.
+
+        Instead of a ``MFTEntry``, the same ``EntryView`` is returned for all
+        the records, pointing to the current one. Useful when the entries are
+        not kept, as only the requested values are decoded.
+
+        Args:
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+            header_filter (:obj:`HeaderFilter`): Filter applied to the records.
+                If ``None``, uses ``MFTConfig.header_filter``.
+
+        Yields:
+            :obj:`EntryView`: The view, valid until the next record is requested
+        '''
+        view = EntryView()
+        for i, record in self._iter_raw_records(start, end, header_filter):
+            view._set_record(i, record)
+            yield view
+        view._set_record(None, None)
+
+    def iter_names(self, start=0, end=None, header_filter=None, include_unnamed=False):
+        '''Fastest way of listing the files of the MFT.
+
+        Only the FILE_NAME attributes and the size of the unnamed DATA
+        attribute are decoded, directly from the records, everything else is
+        skipped. The values are returned as plain ``int``, so they can be used
+        to resolve the paths without any conversion.
+
+        The extension records listed in the ATTRIBUTE_LIST of a base record
+        are also looked at, so the FILE_NAME and the DATA moved out of the
+        base record are found.
+
+        Args:
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+            header_filter (:obj:`HeaderFilter`): Filter applied to the records.
+                If ``None``, uses ``MFTConfig.header_filter``.
+            include_unnamed (bool): If ``True``, the records without a
+                FILE_NAME are also returned, with the parent and the name as
+                ``None``. Otherwise they are skipped.
+
+        Yields:
+            tuple(int, int, int, int, str, int, int): Record number, sequence
+                number, parent record number, parent sequence number, name of
+                the main FILE_NAME, usage flags and size of the unnamed DATA
+                (``None`` if there is no unnamed DATA)
+        '''
+        fn_type, data_type, attr_list_type, end_marker = AttrTypes.FILE_NAME.value, \
+            AttrTypes.DATA.value, AttrTypes.ATTRIBUTE_LIST.value, _ATTR_END_MARKER
+        attr_length, names_header, word, dword, qword = _ATTR_LENGTH.unpack_from, \
+            _NAMES_HEADER.unpack_from, EntryView._WORD.unpack_from, _ATTR_TYPE.unpack_from, \
+            EntryView._QWORD.unpack_from
+
+        for i, record in self._iter_raw_records(start, end, header_filter):
+            seq_number, _, _, flags = names_header(record, 16)
+            size, candidates = None, []
+
+            buffers, index = [record], 0
+            while index < len(buffers):
+                buffer = buffers[index]
+                offset, record_len = word(buffer, 20)[0], len(buffer)
+                while offset + 8 <= record_len:
+                    attr_type, attr_len = attr_length(buffer, offset)
+                    if attr_type == end_marker or not attr_len:
+                        break
+                    if attr_type == fn_type:
+                        content = offset + word(buffer, offset + 20)[0]
+                        candidates.append((word(buffer, offset + 14)[0], qword(buffer, content)[0],
+                                           buffer[content+65], buffer, content))
+                    elif attr_type == data_type and not buffer[offset+9]:
+                        if not buffer[offset+8]:
+                            size = dword(buffer, offset + 16)[0]
+                        elif not qword(buffer, offset + 16)[0]:
+                            size = qword(buffer, offset + 48)[0]
+                    elif attr_type == attr_list_type and not index:
+                        buffers.extend(self._extension_records(i, buffer, offset))
+                    offset += attr_len
+                index += 1
+
+            if candidates:
+                _, parent, _, buffer, content = _select_main_name(candidates)
+                name = str(buffer[content+66:content+66+(2*buffer[content+64])], "utf_16_le")
+                yield (i, seq_number, parent & 0x0000FFFFFFFFFFFF, parent >> 48, name, flags, size)
+            elif include_unnamed:
+                yield (i, seq_number, None, None, None, flags, size)
+
+    def iter_projection(self, projection, start=0, end=None, header_filter=None):
+        '''Iterates over the valid records interpreting only some fields.
+
+        Args:
+            projection (dict or :obj:`Projection`): The fields, see ``Projection``
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+            header_filter (:obj:`HeaderFilter`): Filter applied to the records.
+                If ``None``, uses ``MFTConfig.header_filter``.
+
+        Yields:
+            tuple(int, tuple): The record number and the values, in the same
+                order as ``Projection.columns``
+        '''
+        if not isinstance(projection, Projection):
+            projection = Projection(projection)
+        parse, read_extensions = projection.parse, self._extension_records
+        for i, record in self._iter_raw_records(start, end, header_filter):
+            yield i, parse(record, _partial(read_extensions, i, record))
+
+    def build_timestamp_index(self, which=None):
+        '''Indexes the timestamps of the entries, so ``between`` doesn't
+        have to read the MFT. See ``TimestampIndex``.
+
+        Args:
+            which (list(str)): The timestamps. If ``None``, all of them.
+        '''
+        self.timestamp_index.build(self, which)
+
+    def between(self, start=None, end=None, which="si.changed"):
+        '''Returns the entries with a timestamp in a time window.
+
+        The first call for a timestamp indexes it, the next ones only do a
+        binary search.
+
+        Args:
+            start (datetime or int): Start of the window (inclusive), as a
+                ``datetime`` or FILETIME. If ``None``, there is no start.
+            end (datetime or int): End of the window (inclusive), as a
+                ``datetime`` or FILETIME. If ``None``, there is no end.
+            which (str): The timestamp, for example ``si.changed``,
+                ``fn.created`` or ``fn_all.created``. See ``TimestampIndex``.
+
+        Returns:
+            array: The record numbers, ordered by the timestamp
+        '''
+        if which not in self.timestamp_index:
+            self.timestamp_index.build(self, [which])
+        return self.timestamp_index.between(which, start, end)
+
+    def query(self, query, columns=("record", "path"), start=0, end=None):
+        '''Returns the records that match a query.
+
+        For example, ``mft.query("name:*.exe AND size > 10MB AND NOT deleted",
+        ["path", "size"])``. See ``libmft.query.Query`` for the syntax and
+        ``libmft.query`` for the available columns.
+
+        Args:
+            query (str): The query
+            columns (list(str)): Columns returned for each record
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+
+        Yields:
+            tuple: The values of the columns, in the same order as ``columns``
+        '''
+        from libmft.query import Query
+
+        return Query(query, columns).rows(self, start, end)
+
+    def unallocated_generator(self, start=0, end=None):
+        '''Iterates only over the entries that are not allocated, normally
+        deleted files.
+
+        If the bitmap is available, only the unallocated records are read,
+        otherwise all the records are read and the ones that are marked as
+        in use are discarded.
+
+        Args:
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+        '''
+        entry = None
+        if end is None:
+            end = self.total_amount_entries
+
+        if self.bitmap is not None:
+            ranges, check_flags = self._record_ranges(start, end, False), False
+        else:
+            ranges, check_flags = (range(start, end), ), True
+        for numbers in ranges:
+            for i in numbers:
+                if i not in self._entries_child_parent:
+                    entry = self[i]
+                    if entry is not None and (not check_flags or entry.is_deleted):
+                        yield entry
 
     def __iter__(self):
         '''Iterates only over valid entries, that means, no empty entries and
         no child entries.'''
-        entry = None
+        return self.splice_generator(0, self.total_amount_entries)
+
+    def _coalesce(self, numbers, max_gap, max_read):
+        '''Groups sorted record numbers in spans that can be read at once.
+        Records are in the same span if the distance between them is at most
+        ``max_gap`` records and the span is not bigger than ``max_read`` bytes.
+
+        Yields:
+            tuple(int, int, list(int)): First and last record of the span and
+                the records that were requested in it
+        '''
+        max_records = max(max_read // self.mft_entry_size, 1)
+        group = []
+        for number in numbers:
+            if group and (number - group[-1] > max_gap + 1 or number - group[0] >= max_records):
+                yield group[0], group[-1], group
+                group = []
+            group.append(number)
+        if group:
+            yield group[0], group[-1], group
+
+    def iter_many(self, indexes, max_gap=16, max_read=4*1024*1024):
+        '''Reads multiple entries, in the order they are in the file.
+
+        The requested entries and their extension records are sorted and
+        records that are close are read with a single read, turning random
+        reads into sequential ones.
+
+        Args:
+            indexes (Iterable of int): The entry numbers. Repeated numbers are
+                returned only once
+            max_gap (int): Maximum number of records that are not needed
+                that can be read to join two requested records
+            max_read (int): Maximum size, in bytes, of a single read
+
+        Yields:
+            tuple(int, :obj:`MFTEntry`): The entry number and the entry, that
+                can be ``None`` if the entry is empty
+        '''
+        entry_size, config = self.mft_entry_size, self.mft_config
+        requested = set(indexes)
+        for index in requested:
+            if not 0 <= index < self.total_amount_entries:
+                raise IndexError("Entry number out of bounds")
+        missing, owners = {}, {} #base -> extension records, extension record -> base
+        for index in requested:
+            if index in self._entries_parent_child:
+                missing[index] = set(self._entries_parent_child[index])
+                for number in missing[index]:
+                    owners[number] = index
+        pending, extensions = {}, {} #entries waiting extension records and the opposite
+        buffer = bytearray()
+
+        for first, last, numbers in self._coalesce(sorted(requested | owners.keys()), max_gap, max_read):
+            span = (last - first + 1) * entry_size
+            if len(buffer) < span:
+                buffer = bytearray(span)
+            with self._fp_lock:
+                self.file_pointer.seek(first * entry_size)
+                self.file_pointer.readinto(memoryview(buffer)[:span])
+            for number in numbers:
+                offset = (number - first) * entry_size
+                if number in owners:
+                    base = owners[number]
+                    extension = MFTEntry.create_from_binary(config, buffer[offset:offset+entry_size], number)
+                    if base in pending:
+                        if extension is not None:
+                            pending[base].merge_entries(extension)
+                        missing[base].discard(number)
+                        if not missing[base]:
+                            yield base, pending.pop(base)
+                    else:
+                        extensions[number] = extension
+                if number in requested:
+                    entry = MFTEntry.create_from_binary(config, buffer[offset:offset+entry_size], number)
+                    if entry is not None and number in missing:
+                        for ext_number in list(missing[number]):
+                            if ext_number in extensions:
+                                extension = extensions.pop(ext_number)
+                                if extension is not None:
+                                    entry.merge_entries(extension)
+                                missing[number].discard(ext_number)
+                        if missing[number]:
+                            pending[number] = entry
+                            continue
+                    yield number, entry
+
+    def get_many(self, indexes, max_gap=16, max_read=4*1024*1024):
+        '''Reads multiple entries. See ``iter_many``.
+
+        Args:
+            indexes (Iterable of int): The entry numbers
+            max_gap (int): Maximum number of records that are not needed
+                that can be read to join two requested records
+            max_read (int): Maximum size, in bytes, of a single read
+
+        Returns:
+            list(:obj:`MFTEntry`): The entries, in the same order as ``indexes``
+        '''
+        indexes = list(indexes)
+        entries = dict(self.iter_many(indexes, max_gap, max_read))
+        return [entries[index] for index in indexes]
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.mft_config.async_workers, "libmft-async")
+        return self._executor
 
-        for i in range(0, self.total_amount_entries):
-            if i not in self._entries_child_parent:
-                entry = self[i]
-                if entry is not None:
+    async def aget(self, index):
+        '''Asynchronous version of ``mft[index]``. The entry is read by a
+        thread, so the event loop is not blocked.'''
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.__getitem__, index)
+
+    async def aget_many(self, indexes):
+        '''Asynchronously reads multiple entries.
+
+        The entry numbers are sorted and split in batches, each one read by
+        a thread with ``get_many``. Only a limited number of batches is
+        requested at the same time.
+
+        Args:
+            indexes (Iterable of int): The entry numbers
+
+        Returns:
+            list(:obj:`MFTEntry`): The entries, in the same order as ``indexes``.
+        '''
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        indexes = list(indexes)
+        numbers = sorted(set(indexes))
+        batch_size = self.mft_config.async_batch_size
+        semaphore = asyncio.Semaphore(self.mft_config.async_workers * 2)
+
+        async def get_batch(batch):
+            async with semaphore:
+                return await loop.run_in_executor(executor, self.get_many, batch)
+
+        batches = await asyncio.gather(*(get_batch(numbers[i:i+batch_size])
+                                         for i in range(0, len(numbers), batch_size)))
+        entries = {}
+        for i, batch in zip(range(0, len(numbers), batch_size), batches):
+            entries.update(zip(numbers[i:i+batch_size], batch))
+        return [entries[index] for index in indexes]
+
+    async def aiter_entries(self, start=0, end=None):
+        '''Asynchronous version of ``splice_generator``.
+
+        A thread goes over the entries and passes them, in batches, to the
+        event loop. Only a few batches are kept in memory, if the caller is
+        slower than the thread, the thread waits.
+
+        Args:
+            start (int): First entry number
+            end (int): Last entry number (exclusive). If ``None``, goes until
+                the end of the MFT.
+        '''
+        loop = asyncio.get_running_loop()
+        batches = asyncio.Queue(self.mft_config.async_workers * 2)
+        stop = threading.Event()
+        if end is None:
+            end = self.total_amount_entries
+
+        def put(item):
+            '''Waits until the item is in the queue. Returns False if the
+            iteration was interrupted.'''
+            future = asyncio.run_coroutine_threadsafe(batches.put(item), loop)
+            while not stop.is_set():
+                try:
+                    future.result(0.1)
+                    return True
+                except _FutureTimeoutError:
+                    pass
+            future.cancel()
+            return False
+
+        def producer():
+            batch = []
+            try:
+                for entry in self.splice_generator(start, end):
+                    batch.append(entry)
+                    if len(batch) >= self.mft_config.async_batch_size:
+                        if not put(batch):
+                            return
+                        batch = []
+                if put(batch):
+                    put(None)
+            except Exception as e:
+                put(e)
+
+        producer_future = loop.run_in_executor(self._get_executor(), producer)
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                for entry in batch:
                     yield entry
+        finally:
+            stop.set()
+            await producer_future
 
     @lru_cache(1024)
     def __getitem__(self, index):
@@ -1024,3 +2418,178 @@ class MFT():
             raise MFTError("Could not find MFT entry size. Please provide one manually.")
 
         return size
+
+class StreamingMFT():
+    '''Represents a MFT that can only be read forward, like a pipe or the
+    standard input.
+
+    The ``MFT`` class needs to seek the file to find the size of the entries,
+    the amount of entries and the relationship between them. This class reads
+    the records as they arrive and yields the entries as soon as they are
+    complete, so the MFT can be parsed directly from a decompression or an
+    acquisition tool.
+
+    The size of the entries is detected from the first record. The entries
+    that have extension records are kept until all the records referenced by
+    their ATTRIBUTE_LIST have been read. Extension records that are read
+    before their base record are kept until the base record appears. Records
+    that could not be matched are returned, as they are, at the end.
+
+    The ATTRIBUTE_LIST is read directly from the records, so the extension
+    records are found even if ``MFTConfig.load_attr_list`` is disabled.
+
+    Note:
+        If the ATTRIBUTE_LIST is non resident or invalid, it is not possible
+        to know which records are missing and the entry is returned only at
+        the end.
+
+    Args:
+        file_pointer (?): Pointer to a file opened in read and binary mode. Only
+            ``readinto`` is used.
+        mft_config (:obj:`MFTConfig`): Configuration for the library. If none
+            is provided, the default configuration is provided.
+
+    Attributes:
+        mft_entry_size (int): Size of a MFT entry. Zero until it is detected.
+        records_read (int): Number of records read so far
+    '''
+    _ALLOC_LEN = struct.Struct("<I")
+    _ALLOC_LEN_OFFSET = 28
+
+    def __init__(self, file_pointer, mft_config=MFTConfig()):
+        '''See class docstring.'''
+        self.file_pointer = file_pointer
+        self.mft_config = mft_config
+        self.mft_entry_size = self.mft_config.entry_size
+        self.records_read = 0
+
+    def _read_record(self, view):
+        '''Fills the view with data from the file. Returns the amount of bytes
+        read, that is less than the size of the view only at the end.'''
+        done, size = 0, len(view)
+        while done < size:
+            read = self.file_pointer.readinto(view[done:])
+            if not read:
+                break
+            done += read
+        return done
+
+    def _detect_entry_size(self):
+        '''Reads the beginning of the first record and finds the entry size.
+        Returns the part of the record that was read.'''
+        header = bytearray(self._ALLOC_LEN_OFFSET + self._ALLOC_LEN.size)
+        if self._read_record(memoryview(header)) != len(header):
+            raise MFTError("Not enough data to find the MFT entry size.")
+        self.mft_entry_size, = self._ALLOC_LEN.unpack_from(header, self._ALLOC_LEN_OFFSET)
+        if self.mft_entry_size < len(header):
+            raise MFTError("Could not find MFT entry size. Please provide one manually.")
+        _MOD_LOGGER.info("MFT entry size found = %d", self.mft_entry_size)
+
+        return header
+
+    def _records(self):
+        '''Yields the number, the entry and, for base records, the numbers of
+        the extension records (see ``_extension_records``) of all the records
+        in the file'''
+        filled = 0
+        if not self.mft_entry_size:
+            header = self._detect_entry_size()
+            filled = len(header)
+            binary = header + bytearray(self.mft_entry_size - filled)
+        else:
+            binary = bytearray(self.mft_entry_size)
+        view = memoryview(binary)
+
+        while True:
+            read = filled + self._read_record(view[filled:])
+            filled = 0
+            if read != self.mft_entry_size:
+                if read:
+                    _MOD_LOGGER.warning("Incomplete record at the end of the MFT (%d bytes).", read)
+                break
+            number = self.records_read
+            self.records_read += 1
+            entry = MFTEntry.create_from_binary(self.mft_config, binary, number)
+            if entry is not None:
+                #the buffer is reused, the ATTRIBUTE_LIST is read before the next record
+                extensions = None if entry.header.base_record_ref else self._extension_records(number, binary)
+                yield number, entry, extensions
+        view.release()
+
+    @staticmethod
+    def _extension_records(number, record):
+        '''Returns the numbers of the extension records of a base record,
+        read from the ATTRIBUTE_LIST in the binary record, or ``None`` if it
+        is not possible to know them.'''
+        word, attr_list_type = EntryView._WORD.unpack_from, AttrTypes.ATTRIBUTE_LIST.value
+        offset, record_len = word(record, 20)[0], len(record)
+        while offset + 8 <= record_len:
+            attr_type, attr_len = _ATTR_LENGTH.unpack_from(record, offset)
+            if attr_type == _ATTR_END_MARKER or not attr_len:
+                break
+            if attr_type == attr_list_type:
+                if record[offset+8]:
+                    _MOD_LOGGER.debug("Non resident ATTRIBUTE_LIST in the record %d", number)
+                    return None
+                content = offset + word(record, offset + 20)[0]
+                length = _ATTR_TYPE.unpack_from(record, offset + 16)[0]
+                try:
+                    attr_list = AttributeList.create_from_buffer(record, content, length)
+                except (struct.error, ValueError) as e:
+                    _MOD_LOGGER.warning("Invalid ATTRIBUTE_LIST in the record %d: %s", number, e)
+                    return None
+                return {attr_entry.file_ref for attr_entry in attr_list if attr_entry.file_ref != number}
+            offset += attr_len
+        return set()
+
+    def __iter__(self):
+        '''Iterates over the entries, as they are completed. Extension records
+        are merged with their base records.'''
+        pending = {} #base record -> [entry, missing records (or None)]
+        orphans = _defaultdict(list) #base record -> [(record number, entry)]
+
+        for number, entry, missing in self._records():
+            base_ref = entry.header.base_record_ref
+            if base_ref:
+                base = pending.get(base_ref)
+                if base is not None and base[0].header.seq_number == entry.header.base_record_seq:
+                    base[0].merge_entries(entry)
+                    if base[1] is not None:
+                        base[1].discard(number)
+                        if not base[1]:
+                            del pending[base_ref]
+                            yield base[0]
+                else:
+                    orphans[base_ref].append((number, entry))
+                continue
+
+            if number in orphans:
+                unmatched = []
+                for ext_number, ext_entry in orphans.pop(number):
+                    if ext_entry.header.base_record_seq == entry.header.seq_number:
+                        entry.merge_entries(ext_entry)
+                        if missing is not None:
+                            missing.discard(ext_number)
+                    else:
+                        unmatched.append((ext_number, ext_entry))
+                if unmatched:
+                    orphans[number] = unmatched
+            if missing is not None and not missing:
+                yield entry
+            else:
+                pending[number] = [entry, missing]
+
+        for number in sorted(pending):
+            entry, missing = pending[number]
+            if missing:
+                _MOD_LOGGER.warning("Entry %d is missing the extension records %s.", number, sorted(missing))
+            yield entry
+        for ext_number, ext_entry in sorted((orphan for records in orphans.values() for orphan in records),
+                                            key=_itemgetter(0)):
+            _MOD_LOGGER.warning("Extension record %d has no base record.", ext_number)
+            yield ext_entry
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(mft_entry_size={self.mft_entry_size}, '
+                f'records_read={self.records_read}, mft_config={self.mft_config})')
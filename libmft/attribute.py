@@ -19,9 +19,11 @@ dynamic, that means that expected methods are created when the module is
 imported.
 
 Note:
-    All creation code from binary stream expects a `memoryview` object. This is
-    for performance reasons, as this don't generate new objects when we slice
-    the data.
+    All creation code works over a buffer (normally a `memoryview` object) plus
+    an explicit offset and length (``create_from_buffer``). The values are read
+    directly from the buffer with ``unpack_from``, avoiding the creation of
+    intermediate slices in the parsing chain. The ``create_from_binary`` methods
+    are kept as thin wrappers for when the whole buffer represents the object.
 
 Important:
     The implementation of __len__ in the classes here is meant to return the
@@ -31,10 +33,13 @@ Important:
 '''
 import struct
 import logging
+import re as _re
+from array import array as _array
 from operator import getitem as _getitem
 from uuid import UUID
 from abc import ABCMeta, abstractmethod
 from math import ceil as _ceil
+from functools import lru_cache as _lru_cache
 import sys as _sys
 
 from libmft.util.functions import convert_filetime, get_file_reference
@@ -52,11 +57,13 @@ _MOD_LOGGER = logging.getLogger(__name__)
 '''logging.Logger: Module level logger for all the logging needs of the module'''
 _ATTR_BASIC = struct.Struct("<2IB")
 '''struct.Struct: Struct to get basic information from the attribute header'''
+_SEC_DESC_CACHE_SIZE = 4096
+'''int: Number of unique security descriptors kept parsed in memory'''
 
 #******************************************************************************
 # MODULE LEVEL FUNCTIONS
 #******************************************************************************
-def get_attr_info(binary_view):
+def get_attr_info(binary_view, offset=0):
     '''Gets basic information from a binary stream to allow correct processing of
     the attribute header.
 
@@ -66,6 +73,7 @@ def get_attr_info(binary_view):
     Args:
         binary_view (memoryview of bytearray) - A binary stream with the
             information of the attribute
+        offset (int) - Where the attribute starts in the binary stream
 
     Returns:
         An tuple with the attribute type, the attribute length, in bytes, and
@@ -73,10 +81,105 @@ def get_attr_info(binary_view):
     '''
     global _ATTR_BASIC
 
-    attr_type, attr_len, non_resident = _ATTR_BASIC.unpack(binary_view[:9])
+    attr_type, attr_len, non_resident = _ATTR_BASIC.unpack_from(binary_view, offset)
 
     return (AttrTypes(attr_type), attr_len, bool(non_resident))
 
+def _create_func_from_str(f_name, args, content, docstring="", namespace=None):
+    '''Helper function to create functions from strings.
+
+    To improve performance, the standard functions are created at runtime
+    based on the string derived from the content. This way the function, from
+    the interpreter point of view, looks like statically defined.
+
+    Args:
+        f_name (str): Function name
+        args (list(str)): List of arguments that the function will receive
+        content (str): Content of the function. If it has multiple lines, each
+            line must be indented.
+        docstring (str): Function's docstring
+        namespace (dict): Names that the function can use
+
+    Returns:
+        A new function object.
+    '''
+    exec_namespace = {"__name__" : f"{f_name}"}
+    if namespace is not None:
+        exec_namespace.update(namespace)
+    new_args = ", ".join(args)
+    func_str = f"def {f_name}({new_args}): {content}"
+    exec(func_str, exec_namespace)
+    func = exec_namespace[f_name]
+    func.__doc__ = docstring
+
+    return func
+
+def _create_projection_func(name, layout, fields, namespace=None):
+    '''Creates a function that interprets only some fields of a structure.
+
+    The function is created from a string, like the methods of the attribute
+    contents, with a struct that unpacks only the requested fields and skips
+    everything else. The created function has the signature
+    ``func(buffer, offset, length)`` and returns a tuple with the values of
+    the fields, in the same order as ``fields``.
+
+    Args:
+        name (str): Name of the created function
+        layout (tuple(int, dict)): The minimum size of the structure and a
+            dictionary that maps a field name to its offset, its struct format
+            and an expression, with ``{}`` representing the unpacked value,
+            that converts the value. Fields that are after the minimum size
+            are ``None`` if the structure is not big enough.
+        fields (tuple(str)): The fields that will be interpreted
+        namespace (dict): Names used by the conversion expressions
+
+    Returns:
+        function: The new function
+    '''
+    min_size, field_layout = layout
+    unknown = [field for field in fields if field not in field_layout]
+    if unknown:
+        raise ValueError(f"Unknown fields for {name}: {', '.join(unknown)}. Valid fields are: {', '.join(field_layout)}")
+
+    structs, lines = {}, []
+    for struct_name, optional in (("_REPR", False), ("_REPR_EXT", True)):
+        positions = sorted({field_layout[field][:2] for field in fields
+                            if (field_layout[field][0] >= min_size) == optional})
+        if not positions:
+            continue
+        data_structure, position = "<", 0
+        for field_offset, field_format in positions:
+            if field_offset < position:
+                raise ValueError(f"Overlapping fields in the {name} layout")
+            if field_offset > position:
+                data_structure += f"{field_offset - position}x"
+            data_structure += field_format
+            position = field_offset + struct.calcsize(field_format)
+        structs[struct_name] = struct.Struct(data_structure)
+        names = ", ".join([f"v{field_offset}" for field_offset, _ in positions]) + ","
+        if not optional:
+            lines.append(f"{names} = {struct_name}.unpack_from(buffer, offset)")
+        else:
+            lines.append(f"if length >= {struct_name}.size:")
+            lines.append(f"    {names} = {struct_name}.unpack_from(buffer, offset)")
+            lines.append("else:")
+            lines.append(f"    {names} = {', '.join(['None'] * len(positions))},")
+
+    values = []
+    for field in fields:
+        field_offset, _, expression = field_layout[field]
+        value = expression.format(f"v{field_offset}")
+        if field_offset >= min_size and expression != "{}":
+            value = f"({value} if v{field_offset} is not None else None)"
+        values.append(value)
+    lines.append(f"return ({', '.join(values)}{',' if len(values) == 1 else ''})")
+
+    func = _create_func_from_str(name, ["buffer", "offset", "length"],
+            "\n" + "\n".join(["    " + line for line in lines]),
+            f"Interprets the fields {', '.join(fields)}.", {**(namespace or {}), **structs})
+    func.fields = tuple(fields)
+    return func
+
 def _create_attrcontent_class(name, fields, inheritance=(object,), data_structure=None, extra_functions=None, docstring=""):
     '''Helper function that creates a class for attribute contents.
 
@@ -114,33 +217,9 @@ def _create_attrcontent_class(name, fields, inheritance=(object,), data_structur
     '''
 
     def create_func_from_str(f_name, args, content, docstring=""):
-        '''Helper function to create functions from strings.
-
-        To improve performance, the standard functions are created at runtime
-        based on the string derived from the content. This way the function, from
-        the interpreter point of view, looks like statically defined.
-
-        Note:
-            This function should be used only for methods that will receive
-            ``self`` (instace methods). The ``self`` argument is added automatically.
-
-        Args:
-            f_name (str): Function name
-            args (list(str)): List of extra arguments that the function will receive
-            content (str): Content of the function
-            docstring (str): Function's docstring
-
-        Returns:
-            A new function object that can be inserted in the class.
-        '''
-        exec_namespace = {"__name__" : f"{f_name}"}
-        new_args = ", ".join(["self"] + args)
-        func_str = f"def {f_name}({new_args}): {content}"
-        exec(func_str, exec_namespace)
-        func = exec_namespace[f_name]
-        func.__doc__ = docstring
-
-        return func
+        '''Creates an instance method from a string. The ``self`` argument
+        is added automatically. See ``_create_func_from_str``.'''
+        return _create_func_from_str(f_name, ["self"] + args, content, docstring)
 
     #creates the functions necessary for the new class
     slots = fields
@@ -153,7 +232,7 @@ def _create_attrcontent_class(name, fields, inheritance=(object,), data_structur
     __repr__ = create_func_from_str("__repr__", [],  repr)
 
     temp = " and ".join([f"self.{field} == other.{field}" for field in fields])
-    eq = f"return {temp} if isinstance(other, {name}) else False"
+    eq = f"return {temp} if isinstance(other, self.__class__) else False"
     __eq__ = create_func_from_str("__eq__", ["other"], eq)
 
     @classmethod
@@ -268,9 +347,9 @@ class DataRuns():
     '''
     _INFO = struct.Struct("<B")
 
-    def __init__(self, data_runs=[]):
+    def __init__(self, data_runs=None):
         '''See class docstring.'''
-        self.data_runs = data_runs #list of tuples
+        self.data_runs = data_runs if data_runs is not None else [] #list of tuples
 
     @classmethod
     def create_from_binary(cls, binary_view):
@@ -285,30 +364,44 @@ class DataRuns():
         Returns:
             DataRuns: New object using hte binary stream as source
         '''
-        nw_obj = cls()
-        offset = 0
+        return cls.create_from_buffer(binary_view, 0)
+
+    @classmethod
+    def create_from_buffer(cls, buffer, offset):
+        '''Creates a new object DataRuns from a buffer, starting at ``offset``.
+        The end of the runlist is defined by the data itself.
+
+        Args:
+            buffer (memoryview of bytearray) - A binary stream with the
+                information of the attribute
+            offset (int) - Where the runlist starts in the buffer
+
+        Returns:
+            DataRuns: New object using hte binary stream as source
+        '''
+        data_runs = []
         previous_dr_offset = 0
         header_size = cls._INFO.size #"header" of a data run is always a byte
 
-        while binary_view[offset] != 0:   #the runlist ends with an 0 as the "header"
-            header = cls._INFO.unpack(binary_view[offset:offset+header_size])[0]
+        header = buffer[offset]
+        while header != 0:   #the runlist ends with an 0 as the "header"
             length_len = header & 0x0F
             length_offset = (header & 0xF0) >> 4
 
             temp_len = offset+header_size+length_len #helper variable just to make things simpler
-            dr_length = int.from_bytes(binary_view[offset+header_size:temp_len], "little", signed=False)
+            dr_length = int.from_bytes(buffer[offset+header_size:temp_len], "little", signed=False)
             if length_offset: #the offset is relative to the previous data run
-                dr_offset = int.from_bytes(binary_view[temp_len:temp_len+length_offset], "little", signed=True) + previous_dr_offset
+                dr_offset = int.from_bytes(buffer[temp_len:temp_len+length_offset], "little", signed=True) + previous_dr_offset
                 previous_dr_offset = dr_offset
             else: #if it is sparse, requires a a different approach
                 dr_offset = None
             offset += header_size + length_len + length_offset
-            nw_obj.data_runs.append((dr_length, dr_offset))
-            #nw_obj.data_runs.append(DataRun(dr_length, dr_offset))
+            data_runs.append((dr_length, dr_offset))
+            header = buffer[offset]
 
         _MOD_LOGGER.debug("DataRuns object created successfully")
 
-        return nw_obj
+        return cls(data_runs)
 
     def __len__(self):
         '''Returns the number of data runs'''
@@ -389,10 +482,26 @@ class BaseAttributeHeader():
         Returns:
             BaseAttributeHeader: New object using hte binary stream as source
         '''
-        attr_type, attr_len, non_resident, name_len, name_offset, flags, attr_id = cls._REPR.unpack(binary_view[:cls._REPR.size])
+        return cls.create_from_buffer(binary_view, 0)
+
+    @classmethod
+    def create_from_buffer(cls, buffer, offset):
+        '''Creates a new object BaseAttributeHeader from a buffer, where the
+        header starts at ``offset``.
+
+        Args:
+            buffer (memoryview of bytearray) - A binary stream with the
+                information of the attribute
+            offset (int) - Where the attribute starts in the buffer
+
+        Returns:
+            BaseAttributeHeader: New object using hte binary stream as source
+        '''
+        attr_type, attr_len, non_resident, name_len, name_offset, flags, attr_id = cls._REPR.unpack_from(buffer, offset)
 
         if name_len:
-            name = binary_view[name_offset:name_offset+(2*name_len)].tobytes().decode("utf_16_le")
+            name_offset += offset
+            name = str(buffer[name_offset:name_offset+(2*name_len)], "utf_16_le")
         else:
             name = None
 
@@ -476,14 +585,30 @@ class ResidentAttrHeader(BaseAttributeHeader):
             binary_view (memoryview of bytearray) - A binary stream with the
                 information of the attribute
 
+        Returns:
+            AttributeHeader: New object using hte binary stream as source
+        '''
+        return cls.create_from_buffer(binary_view, 0)
+
+    @classmethod
+    def create_from_buffer(cls, buffer, offset):
+        '''Creates a new object AttributeHeader from a buffer, where the
+        header starts at ``offset``.
+
+        Args:
+            buffer (memoryview of bytearray) - A binary stream with the
+                information of the attribute
+            offset (int) - Where the attribute starts in the buffer
+
         Returns:
             AttributeHeader: New object using hte binary stream as source
         '''
         attr_type, attr_len, non_resident, name_len, name_offset, flags, attr_id, \
-        content_len, content_offset, indexed_flag = cls._REPR.unpack(binary_view[:cls._REPR.size])
+        content_len, content_offset, indexed_flag = cls._REPR.unpack_from(buffer, offset)
 
         if name_len:
-            name = binary_view[name_offset:name_offset+(2*name_len)].tobytes().decode("utf_16_le")
+            name_offset += offset
+            name = str(buffer[name_offset:name_offset+(2*name_len)], "utf_16_le")
         else:
             name = None
 
@@ -567,27 +692,41 @@ class NonResidentAttrHeader(BaseAttributeHeader):
             load_dataruns (bool) - Indicates if the dataruns are to be loaded
             binary_view (memoryview of bytearray) - A binary stream with the
                 information of the attribute
-            non_resident_offset (int) - The offset where the non resident header
-                begins
+
+        Returns:
+            NonResidentAttrHeader: New object using hte binary stream as source
+        '''
+        return cls.create_from_buffer(load_dataruns, binary_view, 0)
+
+    @classmethod
+    def create_from_buffer(cls, load_dataruns, buffer, offset):
+        '''Creates a new object NonResidentAttrHeader from a buffer, where the
+        header starts at ``offset``.
+
+        Args:
+            load_dataruns (bool) - Indicates if the dataruns are to be loaded
+            buffer (memoryview of bytearray) - A binary stream with the
+                information of the attribute
+            offset (int) - Where the attribute starts in the buffer
 
         Returns:
             NonResidentAttrHeader: New object using hte binary stream as source
         '''
         attr_type, attr_len, non_resident, name_len, name_offset, flags, attr_id, \
             start_vcn, end_vcn, rl_offset, compress_usize, alloc_sstream, curr_sstream, \
-            init_sstream = cls._REPR.unpack(binary_view[:cls._REPR.size])
+            init_sstream = cls._REPR.unpack_from(buffer, offset)
 
         if name_len:
-            name = binary_view[name_offset:name_offset+(2*name_len)].tobytes().decode("utf_16_le")
+            name_offset += offset
+            name = str(buffer[name_offset:name_offset+(2*name_len)], "utf_16_le")
         else:
             name = None
 
-        #content = cls._REPR.unpack(binary_view[non_resident_offset:non_resident_offset+cls._REPR.size])
         nw_obj = cls((AttrTypes(attr_type), attr_len, bool(non_resident), AttrFlags(flags), attr_id, name),
             (start_vcn, end_vcn, rl_offset, compress_usize, alloc_sstream, curr_sstream, init_sstream))
 
         if load_dataruns:
-            nw_obj.data_runs = DataRuns.create_from_binary(binary_view[nw_obj.rl_offset:])
+            nw_obj.data_runs = DataRuns.create_from_buffer(buffer, offset + rl_offset)
         _MOD_LOGGER.debug("NonResidentAttrHeader object created successfully")
 
         return nw_obj
@@ -621,14 +760,32 @@ class AttributeContentBase(metaclass=ABCMeta):
     '''
 
     @classmethod
-    @abstractmethod
-    def create_from_binary(cls, binary_stream):
+    def create_from_binary(cls, binary_stream, *args):
         '''Creates an object from from a binary stream.
 
+        This is a thin wrapper around ``create_from_buffer``, considering the
+        whole binary stream as the content.
+
         Args:
             binary_stream (memoryview): A buffer access to the underlying binary
                 stream
 
+        Returns:
+            A new object of whatever type has overloaded the method.
+        '''
+        return cls.create_from_buffer(binary_stream, 0, len(binary_stream), *args)
+
+    @classmethod
+    @abstractmethod
+    def create_from_buffer(cls, buffer, offset, length):
+        '''Creates an object from a region of a buffer.
+
+        Args:
+            buffer (memoryview): A buffer access to the underlying binary
+                stream
+            offset (int): Where the content starts in the buffer
+            length (int): Size of the content, in bytes
+
         Returns:
             A new object of whatever type has overloaded the method.
         '''
@@ -675,20 +832,20 @@ class AttributeContentRepr(AttributeContentBase):
 def _len_ts(self):
     return Timestamps._REPR.size
 
-def _from_binary_ts(cls, binary_stream):
+def _from_buffer_ts(cls, buffer, offset, length):
     """See base class."""
     repr = cls._REPR
 
-    if len(binary_stream) != repr.size:
+    if length != repr.size:
         raise ContentError("Invalid binary stream size")
 
-    content = repr.unpack(binary_stream)
+    content = repr.unpack_from(buffer, offset)
     nw_obj = cls()
     nw_obj.created, nw_obj.changed, nw_obj.mft_changed, nw_obj.accessed = \
         convert_filetime(content[0]), convert_filetime(content[1]), \
         convert_filetime(content[2]), convert_filetime(content[3])
 
-    _MOD_LOGGER.debug("Attempted to unpack Timestamp from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack Timestamp from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -739,7 +896,7 @@ Attributes:
 '''
 
 _ts_namespace = {"__len__" : _len_ts,
-                 "create_from_binary" : classmethod(_from_binary_ts),
+                 "create_from_buffer" : classmethod(_from_buffer_ts),
                  "astimezone" : _astimezone_ts
                  }
 
@@ -753,7 +910,7 @@ Timestamps = _create_attrcontent_class("Timestamps", ("created", "changed", "mft
 def _len_stdinfo(self):
     return StandardInformation._TIMESTAMP_SIZE + StandardInformation._REPR.size
 
-def _from_binary_stdinfo(cls, binary_stream):
+def _from_buffer_stdinfo(cls, buffer, offset, length):
     """See base class."""
     '''
         TIMESTAMPS(32)
@@ -771,9 +928,9 @@ def _from_binary_stdinfo(cls, binary_stream):
         Update Sequence Number (USN) - 8 (NTFS 3+)
     '''
 
-    if len(binary_stream) == cls._REPR.size: #check if it is v3 by size of the stram
+    if length == cls._REPR.size: #check if it is v3 by size of the stram
         t_created, t_changed, t_mft_changed, t_accessed, flags, m_ver, ver, \
-            c_id, o_id, s_id, quota_charged, usn = cls._REPR.unpack(binary_stream)
+            c_id, o_id, s_id, quota_charged, usn = cls._REPR.unpack_from(buffer, offset)
         nw_obj = cls(
             (   Timestamps((convert_filetime(t_created), convert_filetime(t_changed),
                             convert_filetime(t_mft_changed), convert_filetime(t_accessed))
@@ -781,13 +938,13 @@ def _from_binary_stdinfo(cls, binary_stream):
     else:
         #if the content is not using v3 extension, added the missing stuff for consistency
         t_created, t_changed, t_mft_changed, t_accessed, flags, m_ver, ver, \
-            c_id  = cls._REPR_NO_NFTS_3_EXTENSION.unpack(binary_stream)
+            c_id  = cls._REPR_NO_NFTS_3_EXTENSION.unpack_from(buffer, offset)
         nw_obj = cls(
             (   Timestamps((convert_filetime(t_created), convert_filetime(t_changed),
                             convert_filetime(t_mft_changed), convert_filetime(t_accessed))
             ), FileInfoFlags(flags), m_ver, ver, c_id, None, None, None, None))
 
-    _MOD_LOGGER.debug("Attempted to unpack STANDARD_INFORMATION from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack STANDARD_INFORMATION from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -826,7 +983,7 @@ Attributes:
 '''
 
 _stdinfo_namespace = {"__len__" : _len_stdinfo,
-                 "create_from_binary" : classmethod(_from_binary_stdinfo),
+                 "create_from_buffer" : classmethod(_from_buffer_stdinfo),
                  "_REPR_NO_NFTS_3_EXTENSION" : struct.Struct("<4Q4I")
                  }
 
@@ -839,7 +996,7 @@ StandardInformation = _create_attrcontent_class("StandardInformation",
 #******************************************************************************
 # ATTRIBUTE_LIST ATTRIBUTE
 #******************************************************************************
-def _from_binary_attrlist_e(cls, binary_stream):
+def _from_buffer_attrlist_e(cls, buffer, offset, length):
     """See base class."""
     '''
         Attribute type - 4
@@ -852,15 +1009,15 @@ def _from_binary_attrlist_e(cls, binary_stream):
         Name (unicode) - variable
     '''
 
-    attr_type, entry_len, name_len, name_off, s_vcn, f_tag, attr_id = cls._REPR.unpack(binary_stream[:cls._REPR.size])
+    attr_type, entry_len, name_len, name_off, s_vcn, f_tag, attr_id = cls._REPR.unpack_from(buffer, offset)
     if name_len:
-        name = binary_stream[name_off:name_off+(2*name_len)].tobytes().decode("utf_16_le")
+        name = str(buffer[offset+name_off:offset+name_off+(2*name_len)], "utf_16_le")
     else:
         name = None
     file_ref, file_seq = get_file_reference(f_tag)
     nw_obj = cls((AttrTypes(attr_type), entry_len, name_off, s_vcn, file_ref, file_seq, attr_id, name))
 
-    _MOD_LOGGER.debug("Attempted to unpack ATTRIBUTE_LIST Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack ATTRIBUTE_LIST Entry from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -900,7 +1057,7 @@ Attributes:
 '''
 
 _attrlist_e_namespace = {"__len__" : _len_attrlist_e,
-                 "create_from_binary" : classmethod(_from_binary_attrlist_e)
+                 "create_from_buffer" : classmethod(_from_buffer_attrlist_e)
                  }
 
 AttributeListEntry = _create_attrcontent_class("AttributeListEntry",
@@ -911,19 +1068,20 @@ AttributeListEntry = _create_attrcontent_class("AttributeListEntry",
 
 #-----------------------------------------------------------------------------
 
-def _from_binary_attrlist(cls, binary_stream):
+def _from_buffer_attrlist(cls, buffer, offset, length):
     """See base class."""
     _attr_list = []
-    offset = 0
+    end = offset + length
+    entry_offset = offset
 
     while True:
-        entry = AttributeListEntry.create_from_binary(binary_stream[offset:])
-        offset += len(entry)
+        entry = AttributeListEntry.create_from_buffer(buffer, entry_offset, end - entry_offset)
+        entry_offset += len(entry)
         _attr_list.append(entry)
-        if offset >= len(binary_stream):
+        if entry_offset >= end:
             break
-        _MOD_LOGGER.debug("Next AttributeListEntry offset = %d", offset)
-    _MOD_LOGGER.debug("Attempted to unpack ATTRIBUTE_LIST Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), _attr_list)
+        _MOD_LOGGER.debug("Next AttributeListEntry offset = %d", entry_offset)
+    _MOD_LOGGER.debug("Attempted to unpack ATTRIBUTE_LIST Entry from offset %d\nResult: %s", offset, _attr_list)
 
     return cls(_attr_list)
 
@@ -953,7 +1111,7 @@ Args:
 _attrlist_namespace = {"__len__" : _len_attrlist,
                        "__iter__" : _iter_attrlist,
                        "__getitem__" : _gitem_attrlist,
-                       "create_from_binary" : classmethod(_from_binary_attrlist)
+                       "create_from_buffer" : classmethod(_from_buffer_attrlist)
                  }
 
 AttributeList = _create_attrcontent_class("AttributeList",
@@ -964,14 +1122,14 @@ AttributeList = _create_attrcontent_class("AttributeList",
 #******************************************************************************
 # OBJECT_ID ATTRIBUTE
 #******************************************************************************
-def _from_binary_objid(cls, binary_stream):
+def _from_buffer_objid(cls, buffer, offset, length):
     """See base class."""
     uid_size = ObjectID._UUID_SIZE
 
     #some entries might not have all four ids, this line forces
     #to always create 4 elements, so contruction is easier
-    uids = [UUID(bytes_le=binary_stream[i*uid_size:(i+1)*uid_size].tobytes()) if i * uid_size < len(binary_stream) else None for i in range(0,4)]
-    _MOD_LOGGER.debug("Attempted to unpack OBJECT_ID Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), uids)
+    uids = [UUID(bytes_le=bytes(buffer[offset+i*uid_size:offset+(i+1)*uid_size])) if i * uid_size < length else None for i in range(0,4)]
+    _MOD_LOGGER.debug("Attempted to unpack OBJECT_ID Entry from offset %d\nResult: %s", offset, uids)
 
     return cls(uids)
 
@@ -1010,7 +1168,7 @@ Attributes:
 
 _objid_namespace = {"__len__" : _len_objid,
                        "_UUID_SIZE" : 16,
-                       "create_from_binary" : classmethod(_from_binary_objid)
+                       "create_from_buffer" : classmethod(_from_buffer_objid)
                  }
 
 ObjectID = _create_attrcontent_class("ObjectID",
@@ -1022,11 +1180,11 @@ ObjectID = _create_attrcontent_class("ObjectID",
 #******************************************************************************
 # VOLUME_NAME ATTRIBUTE
 #******************************************************************************
-def _from_binary_volname(cls, binary_stream):
+def _from_buffer_volname(cls, buffer, offset, length):
     """See base class."""
-    name = binary_stream.tobytes().decode("utf_16_le")
+    name = str(buffer[offset:offset+length], "utf_16_le")
 
-    _MOD_LOGGER.debug("Attempted to unpack VOLUME_NAME Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), name)
+    _MOD_LOGGER.debug("Attempted to unpack VOLUME_NAME Entry from offset %d\nResult: %s", offset, name)
 
     return cls(name)
 
@@ -1044,7 +1202,7 @@ Attributes:
 """
 
 _volname_namespace = {"__len__" : _len_volname,
-                       "create_from_binary" : classmethod(_from_binary_volname)
+                       "create_from_buffer" : classmethod(_from_buffer_volname)
                  }
 
 VolumeName = _create_attrcontent_class("VolumeName",
@@ -1055,14 +1213,14 @@ VolumeName = _create_attrcontent_class("VolumeName",
 #******************************************************************************
 # VOLUME_INFORMATION ATTRIBUTE
 #******************************************************************************
-def _from_binary_volinfo(cls, binary_stream):
+def _from_buffer_volinfo(cls, buffer, offset, length):
     """See base class."""
-    content = cls._REPR.unpack(binary_stream)
+    content = cls._REPR.unpack_from(buffer, offset)
 
     nw_obj = cls(content)
     nw_obj.vol_flags = VolumeFlags(content[2])
 
-    _MOD_LOGGER.debug("Attempted to unpack VOLUME_INFORMATION Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), content)
+    _MOD_LOGGER.debug("Attempted to unpack VOLUME_INFORMATION Entry from offset %d\nResult: %s", offset, content)
 
     return nw_obj
 
@@ -1092,7 +1250,7 @@ Attributes:
 '''
 
 _volinfo_namespace = {"__len__" : _len_volinfo,
-                       "create_from_binary" : classmethod(_from_binary_volinfo)
+                       "create_from_buffer" : classmethod(_from_buffer_volinfo)
                  }
 
 VolumeInformation = _create_attrcontent_class("VolumeInformation",
@@ -1103,7 +1261,7 @@ VolumeInformation = _create_attrcontent_class("VolumeInformation",
 #******************************************************************************
 # FILENAME ATTRIBUTE
 #******************************************************************************
-def _from_binary_filename(cls, binary_stream):
+def _from_buffer_filename(cls, buffer, offset, length):
     """See base class."""
     ''' File reference to parent directory - 8
         TIMESTAMPS(32)
@@ -1121,8 +1279,8 @@ def _from_binary_filename(cls, binary_stream):
     '''
 
     f_tag, t_created, t_changed, t_mft_changed, t_accessed, alloc_fsize, \
-        real_fsize, flags, reparse_value, name_len, name_type = cls._REPR.unpack(binary_stream[:cls._REPR.size])
-    name = binary_stream[cls._REPR.size:].tobytes().decode("utf_16_le")
+        real_fsize, flags, reparse_value, name_len, name_type = cls._REPR.unpack_from(buffer, offset)
+    name = str(buffer[offset+cls._REPR.size:offset+length], "utf_16_le")
     file_ref, file_seq = get_file_reference(f_tag)
 
     nw_obj = cls((file_ref, file_seq,
@@ -1130,7 +1288,7 @@ def _from_binary_filename(cls, binary_stream):
                         convert_filetime(t_mft_changed), convert_filetime(t_accessed))
         ), alloc_fsize, real_fsize, FileInfoFlags(flags), reparse_value, NameType(name_type), name))
 
-    _MOD_LOGGER.debug("Attempted to unpack FILENAME from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack FILENAME from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1178,7 +1336,7 @@ Attributes:
 '''
 
 _filename_namespace = {"__len__" : _len_filename,
-                       "create_from_binary" : classmethod(_from_binary_filename)
+                       "create_from_buffer" : classmethod(_from_buffer_filename)
                  }
 
 FileName = _create_attrcontent_class("FileName",
@@ -1187,12 +1345,77 @@ FileName = _create_attrcontent_class("FileName",
         inheritance=(AttributeContentRepr,), data_structure="<7Q2I2B",
         extra_functions=_filename_namespace, docstring=_docstring_filename)
 
+#******************************************************************************
+# PROJECTIONS
+#******************************************************************************
+def _timestamp_layout(offset):
+    layout = {}
+    for i, name in enumerate(("created", "changed", "mft_changed", "accessed")):
+        layout[f"timestamps.{name}"] = (offset + i * 8, "Q", "convert_filetime({})")
+        layout[f"raw_timestamps.{name}"] = (offset + i * 8, "Q", "{}")
+    return layout
+
+_PROJECTION_LAYOUTS = {
+    AttrTypes.STANDARD_INFORMATION : (48, {
+        **_timestamp_layout(0),
+        "flags" : (32, "I", "FileInfoFlags({})"),
+        "max_n_versions" : (36, "I", "{}"),
+        "version_number" : (40, "I", "{}"),
+        "class_id" : (44, "I", "{}"),
+        "owner_id" : (48, "I", "{}"),
+        "security_id" : (52, "I", "{}"),
+        "quota_charged" : (56, "Q", "{}"),
+        "usn" : (64, "Q", "{}"),
+    }),
+    AttrTypes.FILE_NAME : (66, {
+        "parent_ref" : (0, "Q", "{} & 0x0000FFFFFFFFFFFF"),
+        "parent_seq" : (0, "Q", "{} >> 48"),
+        **_timestamp_layout(8),
+        "alloc_file_size" : (40, "Q", "{}"),
+        "real_file_size" : (48, "Q", "{}"),
+        "flags" : (56, "I", "FileInfoFlags({})"),
+        "reparse_value" : (60, "I", "{}"),
+        "name" : (64, "B", 'str(buffer[offset+66:offset+66+(2*{})], "utf_16_le")'),
+        "name_type" : (65, "B", "NameType({})"),
+    }),
+}
+'''dict(AttrTypes : tuple(int, dict)): Layout of the contents that can be
+projected. See ``_create_projection_func``.'''
+
+@_lru_cache(maxsize=None)
+def create_projection_parser(attr_type, fields):
+    '''Creates a parser for only some fields of an attribute content.
+
+    Narrow queries do not need the whole object model. The parser unpacks
+    only the requested fields, with a struct created for them, and returns
+    the values as they would be in the content object. The parsers are
+    cached, so each projection is created only once.
+
+    Args:
+        attr_type (:obj:`AttrTypes`): STANDARD_INFORMATION or FILE_NAME
+        fields (tuple(str)): The fields, as named in the content class. The
+            timestamps are named ``timestamps.created``, ``timestamps.changed``,
+            ``timestamps.mft_changed`` and ``timestamps.accessed``. The same
+            timestamps, as FILETIME values, are in ``raw_timestamps``.
+
+    Returns:
+        function: ``parser(buffer, offset, length)``, where ``offset`` and
+            ``length`` refer to the content of the attribute. Returns a tuple
+            with the values in the same order as ``fields``.
+    '''
+    if attr_type not in _PROJECTION_LAYOUTS:
+        raise ValueError(f"Projection is not supported for {attr_type}")
+    return _create_projection_func(f"project_{attr_type.name.lower()}",
+                _PROJECTION_LAYOUTS[attr_type], tuple(fields),
+                {"convert_filetime" : convert_filetime, "FileInfoFlags" : FileInfoFlags,
+                 "NameType" : NameType})
+
 #******************************************************************************
 # DATA ATTRIBUTE
 #******************************************************************************
-def _from_binary_data(cls, binary_stream):
+def _from_buffer_data(cls, buffer, offset, length):
     """See base class."""
-    return cls(binary_stream.tobytes())
+    return cls(bytes(buffer[offset:offset+length]))
 
 def _len_data(self):
     return len(self.content)
@@ -1211,7 +1434,7 @@ Attributes:
 """
 
 _data_namespace = {"__len__" : _len_data,
-                       "create_from_binary" : classmethod(_from_binary_data)
+                       "create_from_buffer" : classmethod(_from_buffer_data)
                  }
 
 Data = _create_attrcontent_class("Data",
@@ -1222,16 +1445,16 @@ Data = _create_attrcontent_class("Data",
 #******************************************************************************
 # INDEX_ROOT ATTRIBUTE
 #******************************************************************************
-def _from_binary_idx_nh(cls, binary_stream):
+def _from_buffer_idx_nh(cls, buffer, offset, length):
     """See base class."""
     ''' Offset to start of index entry - 4
         Offset to end of used portion of index entry - 4
         Offset to end of the allocated index entry - 4
         Flags - 4
     '''
-    nw_obj = cls(cls._REPR.unpack(binary_stream[:cls._REPR.size]))
+    nw_obj = cls(cls._REPR.unpack_from(buffer, offset))
 
-    _MOD_LOGGER.debug("Attempted to unpack Index Node Header Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack Index Node Header Entry from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1263,7 +1486,7 @@ Attributes:
 '''
 
 _idx_nh_namespace = {"__len__" : _len_idx_nh,
-                       "create_from_binary" : classmethod(_from_binary_idx_nh)
+                       "create_from_buffer" : classmethod(_from_buffer_idx_nh)
                  }
 
 IndexNodeHeader = _create_attrcontent_class("IndexNodeHeader",
@@ -1273,7 +1496,7 @@ IndexNodeHeader = _create_attrcontent_class("IndexNodeHeader",
 
 #------------------------------------------------------------------------------
 
-def _from_binary_idx_e(cls, binary_stream, content_type=None):
+def _from_buffer_idx_e(cls, buffer, offset, length, content_type=None):
     """See base class."""
     #TODO don't save this here and overload later?
     #TODO confirm if this is really generic or is always a file reference
@@ -1285,23 +1508,23 @@ def _from_binary_idx_e(cls, binary_stream, content_type=None):
         VCN of child node - 8 (exists only if flag is set, aligned to a 8 byte boundary)
     '''
     repr_size = cls._REPR.size
-    generic, entry_len, cont_len, flags = cls._REPR.unpack(binary_stream[:repr_size])
+    generic, entry_len, cont_len, flags = cls._REPR.unpack_from(buffer, offset)
     vcn_child_node = (None,)
 
     #if content is known (filename), create a new object to represent the content
     if content_type is AttrTypes.FILE_NAME and cont_len:
-        binary_content = FileName.create_from_binary(binary_stream[repr_size:repr_size+cont_len])
+        binary_content = FileName.create_from_buffer(buffer, offset+repr_size, cont_len)
     else:
-        binary_content = binary_stream[repr_size:repr_size+cont_len].tobytes()
+        binary_content = bytes(buffer[offset+repr_size:offset+repr_size+cont_len])
     #if there is a next entry, we need to pad it to a 8 byte boundary
     if flags & IndexEntryFlags.CHILD_NODE_EXISTS:
         temp_size = repr_size + cont_len
         boundary_fix = (entry_len - temp_size) % 8
-        vcn_child_node = cls._REPR_VCN.unpack(binary_stream[temp_size+boundary_fix:temp_size+boundary_fix+8])
+        vcn_child_node = cls._REPR_VCN.unpack_from(buffer, offset+temp_size+boundary_fix)
 
     nw_obj = cls((generic, entry_len, cont_len, IndexEntryFlags(flags), binary_content, vcn_child_node))
 
-    _MOD_LOGGER.debug("Attempted to unpack Index Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack Index Entry from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1338,7 +1561,7 @@ Attributes:
 
 _idx_e_namespace = {"__len__" : _len_idx_e,
                     "_REPR_VCN" : struct.Struct("<Q"),
-                    "create_from_binary" : classmethod(_from_binary_idx_e)
+                    "create_from_buffer" : classmethod(_from_buffer_idx_e)
                  }
 
 IndexEntry = _create_attrcontent_class("IndexEntry",
@@ -1349,7 +1572,7 @@ IndexEntry = _create_attrcontent_class("IndexEntry",
 #------------------------------------------------------------------------------
 
 
-def _from_binary_idx_root(cls, binary_stream):
+def _from_buffer_idx_root(cls, buffer, offset, length):
     """See base class."""
     ''' Attribute type - 4
         Collation rule - 4
@@ -1357,25 +1580,26 @@ def _from_binary_idx_root(cls, binary_stream):
         Clusters per index record - 1
         Padding - 3
     '''
-    attr_type, collation_rule, b_per_idx_r, c_per_idx_r = cls._REPR.unpack(binary_stream[:cls._REPR.size])
-    node_header = IndexNodeHeader.create_from_binary(binary_stream[cls._REPR.size:])
+    end = offset + length
+    attr_type, collation_rule, b_per_idx_r, c_per_idx_r = cls._REPR.unpack_from(buffer, offset)
+    node_header = IndexNodeHeader.create_from_buffer(buffer, offset+cls._REPR.size, length-cls._REPR.size)
     attr_type = AttrTypes(attr_type) if attr_type else None
     index_entry_list = []
 
-    offset = cls._REPR.size + node_header.start_offset
+    entry_offset = offset + cls._REPR.size + node_header.start_offset
     #loads all index entries related to the root node
     while True:
-        entry = IndexEntry.create_from_binary(binary_stream[offset:], attr_type)
+        entry = IndexEntry.create_from_buffer(buffer, entry_offset, end-entry_offset, attr_type)
         index_entry_list.append(entry)
         if entry.flags & IndexEntryFlags.LAST_ENTRY:
             break
         else:
-            offset += len(entry)
+            entry_offset += len(entry)
 
     nw_obj = cls((attr_type, CollationRule(collation_rule), b_per_idx_r,
                     c_per_idx_r, node_header, index_entry_list ))
 
-    _MOD_LOGGER.debug("Attempted to unpack INDEX_ROOT Entry from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack INDEX_ROOT Entry from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1411,7 +1635,7 @@ Attributes:
 '''
 
 _idx_root_namespace = {"__len__" : _len_idx_root,
-                    "create_from_binary" : classmethod(_from_binary_idx_root)
+                    "create_from_buffer" : classmethod(_from_buffer_idx_root)
                  }
 
 IndexRoot = _create_attrcontent_class("IndexRoot",
@@ -1424,6 +1648,55 @@ IndexRoot = _create_attrcontent_class("IndexRoot",
 # BITMAP ATTRIBUTE
 #******************************************************************************
 
+def _runs_in_byte(value):
+    '''Returns the runs of set bits, as (start, length), of a single byte'''
+    runs = []
+    start = None
+    for bit in range(9):
+        if bit < 8 and value & (1 << bit):
+            if start is None:
+                start = bit
+        elif start is not None:
+            runs.append((start, bit - start))
+            start = None
+    return tuple(runs)
+
+_BITMAP_BYTE_RUNS = tuple(_runs_in_byte(value) for value in range(256))
+'''tuple: For each byte value, the runs of set bits inside the byte'''
+_BITMAP_TOKENS = _re.compile(b"\xff+|[^\x00\xff]")
+'''re.Pattern: Matches sequences of fully set bytes or a single partially set byte'''
+_BITMAP_INVERT = bytes(255 - value for value in range(256))
+'''bytes: Translation table that inverts all the bits of a byte'''
+
+def _bitmap_runs(bitmap):
+    '''Returns all the runs of set bits of a bitmap as a list of (start, length).
+
+    Sequences of zeroed or fully set bytes are found by the ``re`` module, so
+    only the bytes that are partially set are evaluated in python.
+    '''
+    runs = []
+    run_start, run_end = 0, -1
+    byte_runs = _BITMAP_BYTE_RUNS
+
+    for match in _BITMAP_TOKENS.finditer(bitmap):
+        start, end = match.span()
+        if end - start > 1 or bitmap[start] == 0xFF:
+            pieces = ((start * 8, (end - start) * 8), )
+        else:
+            base = start * 8
+            pieces = [(base + bit, length) for bit, length in byte_runs[bitmap[start]]]
+        for piece_start, piece_len in pieces:
+            if piece_start == run_end:
+                run_end += piece_len
+            else:
+                if run_end >= 0:
+                    runs.append((run_start, run_end - run_start))
+                run_start, run_end = piece_start, piece_start + piece_len
+    if run_end >= 0:
+        runs.append((run_start, run_end - run_start))
+
+    return runs
+
 def _allocated_entries_bitmap(self):
     '''Creates a generator that returns all allocated entries in the
     bitmap.
@@ -1432,9 +1705,74 @@ def _allocated_entries_bitmap(self):
         int: The bit index of the allocated entries.
 
     '''
-    for entry_number in range(len(self._bitmap) * 8):
-        if self.entry_allocated(entry_number):
-            yield entry_number
+    for start, length in _bitmap_runs(self._bitmap):
+        yield from range(start, start + length)
+
+def _allocated_count_bitmap(self):
+    '''Returns the number of allocated entries in the bitmap.'''
+    value = int.from_bytes(self._bitmap, "little")
+    try:
+        return value.bit_count()
+    except AttributeError: #python < 3.10
+        return bin(value).count("1")
+
+def _free_count_bitmap(self):
+    '''Returns the number of free entries in the bitmap.'''
+    return len(self._bitmap) * 8 - self.allocated_count()
+
+def _allocated_runs_bitmap(self):
+    '''Returns the allocated entries grouped in runs.
+
+    Returns:
+        list(tuple(int, int)): A list with the (start, length) of each run
+    '''
+    return _bitmap_runs(self._bitmap)
+
+def _free_runs_bitmap(self):
+    '''Returns the free entries grouped in runs.
+
+    Returns:
+        list(tuple(int, int)): A list with the (start, length) of each run
+    '''
+    return _bitmap_runs(self._bitmap.translate(_BITMAP_INVERT))
+
+def _allocated_indexes_bitmap(self):
+    '''Returns the index of all allocated entries as an ``array`` of unsigned
+    64 bits integers. The array supports the buffer protocol, so it can be
+    used with ``numpy.frombuffer(indexes, dtype=numpy.uint64)`` without a copy.
+
+    Returns:
+        array.array: Index of the allocated entries, in order
+    '''
+    indexes = _array("Q")
+    for start, length in _bitmap_runs(self._bitmap):
+        indexes.extend(range(start, start + length))
+    return indexes
+
+def _bitmap_operation(self, other, operation):
+    '''Applies a bitwise operation between two bitmaps. The result has the
+    size of the biggest one.'''
+    if not isinstance(other, Bitmap):
+        return NotImplemented
+    size = max(len(self._bitmap), len(other._bitmap))
+    value = operation(int.from_bytes(self._bitmap, "little"), int.from_bytes(other._bitmap, "little"))
+    return Bitmap(value.to_bytes(size, "little"))
+
+def _and_bitmap(self, other):
+    return _bitmap_operation(self, other, lambda a, b: a & b)
+
+def _or_bitmap(self, other):
+    return _bitmap_operation(self, other, lambda a, b: a | b)
+
+def _xor_bitmap(self, other):
+    return _bitmap_operation(self, other, lambda a, b: a ^ b)
+
+def _sub_bitmap(self, other):
+    '''Entries allocated in this bitmap and not allocated in the other'''
+    return _bitmap_operation(self, other, lambda a, b: a & ~b)
+
+def _invert_bitmap(self):
+    return Bitmap(self._bitmap.translate(_BITMAP_INVERT))
 
 def _entry_allocated_bitmap(self, entry_number):
     """Checks if a particular index is allocated.
@@ -1452,18 +1790,18 @@ def _get_next_empty_bitmap(self):
     """Returns the next empty entry.
 
     Returns:
-        int: The value of the empty entry
+        int: The value of the empty entry or None if the bitmap is full
     """
-    #TODO probably not the best way, redo
-    for i, byte in enumerate(self._bitmap):
-        if byte != 255:
-            for offset in range(8):
-                if not byte & (1 << offset):
-                    return (i * 8) + offset
-
-def _from_binary_bitmap(cls, binary_stream):
+    bitmap = self._bitmap
+    index = len(bitmap) - len(bitmap.lstrip(b"\xff"))
+    if index == len(bitmap):
+        return None
+    byte = bitmap[index]
+    return (index * 8) + ((~byte & (byte + 1)).bit_length() - 1)
+
+def _from_buffer_bitmap(cls, buffer, offset, length):
     """See base class."""
-    return cls(binary_stream.tobytes())
+    return cls(bytes(buffer[offset:offset+length]))
 
 def _len_bitmap(self):
     '''Returns the size of the bitmap in bytes'''
@@ -1475,16 +1813,29 @@ Correctly represents a bitmap as seen by the MFT. That basically means that
 the underlying data structure is interpreted bit by bit, where if the bit
 is 1, the entry is "occupied"/allocated.
 
+Bitmaps can be combined with the ``&``, ``|``, ``^`` and ``-`` (allocated in
+the first and not in the second) operators and inverted with ``~``. All of
+them return a new ``Bitmap``.
 
 Args:
     binary_data (:obj:`bytes`): The bytes where the data is maintained
 """
 
 _bitmap_namespace = {"__len__" : _len_bitmap,
+                     "__and__" : _and_bitmap,
+                     "__or__" : _or_bitmap,
+                     "__xor__" : _xor_bitmap,
+                     "__sub__" : _sub_bitmap,
+                     "__invert__" : _invert_bitmap,
                      "get_next_empty" : _get_next_empty_bitmap,
                      "entry_allocated" : _entry_allocated_bitmap,
                      "allocated_entries" : _allocated_entries_bitmap,
-                     "create_from_binary" : classmethod(_from_binary_bitmap)
+                     "allocated_count" : _allocated_count_bitmap,
+                     "free_count" : _free_count_bitmap,
+                     "allocated_runs" : _allocated_runs_bitmap,
+                     "free_runs" : _free_runs_bitmap,
+                     "allocated_indexes" : _allocated_indexes_bitmap,
+                     "create_from_buffer" : classmethod(_from_buffer_bitmap)
                  }
 
 Bitmap = _create_attrcontent_class("Bitmap",
@@ -1496,7 +1847,7 @@ Bitmap = _create_attrcontent_class("Bitmap",
 # REPARSE_POINT ATTRIBUTE
 #******************************************************************************
 
-def _from_binary_junc_mnt(cls, binary_stream):
+def _from_buffer_junc_mnt(cls, buffer, offset, length):
     """See base class."""
     ''' Offset to target name - 2 (relative to 16th byte)
         Length of target name - 2
@@ -1504,16 +1855,16 @@ def _from_binary_junc_mnt(cls, binary_stream):
         Length of print name - 2
     '''
     offset_target_name, len_target_name, offset_print_name, len_print_name = \
-        cls._REPR.unpack(binary_stream[:cls._REPR.size])
+        cls._REPR.unpack_from(buffer, offset)
 
-    offset = cls._REPR.size + offset_target_name
-    target_name = binary_stream[offset:offset+len_target_name].tobytes().decode("utf_16_le")
-    offset = cls._REPR.size + offset_print_name
-    print_name = binary_stream[offset:offset+len_print_name].tobytes().decode("utf_16_le")
+    name_offset = offset + cls._REPR.size + offset_target_name
+    target_name = str(buffer[name_offset:name_offset+len_target_name], "utf_16_le")
+    name_offset = offset + cls._REPR.size + offset_print_name
+    print_name = str(buffer[name_offset:name_offset+len_print_name], "utf_16_le")
 
     nw_obj = cls((target_name, print_name))
 
-    _MOD_LOGGER.debug("Attempted to unpack Junction or MNT point from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack Junction or MNT point from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1534,7 +1885,7 @@ Attributes:
 """
 
 _junc_mnt_namespace = {"__len__" : _len_junc_mnt,
-                    "create_from_binary" : classmethod(_from_binary_junc_mnt)
+                    "create_from_buffer" : classmethod(_from_buffer_junc_mnt)
                  }
 
 JunctionOrMount = _create_attrcontent_class("JunctionOrMount",
@@ -1544,7 +1895,7 @@ JunctionOrMount = _create_attrcontent_class("JunctionOrMount",
 
 #------------------------------------------------------------------------------
 
-def _from_binary_syn_link(cls, binary_stream):
+def _from_buffer_syn_link(cls, buffer, offset, length):
     """See base class."""
     ''' Offset to target name - 2 (relative to 16th byte)
         Length of target name - 2
@@ -1554,16 +1905,16 @@ def _from_binary_syn_link(cls, binary_stream):
     '''
     offset_target_name, len_target_name, offset_print_name, \
     len_print_name, syn_flags = \
-        cls._REPR.unpack(binary_stream[:cls._REPR.size])
+        cls._REPR.unpack_from(buffer, offset)
 
-    offset = cls._REPR.size + offset_target_name
-    target_name = binary_stream[offset:offset+len_target_name].tobytes().decode("utf_16_le")
-    offset = cls._REPR.size + offset_print_name
-    print_name = binary_stream[offset:offset+len_print_name].tobytes().decode("utf_16_le")
+    name_offset = offset + cls._REPR.size + offset_target_name
+    target_name = str(buffer[name_offset:name_offset+len_target_name], "utf_16_le")
+    name_offset = offset + cls._REPR.size + offset_print_name
+    print_name = str(buffer[name_offset:name_offset+len_print_name], "utf_16_le")
 
     nw_obj = cls((target_name, print_name, SymbolicLinkFlags(syn_flags)))
 
-    _MOD_LOGGER.debug("Attempted to unpack Symbolic Link from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack Symbolic Link from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1586,7 +1937,7 @@ Attributes:
 """
 
 _syn_link_namespace = {"__len__" : _len_syn_link,
-                    "create_from_binary" : classmethod(_from_binary_syn_link)
+                    "create_from_buffer" : classmethod(_from_buffer_syn_link)
                  }
 
 SymbolicLink = _create_attrcontent_class("SymbolicLink",
@@ -1596,7 +1947,7 @@ SymbolicLink = _create_attrcontent_class("SymbolicLink",
 
 #------------------------------------------------------------------------------
 
-def _from_binary_reparse(cls, binary_stream):
+def _from_buffer_reparse(cls, buffer, offset, length):
     """See base class."""
     ''' Reparse type flags - 4
             Reparse tag - 4 bits
@@ -1605,8 +1956,9 @@ def _from_binary_reparse(cls, binary_stream):
         Reparse data length - 2
         Padding - 2
     '''
-    #content = cls._REPR.unpack(binary_view[:cls._REPR.size])
-    reparse_tag, data_len = cls._REPR.unpack(binary_stream[:cls._REPR.size])
+    end = offset + length
+    data_offset = offset + cls._REPR.size
+    reparse_tag, data_len = cls._REPR.unpack_from(buffer, offset)
 
     #reparse_tag (type, flags) data_len, guid, data
     reparse_type = ReparseType(reparse_tag & 0x0000FFFF)
@@ -1614,18 +1966,18 @@ def _from_binary_reparse(cls, binary_stream):
     guid = None #guid exists only in third party reparse points
     if reparse_flags & ReparseFlags.IS_MICROSOFT:#a microsoft tag
         if reparse_type is ReparseType.SYMLINK:
-            data = SymbolicLink.create_from_binary(binary_stream[cls._REPR.size:])
+            data = SymbolicLink.create_from_buffer(buffer, data_offset, end-data_offset)
         elif reparse_type is ReparseType.MOUNT_POINT:
-            data = JunctionOrMount.create_from_binary(binary_stream[cls._REPR.size:])
+            data = JunctionOrMount.create_from_buffer(buffer, data_offset, end-data_offset)
         else:
-            data = binary_stream[cls._REPR.size:].tobytes()
+            data = bytes(buffer[data_offset:end])
     else:
-        guid = UUID(bytes_le=binary_stream[cls._REPR.size:cls._REPR.size+16].tobytes())
-        data = binary_stream[cls._REPR.size+16:].tobytes()
+        guid = UUID(bytes_le=bytes(buffer[data_offset:data_offset+16]))
+        data = bytes(buffer[data_offset+16:end])
 
     nw_obj = cls((reparse_type, reparse_flags, data_len, guid, data))
 
-    _MOD_LOGGER.debug("Attempted to unpack REPARSE_POINT from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack REPARSE_POINT from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1669,7 +2021,7 @@ Attributes:
 '''
 
 _reparse_namespace = {"__len__" : _len_reparse,
-                    "create_from_binary" : classmethod(_from_binary_reparse)
+                    "create_from_buffer" : classmethod(_from_buffer_reparse)
                  }
 
 ReparsePoint = _create_attrcontent_class("ReparsePoint",
@@ -1681,13 +2033,13 @@ ReparsePoint = _create_attrcontent_class("ReparsePoint",
 # EA_INFORMATION ATTRIBUTE
 #******************************************************************************
 
-def _from_binary_ea_info(cls, binary_stream):
+def _from_buffer_ea_info(cls, buffer, offset, length):
     """See base class."""
     ''' Size of Extended Attribute entry - 2
         Number of Extended Attributes which have NEED_EA set - 2
         Size of extended attribute data - 4
     '''
-    return cls(cls._REPR.unpack(binary_stream[:cls._REPR.size]))
+    return cls(cls._REPR.unpack_from(buffer, offset))
 
 def _len_ea_info(self):
     return EaInformation._REPR.size
@@ -1714,7 +2066,7 @@ Attributes:
 '''
 
 _ea_info_namespace = {"__len__" : _len_ea_info,
-                    "create_from_binary" : classmethod(_from_binary_ea_info)
+                    "create_from_buffer" : classmethod(_from_buffer_ea_info)
                  }
 
 EaInformation = _create_attrcontent_class("EaInformation",
@@ -1726,24 +2078,25 @@ EaInformation = _create_attrcontent_class("EaInformation",
 # EA ATTRIBUTE
 #******************************************************************************
 
-def _from_binary_ea_entry(cls, binary_stream):
+def _from_buffer_ea_entry(cls, buffer, offset, length):
     """See base class."""
     ''' Offset to the next EA  - 4
         Flags - 1
         Name length - 1
         Value length - 2
     '''
-    offset_next_ea, flags, name_len, value_len = cls._REPR.unpack(binary_stream[:cls._REPR.size])
+    offset_next_ea, flags, name_len, value_len = cls._REPR.unpack_from(buffer, offset)
 
-    name = binary_stream[cls._REPR.size:cls._REPR.size + name_len].tobytes().decode("ascii")
+    name_offset = offset + cls._REPR.size
+    name = str(buffer[name_offset:name_offset + name_len], "ascii")
     #it looks like the value is 8 byte aligned, do some math to compensate
     #TODO confirm if this is true
-    value_alignment = (_ceil((cls._REPR.size + name_len) / 8) * 8)
-    value = binary_stream[value_alignment:value_alignment + value_len].tobytes()
+    value_alignment = offset + (_ceil((cls._REPR.size + name_len) / 8) * 8)
+    value = bytes(buffer[value_alignment:value_alignment + value_len])
 
     nw_obj = cls((offset_next_ea, EAFlags(flags), name, value))
 
-    _MOD_LOGGER.debug("Attempted to unpack EA entry from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack EA entry from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1782,7 +2135,7 @@ Attributes:
 '''
 
 _ea_entry_namespace = {"__len__" : _len_ea_entry,
-                    "create_from_binary" : classmethod(_from_binary_ea_entry)
+                    "create_from_buffer" : classmethod(_from_buffer_ea_entry)
                  }
 
 EaEntry = _create_attrcontent_class("EaEntry",
@@ -1792,22 +2145,22 @@ EaEntry = _create_attrcontent_class("EaEntry",
 
 #------------------------------------------------------------------------------
 
-def _from_binary_ea(cls, binary_stream):
+def _from_buffer_ea(cls, buffer, offset, length):
     """See base class."""
     _ea_list = []
-    offset = 0
+    end = offset + length
+    entry_offset = offset
 
-    #_MOD_LOGGER.debug(f"Creating Ea object from binary stream {binary_stream.tobytes()}...")
-    _MOD_LOGGER.debug("Creating Ea object from binary '%s'...", binary_stream.tobytes())
+    _MOD_LOGGER.debug("Creating Ea object from offset %d...", offset)
     while True:
-        entry = EaEntry.create_from_binary(binary_stream[offset:])
-        offset += entry.offset_next_ea
+        entry = EaEntry.create_from_buffer(buffer, entry_offset, end - entry_offset)
+        entry_offset += entry.offset_next_ea
         _ea_list.append(entry)
-        if offset >= len(binary_stream):
+        if entry_offset >= end:
             break
     nw_obj = cls(_ea_list)
 
-    _MOD_LOGGER.debug("Attempted to unpack EA from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack EA from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1837,7 +2190,7 @@ Args:
 _ea_namespace = {"__len__" : _len_ea,
                        "__iter__" : _iter_ea,
                        "__getitem__" : _gitem_ea,
-                       "create_from_binary" : classmethod(_from_binary_ea)
+                       "create_from_buffer" : classmethod(_from_buffer_ea)
                  }
 
 Ea = _create_attrcontent_class("Ea",
@@ -1849,20 +2202,20 @@ Ea = _create_attrcontent_class("Ea",
 # SECURITY_DESCRIPTOR ATTRIBUTE
 #******************************************************************************
 
-def _from_binary_secd_header(cls, binary_stream):
+def _from_buffer_secd_header(cls, buffer, offset, length):
     """See base class."""
     ''' Revision number - 1
         Padding - 1
         Control flags - 2
         Reference to the owner SID - 4 (offset relative to the header)
         Reference to the group SID - 4 (offset relative to the header)
-        Reference to the DACL - 4 (offset relative to the header)
         Reference to the SACL - 4 (offset relative to the header)
+        Reference to the DACL - 4 (offset relative to the header)
     '''
-    nw_obj = cls(cls._REPR.unpack(binary_stream))
+    nw_obj = cls(cls._REPR.unpack_from(buffer, offset))
     nw_obj.control_flags = SecurityDescriptorFlags(nw_obj.control_flags)
 
-    _MOD_LOGGER.debug("Attempted to unpack Security Descriptor Header from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack Security Descriptor Header from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1882,40 +2235,40 @@ Args:
     content[1] (:obj:`SecurityDescriptorFlags`): Control flags
     content[2] (int): Offset to the owner SID
     content[3] (int): Offset to the group SID
-    content[4] (int): Offset to the DACL
-    content[5] (int): Offset to the SACL
+    content[4] (int): Offset to the SACL
+    content[5] (int): Offset to the DACL
 
 Attributes:
     revision_number (int): Revision number
     control_flags (:obj:`SecurityDescriptorFlags`): Control flags
     owner_sid_offset (int): Offset to the owner SID
     group_sid_offset (int): Offset to the group SID
-    dacl_offset (int): Offset to the DACL
     sacl_offset (int): Offset to the SACL
+    dacl_offset (int): Offset to the DACL
 '''
 
 _secd_header_namespace = {"__len__" : _len_secd_header,
-                    "create_from_binary" : classmethod(_from_binary_secd_header)
+                    "create_from_buffer" : classmethod(_from_buffer_secd_header)
                  }
 
 SecurityDescriptorHeader = _create_attrcontent_class("SecurityDescriptorHeader",
             ("revision_number", "control_flags", "owner_sid_offset",
-                "group_sid_offset", "dacl_offset", "sacl_offset"),
+                "group_sid_offset", "sacl_offset", "dacl_offset"),
         inheritance=(AttributeContentRepr,), data_structure="<B1xH4I",
         extra_functions=_secd_header_namespace, docstring=_docstring_secd_header)
 
 #------------------------------------------------------------------------------
 
-def _from_binary_ace_header(cls, binary_stream):
+def _from_buffer_ace_header(cls, buffer, offset, length):
     """See base class."""
     ''' ACE Type - 1
         ACE Control flags - 1
         Size - 2 (includes header size)
     '''
-    type, control_flags, size = cls._REPR.unpack(binary_stream)
+    type, control_flags, size = cls._REPR.unpack_from(buffer, offset)
     nw_obj = cls((ACEType(type), ACEControlFlags(control_flags), size))
 
-    _MOD_LOGGER.debug("Attempted to unpack ACE Header from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack ACE Header from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
@@ -1945,7 +2298,7 @@ Attributes:
 '''
 
 _ace_header_namespace = {"__len__" : _len_ace_header,
-                    "create_from_binary" : classmethod(_from_binary_ace_header)
+                    "create_from_buffer" : classmethod(_from_buffer_ace_header)
                  }
 
 ACEHeader = _create_attrcontent_class("ACEHeader",
@@ -1955,29 +2308,28 @@ ACEHeader = _create_attrcontent_class("ACEHeader",
 
 #-------------------------------------------------------------------------------
 
-def _from_binary_sid(cls, binary_stream):
+def _from_buffer_sid(cls, buffer, offset, length):
     """See base class."""
     ''' Revision number - 1
         Number of sub authorities - 1
         Authority - 6
         Array of 32 bits with sub authorities - 4 * number of sub authorities
     '''
-    rev_number, sub_auth_len, auth = cls._REPR.unpack(binary_stream[:cls._REPR.size])
+    rev_number, sub_auth_len, auth = cls._REPR.unpack_from(buffer, offset)
     if sub_auth_len:
-        sub_auth_repr = struct.Struct("<" + str(sub_auth_len) + "I")
-        sub_auth = sub_auth_repr.unpack(binary_stream[cls._REPR.size:cls._REPR.size + sub_auth_repr.size])
+        sub_auth = struct.unpack_from("<" + str(sub_auth_len) + "I", buffer, offset + cls._REPR.size)
     else:
         sub_auth = ()
 
     nw_obj = cls((rev_number, int.from_bytes(auth, byteorder="big"), sub_auth))
 
-    _MOD_LOGGER.debug("Attempted to unpack SID from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack SID from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
 def _len_sid(self):
     '''Returns the size of the SID in bytes'''
-    return SID._REPR.size + (4 * sub_auth_len)
+    return SID._REPR.size + (4 * len(self.sub_authorities))
 
 def _str_sid(self):
     'Return a nicely formatted representation string'
@@ -2009,7 +2361,7 @@ Attributes:
 '''
 
 _sid_namespace = {"__len__" : _len_sid,
-                    "create_from_binary" : classmethod(_from_binary_sid),
+                    "create_from_buffer" : classmethod(_from_buffer_sid),
                     "__str__" : _str_sid
                  }
 
@@ -2020,13 +2372,13 @@ SID = _create_attrcontent_class("SID",
 
 #-------------------------------------------------------------------------------
 
-def _from_binary_b_ace(cls, binary_stream):
+def _from_buffer_b_ace(cls, buffer, offset, length):
     """See base class."""
     ''' Access rights flags - 4
         SID - n
     '''
-    access_flags = cls._REPR.unpack(binary_stream[:cls._REPR.size])[0]
-    sid = SID.create_from_binary(binary_stream[cls._REPR.size:])
+    access_flags = cls._REPR.unpack_from(buffer, offset)[0]
+    sid = SID.create_from_buffer(buffer, offset + cls._REPR.size, length - cls._REPR.size)
 
     nw_obj = cls((ACEAccessFlags(access_flags), sid))
 
@@ -2058,7 +2410,7 @@ Attributes:
 '''
 
 _b_ace_namespace = {"__len__" : _len_b_ace,
-                    "create_from_binary" : classmethod(_from_binary_b_ace)
+                    "create_from_buffer" : classmethod(_from_buffer_b_ace)
                  }
 
 BasicACE = _create_attrcontent_class("BasicACE",
@@ -2068,7 +2420,7 @@ BasicACE = _create_attrcontent_class("BasicACE",
 
 #-------------------------------------------------------------------------------
 
-def _from_binary_obj_ace(cls, binary_stream):
+def _from_buffer_obj_ace(cls, buffer, offset, length):
     """See base class."""
     ''' Access rights flags - 4
         Flags - 4
@@ -2076,9 +2428,8 @@ def _from_binary_obj_ace(cls, binary_stream):
         Inherited object type class identifier (GUID) - 16
         SID - n
     '''
-    #content = cls._REPR.unpack(binary_stream[:cls._REPR.size])
-    access_flags, flags, object_guid, inher_guid = cls._REPR.unpack(binary_stream[:cls._REPR.size])
-    sid = SID.create_from_binary(binary_stream[cls._REPR.size:])
+    access_flags, flags, object_guid, inher_guid = cls._REPR.unpack_from(buffer, offset)
+    sid = SID.create_from_buffer(buffer, offset + cls._REPR.size, length - cls._REPR.size)
 
     nw_obj = cls((ACEAccessFlags(access_flags),flags, UUID(bytes_le=object_guid), UUID(bytes_le=inher_guid), sid))
 
@@ -2114,8 +2465,8 @@ Attributes:
     sid (:obj:`SID`): SID
 '''
 
-_obj_ace_namespace = {"__len__" : _len_b_ace,
-                    "create_from_binary" : classmethod(_from_binary_b_ace)
+_obj_ace_namespace = {"__len__" : _len_obj_ace,
+                    "create_from_buffer" : classmethod(_from_buffer_obj_ace)
                  }
 
 ObjectACE = _create_attrcontent_class("ObjectACE",
@@ -2131,19 +2482,18 @@ class CompoundACE():
 
 #-------------------------------------------------------------------------------
 
-def _from_binary_ace(cls, binary_stream):
+def _from_buffer_ace(cls, buffer, offset, length):
     nw_obj = cls()
-    header = ACEHeader.create_from_binary(binary_stream[:cls._HEADER_SIZE])
+    header = ACEHeader.create_from_buffer(buffer, offset, cls._HEADER_SIZE)
+    content_offset, content_len = offset + cls._HEADER_SIZE, length - cls._HEADER_SIZE
 
     nw_obj.header = header
 
-    #TODO create a _dispatcher and replace this slow ass comparison
-    if "OBJECT" in header.type.name:
-        nw_obj.object_ace = ObjectACE.create_from_binary(binary_stream[cls._HEADER_SIZE:])
-    elif "COMPOUND" in header.type.name:
-        pass
-    else:
-        nw_obj.basic_ace = BasicACE.create_from_binary(binary_stream[cls._HEADER_SIZE:])
+    ace_class = cls._dispatcher[header.type.value]
+    if ace_class is ObjectACE:
+        nw_obj.object_ace = ObjectACE.create_from_buffer(buffer, content_offset, content_len)
+    elif ace_class is BasicACE:
+        nw_obj.basic_ace = BasicACE.create_from_buffer(buffer, content_offset, content_len)
 
     return nw_obj
 
@@ -2175,9 +2525,17 @@ Attributes:
     object_ace (:obj:`ObjectACE`): MFT change timestamp
 '''
 
+#maps the ACE type (int) to the class that interprets the content. Compound
+#ACEs are not known, so they are not interpreted (None)
+_ace_dispatcher = {ace_type.value : (ObjectACE if "OBJECT" in ace_type.name else
+                                     None if "COMPOUND" in ace_type.name else
+                                     BasicACE)
+                   for ace_type in ACEType}
+
 _ace_namespace = {"__len__" : _len_ace,
-                  "create_from_binary" : classmethod(_from_binary_ace),
+                  "create_from_buffer" : classmethod(_from_buffer_ace),
                   "_HEADER_SIZE" : ACEHeader.get_representation_size(),
+                  "_dispatcher" : _ace_dispatcher,
                  }
 
 ACE = _create_attrcontent_class("ACE",
@@ -2187,7 +2545,7 @@ ACE = _create_attrcontent_class("ACE",
 
 #-------------------------------------------------------------------------------
 
-def _from_binary_acl(cls, binary_stream):
+def _from_buffer_acl(cls, buffer, offset, length):
     """See base class."""
     ''' Revision number - 1
         Padding - 1
@@ -2195,29 +2553,51 @@ def _from_binary_acl(cls, binary_stream):
         ACE Count - 2
         Padding - 2
     '''
-    rev_number, size, ace_len = cls._REPR.unpack(binary_stream[:cls._REPR.size])
-    #content = cls._REPR.unpack(binary_stream[:cls._REPR.size])
-    aces = []
+    rev_number, size, ace_count = cls._REPR.unpack_from(buffer, offset)
+    #the ACEs are only interpreted when requested, so keep the raw data
+    aces_offset = offset + cls._REPR.size
+    raw_aces = bytes(buffer[aces_offset:offset + min(size, length)])
 
-    offset = cls._REPR.size
-    for i in range(ace_len):
-        ace = ACE.create_from_binary(binary_stream[offset:])
-        offset += len(ace)
-        aces.append(ace)
-        _MOD_LOGGER.debug("Next ACE offset = %d", offset)
-    nw_obj = cls((rev_number, size, aces))
+    nw_obj = cls((rev_number, size, ace_count, raw_aces, None))
 
-    _MOD_LOGGER.debug("Attempted to unpack SID from \"%s\"\nResult: %s", binary_stream.tobytes(), nw_obj)
+    _MOD_LOGGER.debug("Attempted to unpack ACL from offset %d\nResult: %s", offset, nw_obj)
 
     return nw_obj
 
+def _get_aces_acl(self):
+    '''Returns the list of ACEs, interpreting them on the first access'''
+    if self._aces is None:
+        aces = []
+        raw_aces = self._raw_aces
+        ace_offset, end = 0, len(raw_aces)
+        for i in range(self.ace_count):
+            ace = ACE.create_from_buffer(raw_aces, ace_offset, end - ace_offset)
+            ace_offset += len(ace)
+            aces.append(ace)
+            _MOD_LOGGER.debug("Next ACE offset = %d", ace_offset)
+        self._aces = aces
+
+    return self._aces
+
 def _len_acl(self):
     '''Returns the logical size of the file'''
     return self.size
 
+def _eq_acl(self, other):
+    if isinstance(other, ACL):
+        return self.revision_number == other.revision_number and \
+            self.ace_count == other.ace_count and self._raw_aces == other._raw_aces
+    return False
+
+def _repr_acl(self):
+    'Return a nicely formatted representation string'
+    return f'{self.__class__.__name__}(revision_number={self.revision_number}, size={self.size}, aces={self.aces})'
+
 _docstring_acl = '''Represents an ACL for the SECURITY_DESCRIPTOR.
 
 Represents a Access Control List (ACL), which contains multiple ACE entries.
+The ACE entries are kept in binary form and only interpreted the first time
+the ``aces`` attribute is accessed.
 
 Note:
     This class receives an Iterable as argument, the "Parameters/Args" section
@@ -2225,50 +2605,63 @@ Note:
     order or things might go boom.
 
 Args:
-    content[0] (:obj:`datetime`): Revision number
+    content[0] (int): Revision number
     content[1] (int): Size
     content[2] (int): Number of ACE entries
-    aces (list(:obj:`ACE`)): MFT change timestamp
+    content[3] (bytes): The binary data of the ACE entries
+    content[4] (list(:obj:`ACE`)): The interpreted ACE entries or ``None``
 
 Attributes:
-    revision_number[0] (:obj:`datetime`): Revision number
+    revision_number (int): Revision number
     size (int): Size
-    aces (list(:obj:`ACE`)): MFT change timestamp
+    ace_count (int): Number of ACE entries
+    aces (list(:obj:`ACE`)): The ACE entries
 '''
 
 _acl_namespace = {"__len__" : _len_acl,
-                    "create_from_binary" : classmethod(_from_binary_acl)
+                    "__eq__" : _eq_acl,
+                    "__repr__" : _repr_acl,
+                    "aces" : property(_get_aces_acl, doc="List of ACE entries of the ACL"),
+                    "create_from_buffer" : classmethod(_from_buffer_acl)
                  }
 
 ACL = _create_attrcontent_class("ACL",
-            ("revision_number", "size", "aces"),
+            ("revision_number", "size", "ace_count", "_raw_aces", "_aces"),
         inheritance=(AttributeContentRepr,), data_structure="<B1x2H2x",
         extra_functions=_acl_namespace, docstring=_docstring_acl)
 
 #-------------------------------------------------------------------------------
 
-def _from_binary_sec_desc(cls, binary_stream):
+def _from_buffer_sec_desc(cls, buffer, offset, length):
     """See base class."""
-    header = SecurityDescriptorHeader.create_from_binary(binary_stream[:SecurityDescriptorHeader.get_representation_size()])
+    return cls._from_raw(bytes(buffer[offset:offset+length]))
+
+def _from_raw_sec_desc(cls, raw):
+    '''Creates the security descriptor from its bytes. The calls are cached
+    based on the bytes, so equal descriptors are interpreted only once and
+    the same object is returned.'''
+    header = SecurityDescriptorHeader.create_from_buffer(raw, 0, SecurityDescriptorHeader.get_representation_size())
+    length = len(raw)
 
-    owner_sid = SID.create_from_binary(binary_stream[header.owner_sid_offset:])
-    group_sid = SID.create_from_binary(binary_stream[header.group_sid_offset:])
+    owner_sid = SID.create_from_buffer(raw, header.owner_sid_offset, length - header.owner_sid_offset) if header.owner_sid_offset else None
+    group_sid = SID.create_from_buffer(raw, header.group_sid_offset, length - header.group_sid_offset) if header.group_sid_offset else None
     dacl = None
     sacl = None
 
     if header.sacl_offset:
-        sacl = ACL.create_from_binary(binary_stream[header.sacl_offset:])
+        sacl = ACL.create_from_buffer(raw, header.sacl_offset, length - header.sacl_offset)
     if header.dacl_offset:
-        dacl = ACL.create_from_binary(binary_stream[header.dacl_offset:])
+        dacl = ACL.create_from_buffer(raw, header.dacl_offset, length - header.dacl_offset)
 
     nw_obj = cls((header, owner_sid, group_sid, sacl, dacl))
-    
-    return nw_obj
 
+    _MOD_LOGGER.debug("Attempted to unpack SECURITY_DESCRIPTOR\nResult: %s", nw_obj)
+
+    return nw_obj
 
 def _len_sec_desc(self):
     '''Returns the logical size of the file'''
-    return len(self.header) + len(self.owner_sid) + len(self.group_sid) + len(self.sacl) + len(self.dacl)
+    return sum([len(part) for part in (self.header, self.owner_sid, self.group_sid, self.sacl, self.dacl) if part is not None])
 
 _docstring_sec_desc = '''Represents the content of a SECURITY_DESCRIPTOR attribute.
 
@@ -2277,28 +2670,34 @@ discretionary access control list (DACL) and a system access control list (SACL)
 
 Both DACL and SACL are ACLs with the same format.
 
+Important:
+    Volumes have very few different security descriptors, so the interpretation
+    is cached based on the binary content and attributes with the same content
+    receive the *same* object. The objects should be treated as read only.
+
 Note:
     This class receives an Iterable as argument, the "Parameters/Args" section
     represents what must be inside the Iterable. The Iterable MUST preserve
     order or things might go boom.
 
 Args:
-    content[0] (:obj:`SecurityDescriptorHeader`): Created timestamp
-    content[1] (:obj:`SID`): Changed timestamp
-    content[2] (:obj:`SID`): MFT change timestamp
-    content[3] (:obj:`ACL`): Accessed timestamp
-    content[4] (:obj:`ACL`): Accessed timestamp
+    content[0] (:obj:`SecurityDescriptorHeader`): Security descriptor header
+    content[1] (:obj:`SID`): Owner SID
+    content[2] (:obj:`SID`): Group SID
+    content[3] (:obj:`ACL`): SACL
+    content[4] (:obj:`ACL`): DACL
 
 Attributes:
-    header (:obj:`SecurityDescriptorHeader`): Created timestamp
-    owner_sid (:obj:`SID`): Changed timestamp
-    group_sid (:obj:`SID`): MFT change timestamp
-    sacl (:obj:`ACL`): Accessed timestamp
-    dacl (:obj:`ACL`): Accessed timestamp
+    header (:obj:`SecurityDescriptorHeader`): Security descriptor header
+    owner_sid (:obj:`SID`): Owner SID, ``None`` if not present
+    group_sid (:obj:`SID`): Group SID, ``None`` if not present
+    sacl (:obj:`ACL`): System access control list, ``None`` if not present
+    dacl (:obj:`ACL`): Discretionary access control list, ``None`` if not present
 '''
 
 _sec_desc_namespace = {"__len__" : _len_sec_desc,
-                    "create_from_binary" : classmethod(_from_binary_sec_desc)
+                    "create_from_buffer" : classmethod(_from_buffer_sec_desc),
+                    "_from_raw" : classmethod(_lru_cache(_SEC_DESC_CACHE_SIZE)(_from_raw_sec_desc))
                  }
 
 SecurityDescriptor = _create_attrcontent_class("SecurityDescriptor",
@@ -2315,7 +2714,15 @@ class LoggedToolStream():
         '''Initialize the class. Expects the binary_view that represents the
         content. Size information is derived from the content.
         '''
-        self.content = bin_view.tobytes()
+        self.content = bytes(bin_view)
+
+    @classmethod
+    def create_from_binary(cls, binary_stream):
+        return cls(binary_stream)
+
+    @classmethod
+    def create_from_buffer(cls, buffer, offset, length):
+        return cls(buffer[offset:offset+length])
 
     def __repr__(self):
         'Return a nicely formatted representation string'
@@ -0,0 +1,663 @@
+# -*- coding: utf-8 -*-
+'''
+File backends that can be given to the ``MFT`` class.
+
+The ``MFT`` class only needs an object that behaves like a binary file, with
+``seek``, ``tell``, ``read`` and ``readinto``. This module provides such
+objects for MFTs that are compressed (gzip, zstd, lz4) or inside a ZIP file,
+so they can be parsed without being extracted first, and ``HintedFile``, for
+scans of big MFTs that shouldn't disturb the page cache of the system.
+
+Compressed streams can't be accessed randomly. To allow it, the state of the
+decompression is saved at regular intervals (the seek points) while the
+stream is read. Seeking backwards restarts the decompression from the
+nearest seek point, instead of from the beginning.
+
+Only some seek points can be saved to disk: the start of each member/frame,
+the frames listed in the seek table of zstd files in the seekable format and,
+for deflate based streams, the flush points (where the compressor emitted a
+byte aligned empty block, as done by ``pigz``, ``gzip --rsyncable`` and
+most streaming compressors) together with the 32KB window before them.
+
+Note:
+    The support for zstd and lz4 depends on the packages ``zstandard`` and
+    ``lz4``, respectively. They are optional.
+
+.. moduleauthor:: Júlio Dantas <jldantas@gmail.com>
+'''
+import io
+import os
+import json
+import base64
+import mmap
+import zlib
+import struct
+import logging
+import zipfile
+
+from bisect import bisect_right as _bisect_right
+
+from libmft.exceptions import MFTError
+
+try:
+    import zstandard as _zstandard
+except ImportError:
+    _zstandard = None
+try:
+    import lz4.frame as _lz4_frame
+except ImportError:
+    _lz4_frame = None
+
+_MOD_LOGGER = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_LZ4_MAGIC = b"\x04\x22\x4d\x18"
+_ZIP_MAGIC = b"PK\x03\x04"
+_ZSTD_SKIPPABLE_MAGIC = 0x184D2A5E
+_ZSTD_SEEKABLE_MAGIC = 0x8F92EAB1
+_ZSTD_SEEK_FOOTER = struct.Struct("<IBI")
+''' Number of frames - 4
+    Descriptor (bit 7 is set if there are checksums) - 1
+    Seekable magic - 4
+'''
+_ZSTD_SKIPPABLE_HEADER = struct.Struct("<2I")
+''' Skippable magic - 4
+    Frame size - 4
+'''
+_DEFLATE_SYNC_MARKER = b"\x00\x00\xff\xff"
+'''bytes: End of the empty stored block emitted by a deflate flush'''
+_DEFLATE_WINDOW = 32768
+'''int: Maximum distance of a deflate back reference'''
+_ZIP_LOCAL_HEADER = struct.Struct("<4s22xHH")
+''' Signature - 4 ("PK\\x03\\x04")
+    Version, flags, compression, time, date, crc, sizes - 22
+    Length of the file name - 2
+    Length of the extra field - 2
+'''
+
+
+def _new_gzip_decompressor():
+    return zlib.decompressobj(wbits=31)
+
+def _new_deflate_decompressor():
+    return zlib.decompressobj(wbits=-15)
+
+def _new_zstd_decompressor():
+    if _zstandard is None:
+        raise MFTError("The package 'zstandard' is necessary to read zstd files.")
+    return _zstandard.ZstdDecompressor().decompressobj()
+
+def _new_lz4_decompressor():
+    if _lz4_frame is None:
+        raise MFTError("The package 'lz4' is necessary to read lz4 files.")
+    return _lz4_frame.LZ4FrameDecompressor()
+
+
+class CompressedFile(io.RawIOBase):
+    '''A read only, seekable, file like object over a compressed stream.
+
+    The stream is decompressed in blocks, as needed. While the stream is read,
+    seek points are created:
+
+    * at the beginning of each member/frame of the stream, these only need
+      the position in the compressed file
+    * at the beginning of each frame listed in the seek table of a zstd
+      stream in the seekable format, read when the object is created
+    * every ``seek_interval`` bytes of uncompressed data, if the codec allows
+      its state to be copied (zlib based ones). If there is a flush point
+      after the interval, the point is created there with the window of the
+      last 32KB, otherwise a copy of the decompressor is kept in memory
+
+    Seeking to a position before the current one restarts the decompression
+    from the nearest seek point. The seek points that don't depend on a copy
+    of the decompressor, and the uncompressed size, can be saved with
+    ``save_index`` and loaded with ``load_index``.
+
+    Args:
+        file_pointer (file): The compressed file, opened in binary mode
+        codec (str): One of ``"gzip"``, ``"zstd"``, ``"lz4"`` or ``"deflate"``
+            (raw deflate, as used by ZIP files)
+        start (int): Where the compressed stream starts in the file
+        length (int): Size of the compressed stream. If ``None``, goes until
+            the end of the file
+        size (int): Uncompressed size, if known
+        seek_interval (int): Amount of uncompressed data between seek points
+        block_size (int): Amount of compressed data read at a time
+
+    Attributes:
+        codec (str): The codec of the stream
+    '''
+    _CODECS = {"gzip" : (_new_gzip_decompressor, True),
+               "deflate" : (_new_deflate_decompressor, True),
+               "zstd" : (_new_zstd_decompressor, False),
+               "lz4" : (_new_lz4_decompressor, False)}
+    '''codec -> (decompressor factory, can the state be copied)'''
+
+    def __init__(self, file_pointer, codec, start=0, length=None, size=None,
+                 seek_interval=16*1024*1024, block_size=1024*1024):
+        '''See class docstring.'''
+        super().__init__()
+        if codec not in self._CODECS:
+            raise MFTError(f"Unknown codec '{codec}'.")
+        self._fp = file_pointer
+        self.codec = codec
+        self._new_decompressor, self._copyable = self._CODECS[codec]
+        self._start = start
+        self._end = None if length is None else start + length
+        self._size = size
+        self._seek_interval = seek_interval
+        self._block_size = block_size
+        #seek points: uncompressed offset, compressed offset, state. The state
+        #is None (start of a member), the window (bytes) or a decompressor
+        self._point_offsets = [0]
+        self._points = [(start, None)]
+        self._position = 0
+        self._warned = False
+        if codec == "zstd":
+            self._read_seek_table()
+        self._restore(0)
+
+    def _read_seek_table(self):
+        '''Creates the seek points from the seek table of a zstd stream in the
+        seekable format, if there is one.'''
+        end = self._end
+        if end is None:
+            end = self._fp.seek(0, io.SEEK_END)
+        if end - self._start < _ZSTD_SEEK_FOOTER.size:
+            return
+        self._fp.seek(end - _ZSTD_SEEK_FOOTER.size)
+        frames, descriptor, magic = _ZSTD_SEEK_FOOTER.unpack(self._fp.read(_ZSTD_SEEK_FOOTER.size))
+        if magic != _ZSTD_SEEKABLE_MAGIC:
+            return
+        entry_size = 12 if descriptor & 0x80 else 8
+        table_start = end - _ZSTD_SEEK_FOOTER.size - frames * entry_size - _ZSTD_SKIPPABLE_HEADER.size
+        if table_start < self._start:
+            _MOD_LOGGER.warning("Invalid zstd seek table, ignoring it")
+            return
+        self._fp.seek(table_start)
+        table = self._fp.read(end - table_start)
+        skippable, _ = _ZSTD_SKIPPABLE_HEADER.unpack_from(table)
+        if skippable != _ZSTD_SKIPPABLE_MAGIC:
+            _MOD_LOGGER.warning("Invalid zstd seek table, ignoring it")
+            return
+
+        in_pos, out_pos = self._start, 0
+        for offset in range(_ZSTD_SKIPPABLE_HEADER.size, _ZSTD_SKIPPABLE_HEADER.size + frames * entry_size, entry_size):
+            self._add_point(out_pos, in_pos, None)
+            compressed, decompressed = struct.unpack_from("<2I", table, offset)
+            in_pos, out_pos = in_pos + compressed, out_pos + decompressed
+        #the seek table is not part of the content
+        self._end, self._size = table_start, out_pos
+        _MOD_LOGGER.debug("zstd seek table with %d frames", frames)
+
+    def _restore(self, index):
+        '''Restarts the decompression from a seek point'''
+        in_pos, state = self._points[index]
+        self._trailer = 0
+        if state is None:
+            self._dec = self._new_decompressor()
+        elif isinstance(state, bytes):
+            #flush point, the rest of the member is raw deflate
+            self._dec = zlib.decompressobj(wbits=-15, zdict=state)
+            if self.codec == "gzip":
+                self._trailer = 8
+        else:
+            self._dec = state.copy()
+        self._in_pos = in_pos
+        self._block = b""
+        self._block_start = self._point_offsets[index]
+        self._last_point = self._block_start
+        self._finished = False
+
+    def _is_flush_point(self, data, window):
+        '''Checks if the current position, right after a sync marker, is a
+        flush point, comparing the output of the current decompressor with
+        the output of a new one started with the window. ``data`` is the
+        compressed data after the marker.'''
+        rest = data[:65536]
+        if not rest or len(window) < _DEFLATE_WINDOW:
+            return False
+        try:
+            restarted = zlib.decompressobj(wbits=-15, zdict=window).decompress(rest)
+            expected = self._dec.copy().decompress(rest)
+        except zlib.error:
+            return False
+        return bool(restarted) and restarted == expected
+
+    def _add_point(self, out_pos, in_pos, state):
+        if out_pos > self._point_offsets[-1]:
+            self._point_offsets.append(out_pos)
+            self._points.append((in_pos, state))
+
+    def _advance(self):
+        '''Decompresses the next block. Returns False at the end of the stream.'''
+        if self._finished:
+            return False
+        out_pos = self._block_start + len(self._block)
+        read_size = self._block_size
+        if self._end is not None:
+            read_size = min(read_size, self._end - self._in_pos)
+        self._fp.seek(self._in_pos)
+        data = self._fp.read(read_size) if read_size > 0 else b""
+        self._in_pos += len(data)
+
+        blocks, produced = [], 0
+        if not data:
+            self._finished = True
+        while data:
+            if getattr(self._dec, "eof", False):
+                if self._trailer: #gzip trailer of a member restarted as raw deflate
+                    skipped = min(self._trailer, len(data))
+                    data, self._trailer = data[skipped:], self._trailer - skipped
+                    if not data:
+                        break
+                if not data.strip(b"\x00"): #padding after the last member
+                    break
+                #a new member/frame starts after the end of the previous one
+                self._dec = self._new_decompressor()
+                self._add_point(out_pos + produced, self._in_pos - len(data), None)
+            #the data is split after each sync marker, so a flush point can be
+            #created there once the interval is reached
+            cut = data.find(_DEFLATE_SYNC_MARKER) if self._copyable else -1
+            if cut >= 0:
+                cut += len(_DEFLATE_SYNC_MARKER)
+                data, rest = data[:cut], data[cut:]
+            else:
+                rest = b""
+            block = self._dec.decompress(data)
+            blocks.append(block)
+            produced += len(block)
+            if cut >= 0 and out_pos + produced - self._last_point >= self._seek_interval \
+                    and not getattr(self._dec, "eof", False):
+                window = (self._block + b"".join(blocks))[-_DEFLATE_WINDOW:]
+                if self._is_flush_point(rest, window):
+                    self._add_point(out_pos + produced, self._in_pos - len(rest), window)
+                    self._last_point = out_pos + produced
+            data = self._dec.unused_data + rest if getattr(self._dec, "eof", False) else rest
+        self._block_start = out_pos
+        self._block = b"".join(blocks)
+
+        new_end = out_pos + produced
+        if self._finished and self._size is None:
+            self._size = new_end
+        if self._copyable and new_end - self._last_point >= self._seek_interval:
+            self._add_point(new_end, self._in_pos, self._dec.copy())
+            self._last_point = new_end
+
+        return not self._finished
+
+    def _get_size(self):
+        '''Returns the uncompressed size. If it is not known, the whole stream
+        is decompressed once, which also creates the seek points.'''
+        if self._size is None:
+            position = self._position
+            self._restore(len(self._points) - 1)
+            while self._advance():
+                pass
+            self._position = position
+        return self._size
+
+    size = property(_get_size, doc="Uncompressed size of the stream")
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._get_size() + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, buffer):
+        '''Reads the uncompressed content into ``buffer``. Returns the number
+        of bytes read.'''
+        view = memoryview(buffer).cast("B")
+        total, done = len(view), 0
+
+        if self._position < self._block_start:
+            index = _bisect_right(self._point_offsets, self._position) - 1
+            if not self._warned and self._position - self._point_offsets[index] > self._seek_interval:
+                _MOD_LOGGER.warning("No seek point close to %d in the %s stream, seeking backwards "
+                                    "decompresses again from %d", self._position, self.codec,
+                                    self._point_offsets[index])
+                self._warned = True
+            self._restore(index)
+        elif self._position >= self._block_start + len(self._block):
+            #skip directly to a seek point, if there is one closer
+            index = _bisect_right(self._point_offsets, self._position) - 1
+            if self._point_offsets[index] > self._block_start + len(self._block):
+                self._restore(index)
+
+        while done < total:
+            position = self._position + done
+            offset = position - self._block_start
+            if offset < len(self._block):
+                chunk = min(total - done, len(self._block) - offset)
+                view[done:done+chunk] = self._block[offset:offset+chunk]
+                done += chunk
+            elif not self._advance():
+                break
+        view.release()
+
+        self._position += done
+        return done
+
+    def save_index(self, file_pointer):
+        '''Saves the uncompressed size and the seek points that don't depend
+        on a copy of the decompressor as JSON. The windows of the flush points
+        are saved in base64. Reading the whole stream before saving
+        guarantees all of them are known.
+
+        Args:
+            file_pointer (file): File opened in text mode
+        '''
+        size = self._get_size()
+        points = []
+        for out_pos, (in_pos, state) in zip(self._point_offsets, self._points):
+            if state is None:
+                points.append([out_pos, in_pos])
+            elif isinstance(state, bytes):
+                points.append([out_pos, in_pos, base64.b64encode(state).decode("ascii")])
+        if len(points) == 1 and size > self._seek_interval:
+            _MOD_LOGGER.warning("The %s stream has no seek points that can be saved, seeking "
+                                "backwards after loading the index decompresses from the start", self.codec)
+        json.dump({"codec" : self.codec, "size" : size, "points" : points}, file_pointer)
+
+    def load_index(self, file_pointer):
+        '''Loads an index saved by ``save_index``.
+
+        Args:
+            file_pointer (file): File opened in text mode
+        '''
+        index = json.load(file_pointer)
+        if index["codec"] != self.codec:
+            raise MFTError(f"Index is for '{index['codec']}', not '{self.codec}'.")
+        self._size = index["size"]
+        for out_pos, in_pos, *window in index["points"]:
+            state = base64.b64decode(window[0]) if window else None
+            point = _bisect_right(self._point_offsets, out_pos)
+            if self._point_offsets[point-1] != out_pos:
+                self._point_offsets.insert(point, out_pos)
+                self._points.insert(point, (in_pos, state))
+
+    def __len__(self):
+        return self._get_size()
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(codec={self.codec}, size={self._size}, '
+                f'seek_points={len(self._points)})')
+
+
+def open_zip_member(file_pointer, name=None, **kwargs):
+    '''Opens a member of a ZIP file for random access.
+
+    Members that are stored are read directly and members compressed with
+    deflate use a ``CompressedFile``. Other compression methods use the
+    ``zipfile`` module, where seeking backwards is slow.
+
+    Args:
+        file_pointer (file): The ZIP file, opened in binary mode
+        name (str): Name of the member. If ``None``, the ZIP must have only one
+            file or a file named ``$MFT`` (in any folder)
+        kwargs: Passed to ``CompressedFile``
+
+    Returns:
+        A read only, seekable, file like object
+    '''
+    archive = zipfile.ZipFile(file_pointer)
+    if name is None:
+        files = [info for info in archive.infolist() if not info.is_dir()]
+        candidates = [info for info in files if info.filename.rsplit("/", 1)[-1].upper() in ("$MFT", "MFT")]
+        if len(files) == 1:
+            candidates = files
+        if len(candidates) != 1:
+            raise MFTError("Could not select the member of the ZIP file. Please provide one.")
+        info = candidates[0]
+    else:
+        info = archive.getinfo(name)
+    if info.flag_bits & 0x1:
+        raise MFTError("Encrypted ZIP members are not supported.")
+
+    if info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+        header = bytearray(_ZIP_LOCAL_HEADER.size)
+        file_pointer.seek(info.header_offset)
+        file_pointer.readinto(header)
+        sig, name_len, extra_len = _ZIP_LOCAL_HEADER.unpack(header)
+        if sig != _ZIP_MAGIC:
+            raise MFTError("Invalid ZIP local header.")
+        data_offset = info.header_offset + _ZIP_LOCAL_HEADER.size + name_len + extra_len
+        if info.compress_type == zipfile.ZIP_STORED:
+            return _FileSlice(file_pointer, data_offset, info.file_size)
+        return CompressedFile(file_pointer, "deflate", data_offset, info.compress_size,
+                              info.file_size, **kwargs)
+    _MOD_LOGGER.warning("ZIP member '%s' uses a compression that doesn't allow fast seeks.", info.filename)
+    return archive.open(info)
+
+
+class _FileSlice(io.RawIOBase):
+    '''A read only view of a part of a file'''
+    def __init__(self, file_pointer, start, size):
+        super().__init__()
+        self._fp, self._start, self.size, self._position = file_pointer, start, size, 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET : 0, io.SEEK_CUR : self._position, io.SEEK_END : self.size}[whence]
+        if base + offset < 0:
+            raise ValueError("Negative seek position")
+        self._position = base + offset
+        return self._position
+
+    def tell(self):
+        return self._position
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast("B")
+        size = max(min(len(view), self.size - self._position), 0)
+        self._fp.seek(self._start + self._position)
+        read = self._fp.readinto(view[:size]) if size else 0
+        view.release()
+        self._position += read
+        return read
+
+
+def open_source(file_pointer, member=None, **kwargs):
+    '''Detects if a file is compressed or a ZIP file and returns an object
+    that can be used by the ``MFT`` class. Uncompressed files are returned
+    as they are.
+
+    Args:
+        file_pointer (file): The file, opened in binary mode
+        member (str): Name of the member, in case of a ZIP file
+        kwargs: Passed to ``CompressedFile``
+
+    Returns:
+        A read only, seekable, file like object
+    '''
+    file_pointer.seek(0)
+    magic = file_pointer.read(4)
+    file_pointer.seek(0)
+
+    if magic.startswith(_GZIP_MAGIC):
+        return CompressedFile(file_pointer, "gzip", **kwargs)
+    if magic == _ZSTD_MAGIC:
+        return CompressedFile(file_pointer, "zstd", **kwargs)
+    if magic == _LZ4_MAGIC:
+        return CompressedFile(file_pointer, "lz4", **kwargs)
+    if magic == _ZIP_MAGIC:
+        return open_zip_member(file_pointer, member, **kwargs)
+    return file_pointer
+
+
+class HintedFile(io.RawIOBase):
+    '''A read only, seekable, file that tells the operating system how it
+    is being read, so a scan of a big MFT doesn't push everything else out of
+    the page cache.
+
+    When hints are enabled, the file is marked as sequential when opened, the
+    data in front of the current position is requested in advance (WILLNEED)
+    and the data behind it is discarded from the cache (DONTNEED).
+
+    In direct mode the file is opened with ``O_DIRECT`` and the page cache is
+    not used at all. The reads are done in aligned blocks through an internal
+    buffer. If the system or the filesystem doesn't support it, the file is
+    opened normally.
+
+    Note:
+        The hints depend on ``os.posix_fadvise`` and the direct mode on
+        ``os.O_DIRECT``, if they are not available, the file works as a
+        normal file.
+
+    Args:
+        path (str): Path of the file
+        hints (bool): Enables the hints
+        direct (bool): Enables the direct mode
+        window (int): Amount of data, in bytes, requested in front of the
+            current position and kept behind it. In direct mode, it is the
+            size of the internal buffer.
+        alignment (int): Alignment of the reads in direct mode
+
+    Attributes:
+        direct (bool): ``True`` if the file is in direct mode
+    '''
+    def __init__(self, path, hints=True, direct=False, window=16*1024*1024, alignment=4096):
+        '''See class docstring.'''
+        super().__init__()
+        self._fd = None
+        self.direct = False
+        self._window = max(window - window % alignment, alignment)
+        self._alignment = alignment
+        self._position = 0
+        self._advised_until = self._dropped_until = 0
+        self._hints = hints and hasattr(os, "posix_fadvise")
+
+        if direct and hasattr(os, "O_DIRECT"):
+            try:
+                self._fd = os.open(path, os.O_RDONLY | os.O_DIRECT)
+                self._direct_buffer = mmap.mmap(-1, self._window) #page aligned
+                self.direct = True
+                self._hints = False
+            except OSError as e:
+                _MOD_LOGGER.warning("Could not open '%s' in direct mode: %s", path, e)
+        if self._fd is None:
+            self._fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        self._size = os.fstat(self._fd).st_size
+        if self._hints:
+            os.posix_fadvise(self._fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    def fileno(self):
+        return self._fd
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def tell(self):
+        return self._position
+
+    def _pread(self, view, position):
+        if hasattr(os, "preadv"):
+            return os.preadv(self._fd, [view], position)
+        os.lseek(self._fd, position, os.SEEK_SET)
+        return os.readv(self._fd, [view])
+
+    def _advise(self, start, end):
+        '''Requests the data in front of ``end`` and discards the data that
+        is more than a window behind ``start``'''
+        window = self._window
+        if end + window // 2 > self._advised_until:
+            os.posix_fadvise(self._fd, end, window, os.POSIX_FADV_WILLNEED)
+            self._advised_until = end + window
+        if start - self._dropped_until >= 2 * window:
+            os.posix_fadvise(self._fd, self._dropped_until, start - window - self._dropped_until,
+                             os.POSIX_FADV_DONTNEED)
+            self._dropped_until = start - window
+
+    def _read_direct(self, view, position):
+        '''Reads using aligned blocks, copying the requested part'''
+        alignment, done = self._alignment, 0
+        with memoryview(self._direct_buffer) as direct_view:
+            while done < len(view):
+                aligned_start = (position + done) - (position + done) % alignment
+                skip = position + done - aligned_start
+                size = min(len(direct_view), skip + len(view) - done)
+                size += -size % alignment
+                read = self._pread(direct_view[:size], aligned_start)
+                chunk = min(max(read - skip, 0), len(view) - done)
+                if not chunk:
+                    break
+                view[done:done+chunk] = direct_view[skip:skip+chunk]
+                done += chunk
+        return done
+
+    def readinto(self, buffer):
+        '''Reads the content of the file into ``buffer``. Returns the number
+        of bytes read.'''
+        with memoryview(buffer).cast("B") as view:
+            size = max(min(len(view), self._size - self._position), 0)
+            if not size:
+                return 0
+            if self.direct:
+                read = self._read_direct(view[:size], self._position)
+            else:
+                read = self._pread(view[:size], self._position)
+                if self._hints:
+                    self._advise(self._position, self._position + read)
+        self._position += read
+        return read
+
+    def close(self):
+        if self._fd is not None:
+            if self._hints:
+                #what is left was read only once, it is not needed anymore
+                os.posix_fadvise(self._fd, self._dropped_until, 0, os.POSIX_FADV_DONTNEED)
+            os.close(self._fd)
+            self._fd = None
+            if self.direct:
+                self._direct_buffer.close()
+        super().close()
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(size={self._size}, hints={self._hints}, '
+                f'direct={self.direct}, window={self._window})')
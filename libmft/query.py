@@ -0,0 +1,852 @@
+# -*- coding: utf-8 -*-
+'''
+Plans how to get information out of a MFT.
+
+There are multiple ways of going over a MFT, each one with a different cost.
+Reading only the record headers is almost free, listing the names skips every
+attribute that is not a FILE_NAME, projections interpret only the requested
+fields and, finally, creating the entries interprets everything that is
+enabled in the ``MFTConfig``.
+
+Instead of choosing the method and tuning the ``MFTConfig`` by hand, the
+columns that are needed can be given to ``plan_query``. The resulting
+``QueryPlan`` has the cheapest method that can produce all the columns, the
+configuration that should be used to open the MFT and can produce the rows.
+
+The known columns are:
+
+- Header: ``record``, ``seq_number``, ``lsn``, ``usage_flags``,
+  ``hard_link_count``, ``base_record_ref``, ``in_use``, ``deleted`` and
+  ``directory``
+- Names: ``name``, ``parent_ref``, ``parent_seq``, ``size``, ``path`` and
+  ``orphan``
+- FILE_NAME: ``name_type``, ``fn.flags``, ``fn.alloc_size``, ``fn.real_size``
+  and the timestamps ``fn.created``, ``fn.changed``, ``fn.mft_changed`` and
+  ``fn.accessed``
+- STANDARD_INFORMATION: ``si.flags``, ``security_id``, ``owner_id``, ``usn``
+  and the timestamps ``si.created``, ``si.changed``, ``si.mft_changed`` and
+  ``si.accessed``
+- DATA: ``alloc_size`` and ``init_size``
+- Entry: ``streams`` (names of the data streams), ``extents`` (extents of the
+  unnamed data stream) and ``entry`` (the ``MFTEntry``)
+
+Any field supported by ``libmft.api.Projection`` can also be requested in
+the ``SOURCE.field`` format, for example ``FILE_NAME.reparse_value``.
+
+The records can be selected with a small query language (see ``Query``), for
+example ``name:*.exe AND si.created >= 2024-01-01 AND size > 10MB AND NOT
+deleted``. The columns used by the query are added to the plan and the
+conditions that depend only on the record header are checked before the
+records are interpreted.
+
+Many queries can be answered with a single pass over the MFT using
+``ScanBatch``.
+
+.. moduleauthor:: Júlio Dantas <jldantas@gmail.com>
+'''
+import re
+import logging
+
+from datetime import datetime as _datetime, timezone as _timezone
+from fnmatch import translate as _translate
+from functools import lru_cache, partial as _partial
+from operator import itemgetter as _itemgetter
+from sys import getsizeof as _getsizeof
+
+from libmft.api import MFT, MFTConfig, HeaderFilter, Projection, TimestampIndex
+from libmft.util.functions import convert_to_filetime
+from libmft.attribute import _create_func_from_str
+from libmft.flagsandtypes import AttrTypes, MftUsageFlags, NameType
+
+_MOD_LOGGER = logging.getLogger(__name__)
+
+ENGINES = ("header", "names", "projection", "full")
+'''tuple(str): The ways of going over the MFT, from the cheapest to the most
+expensive'''
+
+_NAMES_FIELDS = ("RECORD", "HEADER.seq_number", "FILE_NAME.parent_ref",
+                 "FILE_NAME.parent_seq", "FILE_NAME.name", "HEADER.usage_flags",
+                 "DATA.size")
+'''Fields returned by ``MFT.iter_names``, in the same order'''
+
+def _field_type(field):
+    '''Returns the type of the values of a field, one of ``"int"``,
+    ``"datetime"``, ``"str"``, ``"enum"`` or ``"object"``.'''
+    source, _, name = field.partition(".")
+    if source == "ENTRY":
+        return "object"
+    if name == "name":
+        return "str"
+    if name == "name_type":
+        return "enum"
+    if name.startswith("timestamps."):
+        return "datetime"
+    #the flags are IntFlag, they compare as int
+    return "int"
+
+def _field(name):
+    return ((name, ), None, False, _field_type(name))
+
+def _flag(flag, value):
+    return lambda context, flags: bool(flags & flag) == value
+
+_COLUMNS = {
+    "record" : _field("RECORD"),
+    "seq_number" : _field("HEADER.seq_number"),
+    "lsn" : _field("HEADER.lsn"),
+    "usage_flags" : _field("HEADER.usage_flags"),
+    "hard_link_count" : _field("HEADER.hard_link_count"),
+    "base_record_ref" : _field("HEADER.base_record_ref"),
+    "in_use" : (("HEADER.usage_flags", ), _flag(MftUsageFlags.IN_USE, True), False, "flag"),
+    "deleted" : (("HEADER.usage_flags", ), _flag(MftUsageFlags.IN_USE, False), False, "flag"),
+    "directory" : (("HEADER.usage_flags", ), _flag(MftUsageFlags.DIRECTORY, True), False, "flag"),
+    "name" : _field("FILE_NAME.name"),
+    "parent_ref" : _field("FILE_NAME.parent_ref"),
+    "parent_seq" : _field("FILE_NAME.parent_seq"),
+    "size" : _field("DATA.size"),
+    "path" : (("FILE_NAME.parent_ref", "FILE_NAME.parent_seq", "FILE_NAME.name"),
+              lambda context, *fn: context.path(*fn)[1], True, "str"),
+    "orphan" : (("FILE_NAME.parent_ref", "FILE_NAME.parent_seq", "FILE_NAME.name"),
+                lambda context, *fn: context.path(*fn)[0], True, "flag"),
+    "name_type" : _field("FILE_NAME.name_type"),
+    "fn.flags" : _field("FILE_NAME.flags"),
+    "fn.alloc_size" : _field("FILE_NAME.alloc_file_size"),
+    "fn.real_size" : _field("FILE_NAME.real_file_size"),
+    "si.flags" : _field("STANDARD_INFORMATION.flags"),
+    "security_id" : _field("STANDARD_INFORMATION.security_id"),
+    "owner_id" : _field("STANDARD_INFORMATION.owner_id"),
+    "usn" : _field("STANDARD_INFORMATION.usn"),
+    "alloc_size" : _field("DATA.alloc_size"),
+    "init_size" : _field("DATA.init_size"),
+    "streams" : _field("ENTRY.streams"),
+    "extents" : _field("ENTRY.extents"),
+    "entry" : _field("ENTRY.entry"),
+}
+'''dict(str : tuple): Maps a column to the fields it needs, the function that
+computes it from the fields (``None`` if it is the field itself), if the
+paths have to be resolved and the type of the values (see ``_field_type``,
+plus ``"flag"`` for booleans)'''
+for _prefix, _source in (("fn", "FILE_NAME"), ("si", "STANDARD_INFORMATION")):
+    for _name in ("created", "changed", "mft_changed", "accessed"):
+        _COLUMNS[f"{_prefix}.{_name}"] = _field(f"{_source}.timestamps.{_name}")
+
+_ENTRY_FIELDS = {
+    "streams" : ({AttrTypes.DATA}, False),
+    "extents" : ({AttrTypes.DATA}, True),
+    "entry" : (set(AttrTypes), True),
+}
+'''dict(str : tuple(set(AttrTypes), bool)): Attributes and if the dataruns
+are needed for the fields that can only be read from the entries'''
+
+def _column_spec(column):
+    '''Returns the specification of a column, see ``_COLUMNS``.'''
+    if column in _COLUMNS:
+        return _COLUMNS[column]
+    source, _, field = column.partition(".")
+    if source in ("HEADER", "FILE_NAME", "STANDARD_INFORMATION", "DATA") and field:
+        #validates the field
+        Projection({source : [field]})
+        return _field(column)
+    raise ValueError(f"Unknown column '{column}'")
+
+def _copy_filter(header_filter, **changes):
+    '''Returns a copy of a ``HeaderFilter`` with some values changed.'''
+    values = {name : getattr(header_filter, name) for name in HeaderFilter.__slots__}
+    values.update(changes)
+    return HeaderFilter(**values)
+
+def _engine_supports(engine, field):
+    '''Checks if an engine can read a field.'''
+    source = field.partition(".")[0]
+    if engine == "header":
+        return source in ("RECORD", "HEADER")
+    if engine == "names":
+        return field in _NAMES_FIELDS
+    if engine == "projection":
+        return source != "ENTRY"
+    return True
+
+class PathResolver():
+    '''Resolves the paths of the files using only the names of the
+    directories.
+
+    The directories are read once, with ``MFT.iter_names``, and the paths are
+    built in the same way as ``MFT.get_full_path``.
+
+    Args:
+        mft (:obj:`MFT`): The MFT
+    '''
+    _ROOT = 5
+    _CACHE_SIZE = 1024
+    _ENTRY_OVERHEAD = 200
+    '''int: Approximated memory, in bytes, used by each directory, without
+    the name'''
+    _CACHED_PATH_SIZE = 512
+    '''int: Approximated memory, in bytes, used by each path in the cache'''
+
+    def __init__(self, mft):
+        '''See class docstring.'''
+        self._directories = {record : (seq_number, parent_ref, parent_seq, name)
+            for record, seq_number, parent_ref, parent_seq, name, _, _ in
+            mft.iter_names(header_filter=HeaderFilter(directory=True))}
+        #the cache belongs to the instance, so it is released with it
+        self._directory_path = lru_cache(self._CACHE_SIZE)(_partial(self._find_path, self._directories))
+
+    @classmethod
+    def _find_path(cls, directories, parent_ref, parent_seq):
+        '''Returns if the directory is orphan and its path.'''
+        names = []
+        index, seq = parent_ref, parent_seq
+        while index != cls._ROOT:
+            directory = directories.get(index)
+            if directory is None or directory[0] != seq:
+                return (True, "\\".join(reversed(names)))
+            _, index, seq, name = directory
+            names.append(name)
+        return (False, "\\".join(reversed(names)))
+
+    def memory_size(self):
+        '''Returns the approximated memory, in bytes, used by the names of
+        the directories and the cache of paths.'''
+        names = sum(_getsizeof(directory[3]) for directory in self._directories.values())
+        return _getsizeof(self._directories) + len(self._directories) * self._ENTRY_OVERHEAD + names + \
+            self._CACHE_SIZE * self._CACHED_PATH_SIZE
+
+    def path(self, parent_ref, parent_seq, name):
+        '''Returns the path of a name.
+
+        Returns:
+            tuple(bool, str): If the file is orphan and the full path. Both
+                are ``None`` if the name is ``None``.
+        '''
+        if name is None:
+            return (None, None)
+        orphan, path = self._directory_path(parent_ref, parent_seq)
+        return (orphan, "\\".join([path, name]))
+
+class QueryPlan():
+    '''Describes how a set of columns is read from a MFT.
+
+    Created by ``plan_query``. The MFT should be opened with the
+    configuration of the plan (or with ``QueryPlan.open``), otherwise some of
+    the information might not be available.
+
+    Attributes:
+        columns (tuple(str)): The requested columns
+        engine (str): How the MFT is read. One of ``ENGINES``:
+            ``header`` uses ``MFT.iter_projection`` with header fields only,
+            ``names`` uses ``MFT.iter_names``, ``projection`` uses
+            ``MFT.iter_projection`` and ``full`` creates the entries.
+        fields (tuple(str)): Fields read from the MFT. The first is always
+            the record number (``RECORD``).
+        attributes (set(AttrTypes)): Attributes interpreted by the entries
+            (``full`` engine only)
+        load_dataruns (bool): If the dataruns are interpreted
+        relationships (bool): If the relationship between the records is
+            mapped when the MFT is opened. If not, the extension records are
+            skipped by the header filter and the ``names``, ``projection``
+            engines read them through the ATTRIBUTE_LIST of the base records,
+            so the attributes moved out of the base records (for example,
+            the DATA of heavily fragmented files) are still found.
+        resolve_paths (bool): If the names of the directories are read to
+            build the paths
+        header_filter (:obj:`HeaderFilter`): Filter applied to the records
+        mft_config (:obj:`MFTConfig`): Configuration to open the MFT
+    '''
+    def __init__(self, columns, header_filter=None):
+        '''See class docstring.'''
+        self.columns = tuple(columns)
+        specs = [_column_spec(column) for column in self.columns]
+        fields = ["RECORD"]
+        for needed, _, _, _ in specs:
+            fields.extend([field for field in needed if field not in fields])
+        self.fields = tuple(fields)
+        self.engine = next(engine for engine in ENGINES
+                           if all(_engine_supports(engine, field) for field in fields))
+        self.resolve_paths = any(spec[2] for spec in specs)
+
+        self.attributes, self.load_dataruns = set(), False
+        if self.engine == "full":
+            for field in fields:
+                source, _, name = field.partition(".")
+                if source == "ENTRY":
+                    attributes, dataruns = _ENTRY_FIELDS[name]
+                    self.attributes |= attributes
+                    self.load_dataruns = self.load_dataruns or dataruns
+                elif source in ("FILE_NAME", "STANDARD_INFORMATION", "DATA"):
+                    self.attributes.add(AttrTypes[source])
+        self.relationships = self.engine == "full"
+
+        if header_filter is None:
+            header_filter = HeaderFilter()
+        if not self.relationships and header_filter.has_base is None:
+            header_filter = _copy_filter(header_filter, has_base=False)
+        self.header_filter = header_filter
+        self.mft_config = self._create_config()
+
+        if self.engine in ("header", "projection"):
+            projection = {}
+            for field in fields[1:]:
+                source, _, name = field.partition(".")
+                projection.setdefault(source, []).append(name)
+            self._projection = Projection(projection)
+            #the projection groups the fields by source
+            self.fields = ("RECORD", ) + self._projection.columns
+        else:
+            self._projection = None
+        self._specs = [(tuple(self.fields.index(field) for field in needed), function)
+                       for needed, function, _, _ in specs]
+        _MOD_LOGGER.debug("Query plan created:\n%s", self.explain())
+
+    def _create_config(self):
+        '''Creates the minimal configuration for the plan.'''
+        config = MFTConfig()
+        #the MFT bitmap allows the unallocated records to be skipped
+        attributes = self.attributes | {AttrTypes.BITMAP} if self.header_filter.in_use else self.attributes
+        for attr_type in AttrTypes:
+            config._set_load_attr(attr_type, attr_type in attributes)
+        config.load_dataruns = self.load_dataruns
+        config.create_initial_information = self.relationships
+        config.header_filter = self.header_filter
+        return config
+
+    def open(self, file_pointer, bitmap_file_pointer=None):
+        '''Opens a MFT with the configuration of the plan.
+
+        Args:
+            file_pointer (file): Pointer to the MFT, opened in binary mode
+            bitmap_file_pointer (file): Pointer to the ``$MFT:$BITMAP``. Optional.
+
+        Returns:
+            :obj:`MFT`: The MFT
+        '''
+        return MFT(file_pointer, self.mft_config, bitmap_file_pointer)
+
+    def _field_rows(self, mft, start, end, header_filter):
+        '''Yields, for each record, a tuple with the values of ``fields``. The
+        first field is always the record number.'''
+        if self.engine in ("header", "projection"):
+            for record, values in mft.iter_projection(self._projection, start, end, header_filter):
+                yield (record, ) + values
+        elif self.engine == "names":
+            positions = [_NAMES_FIELDS.index(field) for field in self.fields[1:]]
+            flags_index = _NAMES_FIELDS.index("HEADER.usage_flags")
+            for names in mft.iter_names(start, end, header_filter, True):
+                yield (names[0], ) + tuple(MftUsageFlags(names[i]) if i == flags_index else names[i]
+                                           for i in positions)
+        else:
+            if end is None:
+                end = mft.total_amount_entries
+            for entry in mft.splice_generator(start, end, header_filter):
+                yield (entry.header.mft_record, ) + tuple(_entry_value(entry, field) for field in self.fields[1:])
+
+    def rows(self, mft, start=0, end=None, header_filter=None):
+        '''Reads the columns from the MFT.
+
+        Args:
+            mft (:obj:`MFT`): The MFT, opened with the configuration of the plan
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+            header_filter (:obj:`HeaderFilter`): Replaces the filter of the
+                plan, if provided
+
+        Yields:
+            tuple: The values of the columns, in the same order as ``columns``
+        '''
+        context = PathResolver(mft) if self.resolve_paths else None
+        specs = self._specs
+        if header_filter is None:
+            header_filter = self.header_filter
+        for values in self._field_rows(mft, start, end, header_filter):
+            yield tuple(values[positions[0]] if function is None else
+                        function(context, *[values[i] for i in positions])
+                        for positions, function in specs)
+
+    def explain(self):
+        '''Returns a human readable description of the plan.'''
+        attributes = ", ".join(sorted(attr_type.name for attr_type in self.attributes)) or "none"
+        return "\n".join((
+            f"columns: {', '.join(self.columns)}",
+            f"engine: {self.engine}",
+            f"fields: {', '.join(self.fields)}",
+            f"attributes: {attributes}",
+            f"dataruns: {'yes' if self.load_dataruns else 'no'}",
+            f"relationship prepass: {'yes' if self.relationships else 'no (extension records read through the ATTRIBUTE_LIST)'}",
+            f"path resolution: {'yes (directory names read first)' if self.resolve_paths else 'no'}",
+            f"header filter: {self.header_filter}",
+        ))
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(columns={self.columns}, engine={self.engine}, '
+                f'attributes={self.attributes}, load_dataruns={self.load_dataruns}, '
+                f'relationships={self.relationships}, resolve_paths={self.resolve_paths}, '
+                f'header_filter={self.header_filter})'
+               )
+
+def _entry_value(entry, field):
+    '''Reads a field from an entry.'''
+    if field == "RECORD":
+        return entry.header.mft_record
+    source, _, name = field.partition(".")
+    if source == "HEADER":
+        return getattr(entry.header, name)
+    if source == "ENTRY":
+        if name == "entry":
+            return entry
+        if name == "streams":
+            return entry.get_datastream_names()
+        stream = entry.get_datastream()
+        return stream.extents if stream is not None and not stream.is_resident else None
+    if source == "DATA":
+        stream = entry.get_datastream()
+        return getattr(stream, name) if stream is not None else None
+    if source == "FILE_NAME":
+        attr = entry.get_main_filename_attr()
+    else:
+        attrs = entry.get_attributes(AttrTypes.STANDARD_INFORMATION)
+        attr = attrs[0] if attrs is not None else None
+    if attr is None:
+        return None
+    value = attr.content
+    for part in name.split("."):
+        value = getattr(value, part)
+    return value
+
+def plan_query(columns, header_filter=None):
+    '''Creates the plan to read some columns from a MFT.
+
+    Args:
+        columns (list(str)): The columns, see the module documentation
+        header_filter (:obj:`HeaderFilter`): Filter applied to the records
+
+    Returns:
+        :obj:`QueryPlan`: The plan
+    '''
+    return QueryPlan(columns, header_filter)
+
+#******************************************************************************
+# QUERY LANGUAGE
+#******************************************************************************
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<paren>[()]) |
+    (?P<date>\d{4}-\d{2}-\d{2}(?:T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?)(?![^\s()]) |
+    (?P<op><=|>=|==|!=|=|<|>|:) |
+    (?P<string>"[^"]*"|'[^']*') |
+    (?P<word>[^\s()<>=!:"']+)
+    )''', re.VERBOSE)
+'''re.Pattern: Splits a query in tokens'''
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)(B|KB|MB|GB|TB|K|M|G|T)?", re.IGNORECASE)
+_SIZE_UNITS = {None : 1, "B" : 1, "K" : 1024, "KB" : 1024, "M" : 1024**2, "MB" : 1024**2,
+               "G" : 1024**3, "GB" : 1024**3, "T" : 1024**4, "TB" : 1024**4}
+_KEYWORDS = ("AND", "OR", "NOT")
+
+def _tokenize(query):
+    '''Returns the tokens of a query as a list of (kind, value, position).'''
+    tokens, position = [], 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"Invalid query, unexpected character at position {position}: {query[position:]!r}")
+        kind = match.lastgroup
+        value, start = match.group(kind), match.start(kind)
+        if kind == "word" and value.upper() in _KEYWORDS:
+            kind, value = "keyword", value.upper()
+        elif kind == "string":
+            kind, value = "word", value[1:-1]
+        tokens.append((kind, value, start))
+        position = match.end()
+    return tokens
+
+def _convert_value(kind, value):
+    '''Converts a literal of the query to the python value.'''
+    if kind == "date":
+        date = _datetime.fromisoformat(value)
+        return date if date.tzinfo is not None else date.replace(tzinfo=_timezone.utc)
+    number = _NUMBER.fullmatch(value)
+    if number is not None:
+        amount = float(number.group(1)) * _SIZE_UNITS[number.group(2) and number.group(2).upper()]
+        return int(amount) if amount.is_integer() else amount
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
+
+class _QueryParser():
+    '''Recursive descent parser for the query language. Creates a tree of
+    tuples:
+
+    - ``("and", node, ...)``, ``("or", node, ...)`` and ``("not", node)``
+    - ``("flag", column)``: the column is true
+    - ``("match", column, pattern)``: the column matches the pattern
+    - ``("cmp", column, operator, value)``: the column compared with a value
+    '''
+    def __init__(self, query):
+        self._query = query
+        self._tokens = _tokenize(query)
+        self._index = 0
+
+    def _peek(self):
+        return self._tokens[self._index] if self._index < len(self._tokens) else (None, None, len(self._query))
+
+    def _next(self):
+        token = self._peek()
+        self._index += 1
+        return token
+
+    def _error(self, message):
+        raise ValueError(f"Invalid query, {message} at position {self._peek()[2]}: {self._query!r}")
+
+    def parse(self):
+        node = self._or()
+        if self._index < len(self._tokens):
+            self._error(f"unexpected {self._peek()[1]!r}")
+        return node
+
+    def _or(self):
+        nodes = [self._and()]
+        while self._peek()[:2] == ("keyword", "OR"):
+            self._next()
+            nodes.append(self._and())
+        return nodes[0] if len(nodes) == 1 else ("or", *nodes)
+
+    def _and(self):
+        nodes = [self._not()]
+        while self._peek()[:2] == ("keyword", "AND"):
+            self._next()
+            nodes.append(self._not())
+        return nodes[0] if len(nodes) == 1 else ("and", *nodes)
+
+    def _not(self):
+        if self._peek()[:2] == ("keyword", "NOT"):
+            self._next()
+            return ("not", self._not())
+        return self._primary()
+
+    def _primary(self):
+        kind, value, _ = self._peek()
+        if (kind, value) == ("paren", "("):
+            self._next()
+            node = self._or()
+            if self._next()[:2] != ("paren", ")"):
+                self._index -= 1
+                self._error("expected ')'")
+            return node
+        if kind != "word":
+            self._error("expected a column")
+        self._next()
+        column = value
+        column_type = _column_spec(column)[3]
+        kind, operator, _ = self._peek()
+        if kind != "op":
+            return ("flag", column)
+        self._next()
+        operator = "==" if operator == "=" else operator
+        kind, value, _ = self._peek()
+        if kind not in ("word", "date"):
+            self._error("expected a value")
+        if operator == ":":
+            if column_type != "str":
+                self._error(f"'{column}' is not text, ':' can't be used")
+            self._next()
+            return ("match", column, value)
+        value = self._typed_value(column, column_type, operator, kind, value)
+        self._next()
+        return ("cmp", column, operator, value)
+
+    def _typed_value(self, column, column_type, operator, kind, value):
+        '''Converts the value of a comparison to the type of the column.
+        Raises ``ValueError`` if the value or the operator can't be used with
+        the column.'''
+        if column_type == "object":
+            self._error(f"'{column}' can't be compared")
+        if column_type in ("str", "flag", "enum") and operator not in ("==", "!="):
+            self._error(f"'{column}' can only be compared with '=' or '!='")
+        if column_type == "str":
+            return value
+        if column_type == "enum":
+            try:
+                return NameType[value.upper()]
+            except KeyError:
+                self._error(f"'{column}' must be one of {', '.join(member.name for member in NameType)}")
+        value = _convert_value(kind, value)
+        if column_type == "flag":
+            if not isinstance(value, bool):
+                self._error(f"'{column}' must be compared with true or false")
+        elif column_type == "datetime":
+            if not isinstance(value, _datetime):
+                self._error(f"'{column}' must be compared with a date (YYYY-MM-DD[THH:MM[:SS]])")
+        elif not isinstance(value, (int, float)) or isinstance(value, bool):
+            self._error(f"'{column}' must be compared with a number")
+        return value
+
+def _query_columns(node):
+    '''Returns the columns used by a query tree.'''
+    if node[0] in ("and", "or", "not"):
+        return [column for child in node[1:] for column in _query_columns(child)]
+    return [node[1]]
+
+def _query_source(node, columns, namespace):
+    '''Creates the python expression of a query tree. The values used are
+    added to ``namespace``.'''
+    kind = node[0]
+    if kind in ("and", "or"):
+        return "(" + f" {kind} ".join([_query_source(child, columns, namespace) for child in node[1:]]) + ")"
+    if kind == "not":
+        return f"(not {_query_source(node[1], columns, namespace)})"
+    value = f"row[{columns.index(node[1])}]"
+    if kind == "flag":
+        return f"bool({value})"
+    name = f"_v{len(namespace)}"
+    if kind == "match":
+        namespace[name] = re.compile(_translate(node[2]), re.IGNORECASE).match
+        return f"({value} is not None and {name}({value}) is not None)"
+    namespace[name] = node[3]
+    if node[2] in ("==", "!="):
+        return f"({value} {node[2]} {name})"
+    return f"({value} is not None and {value} {node[2]} {name})"
+
+def _push_down(node):
+    '''Creates a ``HeaderFilter`` with the conditions of the query that
+    depend only on the record header and must always be true.'''
+    header_filter = HeaderFilter()
+    for term in (node[1:] if node[0] == "and" else (node, )):
+        negated = term[0] == "not"
+        if negated:
+            term = term[1]
+        if term[0] == "flag" and term[1] in ("in_use", "deleted", "directory"):
+            value = (term[1] != "deleted") != negated
+            if term[1] == "directory":
+                header_filter.directory = value
+            else:
+                header_filter.in_use = value
+        elif term[0] == "cmp" and not negated and term[1] in ("record", "lsn") \
+            and isinstance(term[3], int) and not isinstance(term[3], bool) and term[2] != "!=":
+            _, column, operator, value = term
+            low = {">=" : value, ">" : value + 1, "==" : value}.get(operator)
+            high = {"<=" : value, "<" : value - 1, "==" : value}.get(operator)
+            if column == "record":
+                if low is not None:
+                    header_filter.start = max(header_filter.start or 0, low)
+                if high is not None:
+                    header_filter.end = high + 1 if header_filter.end is None else min(header_filter.end, high + 1)
+            else:
+                if low is not None:
+                    header_filter.min_lsn = max(header_filter.min_lsn or 0, low)
+                if high is not None:
+                    header_filter.max_lsn = high if header_filter.max_lsn is None else min(header_filter.max_lsn, high)
+    return header_filter
+
+class Query():
+    '''A compiled query over the MFT.
+
+    A query is a combination of conditions with ``AND``, ``OR``, ``NOT`` and
+    parenthesis. The conditions can be:
+
+    - ``column``: the column is true, for example ``deleted`` or ``directory``
+    - ``column:pattern``: the column matches a shell like pattern, ignoring
+      the case, for example ``name:*.exe`` or ``path:*\\system32\\*``
+    - ``column operator value``: the column compared with a value, where
+      the operator is one of ``=``, ``==``, ``!=``, ``<``, ``<=``, ``>`` or
+      ``>=``. Dates are in the ISO format (``2024-01-01`` or
+      ``2024-01-01T10:00:00``, UTC), sizes can have a unit (``10MB``, 1024
+      based) and text can be quoted.
+
+    The values must match the type of the column: numbers for the numeric
+    columns, dates for the timestamps, ``true``/``false`` for ``in_use``,
+    ``deleted``, ``directory`` and ``orphan`` and a ``NameType`` for
+    ``name_type``. Text and boolean columns only support ``=`` and ``!=``
+    and patterns can only be used with text. A query that breaks these rules
+    raises ``ValueError`` when it is compiled.
+
+    The query is compiled into a single python function. The conditions on
+    the record header that must always be true (``deleted``, ``in_use``,
+    ``directory``, ranges of ``record`` and ``lsn``) are also checked before
+    the records are interpreted. If the timestamps used by conditions that
+    must always be true are indexed in ``MFT.timestamp_index``, only the
+    records found in the index are interpreted.
+
+    Args:
+        query (str): The query
+        columns (list(str)): Columns returned for each record that matches.
+            Default is ``("record", "path")``.
+
+    Attributes:
+        query (str): The query
+        columns (tuple(str)): The columns returned
+        plan (:obj:`QueryPlan`): The plan used to read the columns needed
+            by the query and the returned columns
+    '''
+    def __init__(self, query, columns=("record", "path")):
+        '''See class docstring.'''
+        self.query = query
+        self.columns = tuple(columns)
+        tree = _QueryParser(query).parse()
+        plan_columns = list(self.columns)
+        plan_columns.extend([column for column in _query_columns(tree) if column not in plan_columns])
+        self.plan = QueryPlan(plan_columns, _push_down(tree))
+
+        self._indexed_terms = [term[1:] for term in (tree[1:] if tree[0] == "and" else (tree, ))
+            if term[0] == "cmp" and term[1] in TimestampIndex.TIMESTAMPS
+            and term[2] != "!=" and isinstance(term[3], _datetime)]
+        namespace = {}
+        self._source = _query_source(tree, plan_columns, namespace)
+        self._predicate = _create_func_from_str("query_predicate", ["row"],
+                            f"return {self._source}", query, namespace)
+
+    def rows(self, mft, start=0, end=None):
+        '''Returns the records that match the query.
+
+        Args:
+            mft (:obj:`MFT`): The MFT
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+
+        Yields:
+            tuple: The values of the columns, in the same order as ``columns``
+        '''
+        predicate, count = self._predicate, len(self.columns)
+        for row in self.plan.rows(mft, start, end, self._index_filter(mft)):
+            if predicate(row):
+                yield row[:count]
+
+    def _index_filter(self, mft):
+        '''Creates a header filter that accepts only the records found in the
+        timestamp indexes of the MFT. Returns ``None`` if no index can be
+        used.'''
+        candidates = None
+        for column, operator, value in self._indexed_terms:
+            if column not in mft.timestamp_index:
+                continue
+            #the conversion of the timestamps can be off by a few FILETIME units,
+            #the exact comparison is done by the query
+            filetime = convert_to_filetime(value)
+            low = filetime - 100 if operator in (">", ">=", "==") else None
+            high = filetime + 100 if operator in ("<", "<=", "==") else None
+            records = set(mft.timestamp_index.between(column, low, high))
+            candidates = records if candidates is None else candidates & records
+        if candidates is None:
+            return None
+        header_filter = self.plan.header_filter
+        predicate = header_filter.predicate
+        if predicate is None:
+            predicate = lambda record, header: record in candidates
+        else:
+            predicate = lambda record, header, other=predicate: record in candidates and other(record, header)
+        start, end = (min(candidates), max(candidates) + 1) if candidates else (0, 0)
+        return _copy_filter(header_filter, predicate=predicate,
+            start=start if header_filter.start is None else max(start, header_filter.start),
+            end=end if header_filter.end is None else min(end, header_filter.end))
+
+    def explain(self):
+        '''Returns a human readable description of the query and its plan.'''
+        return f"query: {self.query}\npredicate: {self._source}\n{self.plan.explain()}"
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(query={self.query!r}, columns={self.columns})'
+
+def _common_filter(header_filters):
+    '''Creates a ``HeaderFilter`` that accepts all the records accepted by
+    any of the filters.'''
+    common = HeaderFilter()
+    for name in ("in_use", "directory", "baad"):
+        values = {getattr(header_filter, name) for header_filter in header_filters}
+        if len(values) == 1:
+            setattr(common, name, values.pop())
+    for name, function in (("start", min), ("end", max), ("min_lsn", min), ("max_lsn", max)):
+        values = [getattr(header_filter, name) for header_filter in header_filters]
+        if values and None not in values:
+            setattr(common, name, function(values))
+    return common
+
+class ScanBatch():
+    '''Answers multiple queries with a single pass over the MFT.
+
+    Each query is registered with the columns it wants and, optionally, a
+    function that receives the matching rows. When the batch runs, one plan
+    with all the columns is created, so the records are read, interpreted
+    and have their paths resolved only once, and every query gets only the
+    rows that match it.
+
+    The visitors that need the entries themselves can ask for the ``entry``
+    column, which makes the whole batch use the ``full`` engine.
+    '''
+    def __init__(self):
+        '''See class docstring.'''
+        self._queries = [] #(Query or None, columns, callback)
+
+    def add(self, query, columns=("record", "path"), callback=None):
+        '''Registers a query.
+
+        Args:
+            query (str): The query, see ``Query``. If ``None``, all the
+                records match.
+            columns (list(str)): Columns that are returned for each record
+            callback (callable): Called with the values of the columns of
+                each record that matches. If ``None``, the rows are returned
+                by ``run``.
+
+        Returns:
+            int: The position of the query in the results of ``run``
+        '''
+        columns = tuple(columns)
+        compiled = Query(query, columns) if query is not None else None
+        self._queries.append((compiled, columns, callback))
+        return len(self._queries) - 1
+
+    def plan(self):
+        '''Creates the plan shared by all the queries.
+
+        Returns:
+            :obj:`QueryPlan`: The plan
+        '''
+        columns = []
+        for compiled, query_columns, _ in self._queries:
+            needed = compiled.plan.columns if compiled is not None else query_columns
+            columns.extend([column for column in needed if column not in columns])
+        filters = [compiled.plan.header_filter if compiled is not None else HeaderFilter()
+                   for compiled, _, _ in self._queries]
+        return QueryPlan(columns, _common_filter(filters))
+
+    def run(self, mft, start=0, end=None):
+        '''Goes over the MFT once, answering all the queries.
+
+        Args:
+            mft (:obj:`MFT`): The MFT
+            start (int): First record number
+            end (int): Last record number (exclusive). If ``None``, goes until
+                the end of the MFT.
+
+        Returns:
+            list(list(tuple)): For each query, in the order they were added,
+                the rows that matched. Queries with a callback have ``None``.
+        '''
+        plan = self.plan()
+        results, visitors = [], []
+        for compiled, columns, callback in self._queries:
+            needed = compiled.plan.columns if compiled is not None else columns
+            positions = [plan.columns.index(column) for column in needed]
+            getter = _itemgetter(*positions) if len(positions) > 1 else \
+                (lambda row, position=positions[0]: (row[position], ))
+            predicate = compiled._predicate if compiled is not None else None
+            rows = [] if callback is None else None
+            results.append(rows)
+            visitors.append((getter, predicate, len(columns), rows.append if callback is None else callback))
+
+        for row in plan.rows(mft, start, end):
+            for getter, predicate, count, callback in visitors:
+                values = getter(row)
+                if predicate is None or predicate(values):
+                    callback(values[:count])
+        return results
+
+    def __len__(self):
+        '''Returns the number of registered queries'''
+        return len(self._queries)
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(queries={len(self._queries)})'
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+'''
+Interprets the security descriptors stored in the $Secure file.
+
+Since NTFS 3, the entries normally don't have a SECURITY_DESCRIPTOR attribute.
+Instead, the STANDARD_INFORMATION has a ``security_id`` that points to a
+descriptor stored in the ``$Secure:$SDS`` stream. Two indexes are also kept,
+``$SII`` (indexed by security id) and ``$SDH`` (indexed by the hash of the
+descriptor).
+
+This module allows the extracted streams to be used so the security
+descriptors of the entries can be resolved. Each descriptor is interpreted
+only once, no matter how many entries reference it.
+
+The $SDS stream is organized in blocks of 256KB, where each block is followed
+by a mirror copy of itself. The entries never cross a block boundary and are
+aligned to 16 bytes.
+'''
+import struct
+import logging
+
+from libmft.util.functions import apply_fixup_array, get_file_size as _get_file_size
+from libmft.attribute import SecurityDescriptor
+from libmft.flagsandtypes import IndexEntryFlags
+from libmft.exceptions import MFTError
+
+_MOD_LOGGER = logging.getLogger(__name__)
+
+class Secure():
+    '''Represents the security descriptors of a volume ($Secure).
+
+    Works as a read only mapping of ``security_id`` to ``SecurityDescriptor``.
+    The location of all descriptors is discovered when the object is created,
+    either by going over the whole $SDS stream or, if the $SII stream is
+    provided, by reading the index. The descriptors themselves are only
+    interpreted when requested and are kept, so each unique id costs one parse.
+
+    Args:
+        sds_file_pointer (file): File with the contents of the ``$Secure:$SDS``
+            stream, opened in binary mode
+        sii_file_pointer (file): File with the contents of the ``$Secure:$SII``
+            stream (INDEX_ALLOCATION), opened in binary mode. Optional.
+        index_record_size (int): Size of one index record of the $SII stream
+
+    Attributes:
+        sds_file_pointer (file): File with the $SDS stream
+    '''
+    _SDS_HEADER = struct.Struct("<2IQI")
+    ''' Hash of the security descriptor - 4
+        Security id - 4
+        Offset of this entry in $SDS - 8
+        Size of this entry - 4 (header + security descriptor)
+    '''
+    _SII_ENTRY = struct.Struct("<2H4x3H2xI2IQI")
+    ''' Offset to data - 2
+        Size of data - 2
+        Padding - 4
+        Size of index entry - 2
+        Size of the key - 2
+        Flags - 2 (IndexEntryFlags)
+        Padding - 2
+        Key (security id) - 4
+        Data (same as the $SDS header) - 20
+    '''
+    _INDX_HEADER = struct.Struct("<4s2H16xI")
+    ''' Signature - 4 ("INDX")
+        Fix Up Array offset - 2
+        Fix Up Count - 2
+        LSN + VCN - 16
+        Offset to the first entry - 4 (relative to the node header)
+    '''
+    _NODE_HEADER_OFFSET = 0x18
+    _SDS_BLOCK_SIZE = 0x40000
+    _SDS_ALIGNMENT = 16
+
+    def __init__(self, sds_file_pointer, sii_file_pointer=None, index_record_size=4096):
+        '''See class docstring.'''
+        self.sds_file_pointer = sds_file_pointer
+        self._locations = {} #security_id -> (offset, length) of the descriptor
+        self._descriptors = {} #security_id -> SecurityDescriptor
+
+        if sii_file_pointer is not None:
+            self._load_from_sii(sii_file_pointer, index_record_size)
+        else:
+            self._load_from_sds()
+
+    def _load_from_sds(self):
+        '''Finds all the descriptors by going over the $SDS stream, block by
+        block, skipping the mirror copies.'''
+        fp = self.sds_file_pointer
+        header_repr = self._SDS_HEADER
+        block_size, alignment = self._SDS_BLOCK_SIZE, self._SDS_ALIGNMENT
+        file_size = _get_file_size(fp)
+        buffer = bytearray(block_size)
+
+        for block_start in range(0, file_size, block_size * 2):
+            fp.seek(block_start)
+            block_len = fp.readinto(buffer)
+            offset = 0
+            while offset + header_repr.size <= block_len:
+                _, security_id, entry_offset, entry_len = header_repr.unpack_from(buffer, offset)
+                #an empty or stale entry marks the end of the used part of the block
+                if entry_len <= header_repr.size or entry_offset != block_start + offset \
+                    or offset + entry_len > block_len:
+                    break
+                self._locations[security_id] = (entry_offset + header_repr.size, entry_len - header_repr.size)
+                offset += entry_len + (-entry_len % alignment)
+        _MOD_LOGGER.info("%d security descriptors found in $SDS", len(self._locations))
+
+    def _load_from_sii(self, sii_file_pointer, index_record_size):
+        '''Finds all the descriptors by reading the $SII index records.'''
+        entry_repr, indx_repr = self._SII_ENTRY, self._INDX_HEADER
+        header_size = self._SDS_HEADER.size
+        file_size = _get_file_size(sii_file_pointer)
+        buffer = bytearray(index_record_size)
+        bin_view = memoryview(buffer)
+
+        for record_start in range(0, file_size, index_record_size):
+            sii_file_pointer.seek(record_start)
+            if sii_file_pointer.readinto(buffer) != index_record_size:
+                break
+            sig, fx_offset, fx_count, first_entry = indx_repr.unpack_from(buffer, 0)
+            if sig != b"INDX":
+                #unused records in the allocation are zeroed
+                if sig != b"\x00\x00\x00\x00":
+                    raise MFTError(f"Invalid $SII index record at offset {record_start}.")
+                continue
+            apply_fixup_array(bin_view, fx_offset, fx_count, index_record_size)
+
+            offset = self._NODE_HEADER_OFFSET + first_entry
+            while offset + entry_repr.size <= index_record_size:
+                _, _, entry_len, _, flags, security_id, _, _, sds_offset, sds_len = \
+                    entry_repr.unpack_from(buffer, offset)
+                if flags & IndexEntryFlags.LAST_ENTRY or not entry_len:
+                    break
+                self._locations[security_id] = (sds_offset + header_size, sds_len - header_size)
+                offset += entry_len
+        bin_view.release()
+        _MOD_LOGGER.info("%d security descriptors found in $SII", len(self._locations))
+
+    def _read_descriptor(self, security_id):
+        offset, length = self._locations[security_id]
+        self.sds_file_pointer.seek(offset)
+        return SecurityDescriptor.create_from_binary(memoryview(self.sds_file_pointer.read(length)))
+
+    def get(self, security_id, default=None):
+        '''Returns the security descriptor of a security id.
+
+        Args:
+            security_id (int): The security id, normally from the
+                STANDARD_INFORMATION attribute
+            default: Value returned if the security id is not known
+
+        Returns:
+            :obj:`SecurityDescriptor`: The security descriptor or ``default``
+        '''
+        try:
+            return self[security_id]
+        except KeyError:
+            return default
+
+    def __getitem__(self, security_id):
+        '''Return the security descriptor of a security id. Raises ``KeyError``
+        if the id is not known.'''
+        try:
+            return self._descriptors[security_id]
+        except KeyError:
+            descriptor = self._read_descriptor(security_id)
+            self._descriptors[security_id] = descriptor
+            return descriptor
+
+    def __contains__(self, security_id):
+        return security_id in self._locations
+
+    def __iter__(self):
+        '''Iterates over the known security ids'''
+        return iter(self._locations)
+
+    def __len__(self):
+        '''Returns the number of known security descriptors'''
+        return len(self._locations)
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(descriptors={len(self._locations)}, loaded={len(self._descriptors)})'
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+'''
+Creates MAC timelines from a MFT.
+
+Each entry has up to eight timestamps per name, four from the
+STANDARD_INFORMATION and four from each FILE_NAME. For a big volume, the
+events do not fit in memory, so ``TimelineBuilder`` sorts them in chunks
+limited by a memory budget. Each sorted chunk (a "run") is written to a
+temporary file and the runs are merged, with a heap, while the output is
+written. Only one event per run is kept in memory during the merge.
+
+The timestamps of the same name that are equal are grouped in one event,
+with the MACB letters of all of them:
+
+- ``M``: Data modified (``changed``)
+- ``A``: Accessed (``accessed``)
+- ``C``: MFT entry changed (``mft_changed``)
+- ``B``: Birth (``created``)
+
+The timeline can be written as CSV or as a bodyfile, the format used by
+``mactime`` from The Sleuth Kit.
+
+.. moduleauthor:: Júlio Dantas <jldantas@gmail.com>
+'''
+import os
+import csv
+import heapq
+import logging
+import tempfile
+
+from operator import itemgetter as _itemgetter
+from struct import Struct as _Struct
+
+from libmft.api import MFTConfig
+from libmft.flagsandtypes import AttrTypes
+from libmft.util.functions import convert_filetime, convert_to_filetime
+from libmft.query import PathResolver
+
+_MOD_LOGGER = logging.getLogger(__name__)
+
+_MACB = (("changed", 0b1000), ("accessed", 0b0100), ("mft_changed", 0b0010), ("created", 0b0001))
+'''tuple: The timestamps, in the order of the MACB letters, and their bits'''
+_SOURCES = ("SI", "FN")
+'''tuple(str): Sources of the events'''
+_UNIX_EPOCH = 116444736000000000
+'''int: The unix epoch as a FILETIME'''
+_NO_SIZE = 0xFFFFFFFFFFFFFFFF
+'''int: Written to the runs when the entry has no size'''
+_EVENT_OVERHEAD = 400
+'''int: Approximated memory, in bytes, used by an event in memory, without
+the path'''
+_READ_BUFFER = 256 * 1024
+'''int: Size of the buffer used to read each run file'''
+_WRITE_BUFFER = 1024 * 1024
+'''int: Size of the buffer used to write a run file'''
+_sort_key = _itemgetter(0, 1, 2, 3)
+
+def _macb(bits):
+    '''Returns the MACB string of the bits'''
+    return "".join(letter if bits & bit else "." for letter, (_, bit) in zip("MACB", _MACB))
+
+class _RunFile():
+    '''A temporary file with sorted events.
+
+    Each event is saved as a fixed header (``_EVENT``) followed by the path
+    encoded as UTF-8.
+
+    Args:
+        temp_dir (str): Directory where the file is created
+    '''
+    _EVENT = _Struct("<qQBBBQH?I")
+    '''Filetime, record number, source, name index, MACB bits, size, sequence
+    number, directory and length of the path'''
+
+    def __init__(self, temp_dir=None):
+        '''See class docstring.'''
+        fd, self.name = tempfile.mkstemp(prefix="libmft_run_", suffix=".tmp", dir=temp_dir)
+        os.close(fd)
+        self.count = 0
+
+    def write(self, events):
+        '''Writes a sequence of sorted events to the file.'''
+        pack = self._EVENT.pack
+        with open(self.name, "wb", buffering=_WRITE_BUFFER) as run:
+            for filetime, record, source, name_index, bits, path, size, seq, directory in events:
+                encoded = path.encode("utf-8", "surrogatepass")
+                run.write(pack(filetime, record, source, name_index, bits,
+                               _NO_SIZE if size is None else size, seq, directory, len(encoded)))
+                run.write(encoded)
+                self.count += 1
+
+    def __iter__(self):
+        '''Yields the events of the file, in order.'''
+        event_size, unpack = self._EVENT.size, self._EVENT.unpack
+        with open(self.name, "rb", buffering=_READ_BUFFER) as run:
+            for _ in range(self.count):
+                filetime, record, source, name_index, bits, size, seq, directory, path_len = unpack(run.read(event_size))
+                yield (filetime, record, source, name_index, bits,
+                       run.read(path_len).decode("utf-8", "surrogatepass"),
+                       None if size == _NO_SIZE else size, seq, directory)
+
+    def remove(self):
+        '''Removes the file'''
+        try:
+            os.remove(self.name)
+        except OSError:
+            _MOD_LOGGER.warning("Temporary file %s could not be removed", self.name)
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(name={self.name}, count={self.count})'
+
+class TimelineBuilder():
+    '''Creates a sorted timeline of a MFT using a bounded amount of memory.
+
+    The events are collected from the MFT and, every time the estimated
+    memory used by them reaches the budget left for them, they are sorted
+    and written to a temporary run file. The budget for the events is
+    ``memory_budget`` minus the memory used to resolve the paths (see
+    ``PathResolver.memory_size``) and the buffers of the run files during
+    the merge (``max_runs`` read buffers and one write buffer). The memory
+    used by the ``MFT`` itself is not part of the budget. At the end, the runs are merged with a
+    heap (if there are more than ``max_runs``, they are first merged in
+    groups). If everything fits in the budget, no file is created.
+
+    The events are tuples with the FILETIME of the event, the record number,
+    the source (``"SI"`` or ``"FN"``), the MACB string, the full path, the
+    size of the unnamed data stream, the sequence number and if it is a
+    directory. They are sorted by time, record, source and name.
+
+    For the best speed, the MFT should be opened with ``create_config``, as
+    only the STANDARD_INFORMATION, the FILE_NAME and the size of the DATA are
+    necessary.
+
+    Args:
+        mft (:obj:`MFT`): The MFT
+        memory_budget (int): Approximated amount of memory, in bytes, used to
+            build the timeline. Default is 256MB.
+        temp_dir (str): Directory for the run files. If ``None``, the default
+            temporary directory is used.
+        max_runs (int): Maximum number of run files merged at the same time
+
+    Attributes:
+        memory_budget (int): Approximated amount of memory used to build the
+            timeline
+        temp_dir (str): Directory for the run files
+        max_runs (int): Maximum number of run files merged at the same time
+    '''
+
+    def __init__(self, mft, memory_budget=256 * 1024 * 1024, temp_dir=None, max_runs=64):
+        '''See class docstring.'''
+        if memory_budget <= 0:
+            raise ValueError(f"The memory budget must be positive, not {memory_budget}")
+        if max_runs < 2:
+            raise ValueError(f"At least two runs must be merged at the same time, not {max_runs}")
+        self._mft = mft
+        self.memory_budget = memory_budget
+        self.temp_dir = temp_dir
+        self.max_runs = max_runs
+
+    @staticmethod
+    def create_config():
+        '''Creates the minimal configuration to build a timeline.
+
+        Returns:
+            :obj:`MFTConfig`: The configuration
+        '''
+        config = MFTConfig()
+        for attr_type in AttrTypes:
+            config._set_load_attr(attr_type, attr_type in (AttrTypes.STANDARD_INFORMATION,
+                                  AttrTypes.ATTRIBUTE_LIST, AttrTypes.FILE_NAME, AttrTypes.DATA))
+        config.load_dataruns = False
+        return config
+
+    def _entry_events(self, entry, resolver):
+        '''Yields the unsorted events of an entry, grouping the timestamps
+        that are equal.'''
+        record, seq = entry.header.mft_record, entry.header.seq_number
+        directory = entry.is_directory
+        stream = entry.get_datastream()
+        size = stream.size if stream is not None else None
+
+        fn_attrs = entry.get_attributes(AttrTypes.FILE_NAME) or []
+        main_fn = entry.get_main_filename_attr()
+        main_path = resolver.path(main_fn.content.parent_ref, main_fn.content.parent_seq,
+                                  main_fn.content.name)[1] if main_fn is not None else None
+
+        sources = []
+        si_attrs = entry.get_attributes(AttrTypes.STANDARD_INFORMATION)
+        if si_attrs and si_attrs[0].content is not None:
+            sources.append((0, 0, si_attrs[0].content.timestamps, main_path))
+        for name_index, fn_attr in enumerate(fn_attrs):
+            content = fn_attr.content
+            if content is not None:
+                path = resolver.path(content.parent_ref, content.parent_seq, content.name)[1]
+                sources.append((1, name_index, content.timestamps, path))
+
+        for source, name_index, timestamps, path in sources:
+            if path is None:
+                path = f"$OrphanFiles\\{record}"
+            grouped = {}
+            for name, bit in _MACB:
+                date = getattr(timestamps, name)
+                if date is not None:
+                    filetime = convert_to_filetime(date)
+                    grouped[filetime] = grouped.get(filetime, 0) | bit
+            for filetime, bits in grouped.items():
+                yield (filetime, record, source, name_index, bits, path, size, seq, directory)
+
+    def _merge(self, runs):
+        '''Merges the runs until there are at most ``max_runs``.'''
+        while len(runs) > self.max_runs:
+            group, runs = runs[:self.max_runs], runs[self.max_runs:]
+            merged = _RunFile(self.temp_dir)
+            merged.write(heapq.merge(*group, key=_sort_key))
+            for run in group:
+                run.remove()
+            runs.append(merged)
+        return runs
+
+    def _events_budget(self, resolver):
+        '''Returns the memory available for the events.'''
+        reserved = resolver.memory_size() + self.max_runs * _READ_BUFFER + _WRITE_BUFFER
+        budget = self.memory_budget - reserved
+        if budget <= 0:
+            raise ValueError(f"The memory budget ({self.memory_budget}) is too small, the paths and "
+                             f"the buffers of the runs need about {reserved} bytes")
+        _MOD_LOGGER.debug("%d bytes reserved, %d bytes for the events", reserved, budget)
+        return budget
+
+    def _sorted_events(self):
+        '''Yields all the events sorted, in the internal format.'''
+        resolver = PathResolver(self._mft)
+        budget = self._events_budget(resolver)
+        runs, chunk, used = [], [], 0
+
+        try:
+            for entry in self._mft:
+                for event in self._entry_events(entry, resolver):
+                    chunk.append(event)
+                    used += _EVENT_OVERHEAD + len(event[5])
+                if used >= budget:
+                    chunk.sort(key=_sort_key)
+                    run = _RunFile(self.temp_dir)
+                    run.write(chunk)
+                    runs.append(run)
+                    _MOD_LOGGER.debug("%s written with %d events", run, run.count)
+                    chunk, used = [], 0
+                    runs = self._merge(runs)
+            #the paths are not needed for the merge
+            del resolver
+
+            chunk.sort(key=_sort_key)
+            if not runs:
+                yield from chunk
+            else:
+                runs = self._merge(runs)
+                yield from heapq.merge(*runs, chunk, key=_sort_key)
+        finally:
+            for run in runs:
+                run.remove()
+
+    def events(self):
+        '''Yields the events of the timeline, sorted by time.
+
+        Returns:
+            tuple(int, int, str, str, str, int, int, bool): The FILETIME of
+                the event, the record number, the source, the MACB string,
+                the full path, the size, the sequence number and if the entry
+                is a directory.
+        '''
+        for filetime, record, source, _, bits, path, size, seq, directory in self._sorted_events():
+            yield (filetime, record, _SOURCES[source], _macb(bits), path, size, seq, directory)
+
+    def write_csv(self, output):
+        '''Writes the timeline as CSV.
+
+        The columns are ``timestamp`` (ISO 8601, UTC), ``macb``, ``source``,
+        ``record``, ``seq_number``, ``directory``, ``size`` and ``path``.
+
+        Args:
+            output (file): File opened in text mode (with ``newline=""``)
+
+        Returns:
+            int: Number of events written
+        '''
+        writer = csv.writer(output)
+        writer.writerow(("timestamp", "macb", "source", "record", "seq_number", "directory", "size", "path"))
+        count = 0
+        for filetime, record, source, macb, path, size, seq, directory in self.events():
+            writer.writerow((convert_filetime(filetime).isoformat(), macb, source, record,
+                             seq, directory, "" if size is None else size, path))
+            count += 1
+        return count
+
+    def write_bodyfile(self, output):
+        '''Writes the timeline in the bodyfile format (TSK 3.x).
+
+        Each event is one line, with the time of the event in the columns of
+        its MACB letters and ``0`` in the others. The names from the
+        FILE_NAME have the ``($FILE_NAME)`` suffix.
+
+        Args:
+            output (file): File opened in text mode
+
+        Returns:
+            int: Number of events written
+        '''
+        count = 0
+        for filetime, record, source, macb, path, size, seq, directory in self.events():
+            seconds = (filetime - _UNIX_EPOCH) // 10000000
+            mtime, atime, ctime, crtime = (seconds if letter != "." else 0 for letter in macb)
+            name = path if source == "SI" else f"{path} ($FILE_NAME)"
+            mode = "d/drwxrwxrwx" if directory else "r/rrwxrwxrwx"
+            output.write(f"0|{name}|{record}-{seq}|{mode}|0|0|{size or 0}|"
+                         f"{atime}|{mtime}|{ctime}|{crtime}\n")
+            count += 1
+        return count
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(memory_budget={self.memory_budget}, '
+                f'temp_dir={self.temp_dir}, max_runs={self.max_runs})'
+               )
@@ -5,7 +5,7 @@ This module contains auxiliar functions to the library.
 import logging
 import itertools
 from datetime import datetime as _datetime, timedelta as _timedelta, timezone
-from collections import Iterable
+from collections.abc import Iterable
 from functools import lru_cache
 
 from libmft.exceptions import FixUpError
@@ -29,6 +29,21 @@ def convert_filetime(filetime):
     #return _datetime(1601, 1, 1) + _timedelta(microseconds=(filetime/10))
     return _BASE_DATE_FILETIME64 + _timedelta(microseconds=(filetime/10))
 
+def convert_to_filetime(date):
+    '''Convert a datetime object to FILETIME64. The inverse of
+    ``convert_filetime``. Dates without a timezone are considered UTC.
+
+    Args:
+        date (datetime) - The date to be converted
+
+    Returns:
+        int: The date as a FILETIME value
+    '''
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=_UTC)
+    delta = date - _BASE_DATE_FILETIME64
+    return (delta.days * 86400 + delta.seconds) * 10000000 + delta.microseconds * 10
+
 def get_file_reference(file_ref):
     '''Convert a 32 bits number into the 2 bytes reference and the 6
     bytes sequence number. The return method is a tuple with the
@@ -100,3 +115,34 @@ def get_file_size(file_object):
     file_object.seek(position, 0)
 
     return file_size
+
+def merge_dataruns(parts):
+    '''Converts the dataruns of a non resident attribute in extents, merging
+    the runs that are contiguous. The attribute can be split in multiple parts,
+    each one starting at a different VCN.
+
+    Args:
+        parts (Iterable) - An Iterable of (start_vcn, runs), sorted by the
+            start VCN, where ``runs`` are the (length, LCN) of each data run,
+            as provided by ``DataRuns``
+
+    Returns:
+        (list(tuple(int, int, int))): A list of (start VCN, LCN, cluster count)
+            of each extent. The LCN is ``None`` if the extent is sparse.
+    '''
+    extents = []
+    last_vcn = last_lcn = last_count = None
+
+    for start_vcn, runs in parts:
+        vcn = start_vcn
+        for length, lcn in runs:
+            if extents and vcn == last_vcn + last_count and \
+                (lcn is last_lcn is None or (lcn is not None and last_lcn is not None and last_lcn + last_count == lcn)):
+                last_count += length
+                extents[-1] = (last_vcn, last_lcn, last_count)
+            else:
+                last_vcn, last_lcn, last_count = vcn, lcn, length
+                extents.append((vcn, lcn, length))
+            vcn += length
+
+    return extents
@@ -0,0 +1,640 @@
+# -*- coding: utf-8 -*-
+'''
+Reads the MFT directly from a raw image of a NTFS volume.
+
+The boot sector of the volume has the cluster size, the size of the MFT
+records and the location of the first cluster of the MFT. The MFT itself is a
+file (record 0, ``$MFT``) and, as any other file, it can be fragmented. The
+location of all its fragments is described by the runlist of the DATA
+attribute in the record 0 and, for very fragmented MFTs, by other records
+referenced by its ATTRIBUTE_LIST.
+
+This module follows the runlist and presents the MFT as one logical stream,
+so the ``MFT`` class can be used without extracting ``$MFT`` first.
+
+.. moduleauthor:: Júlio Dantas <jldantas@gmail.com>
+'''
+import io
+import copy
+import struct
+import logging
+
+from array import array as _array
+from bisect import bisect_right as _bisect_right
+from functools import lru_cache
+
+from libmft.api import MFT, MFTConfig, MFTEntry
+from libmft.attribute import AttributeList
+from libmft.flagsandtypes import AttrTypes
+from libmft.util.functions import merge_dataruns
+from libmft.exceptions import MFTError
+
+_MOD_LOGGER = logging.getLogger(__name__)
+
+
+class BootSector():
+    '''Represents the boot sector of a NTFS volume.
+
+    Note:
+        This class receives an Iterable as argument, the "Parameters/Args" section
+        represents what must be inside the Iterable. The Iterable MUST preserve
+        order or things might go boom.
+
+    Args:
+        content[0] (bytes): OEM id
+        content[1] (int): Bytes per sector
+        content[2] (int): Sectors per cluster
+        content[3] (int): Total number of sectors
+        content[4] (int): Cluster number of the MFT
+        content[5] (int): Cluster number of the MFT mirror
+        content[6] (int): Size of a MFT record, in bytes
+        content[7] (int): Size of a index record, in bytes
+        content[8] (int): Volume serial number
+
+    Attributes:
+        oem_id (bytes): OEM id
+        bytes_per_sector (int): Bytes per sector
+        sectors_per_cluster (int): Sectors per cluster
+        total_sectors (int): Total number of sectors
+        mft_lcn (int): Cluster number of the MFT
+        mftmirr_lcn (int): Cluster number of the MFT mirror
+        mft_record_size (int): Size of a MFT record, in bytes
+        index_record_size (int): Size of a index record, in bytes
+        serial_number (int): Volume serial number
+    '''
+    _REPR = struct.Struct("<3x8sHB26x3Qb3xb3xQ")
+    ''' Jump instruction - 3
+        OEM id - 8 ("NTFS    ")
+        Bytes per sector - 2
+        Sectors per cluster - 1
+        Unused - 26
+        Total sectors - 8
+        MFT cluster number - 8
+        MFT mirror cluster number - 8
+        Clusters per MFT record - 1 (signed)
+        Unused - 3
+        Clusters per index record - 1 (signed)
+        Unused - 3
+        Volume serial number - 8
+    '''
+    _OEM_ID = b"NTFS    "
+
+    __slots__ = ("oem_id", "bytes_per_sector", "sectors_per_cluster",
+        "total_sectors", "mft_lcn", "mftmirr_lcn", "mft_record_size",
+        "index_record_size", "serial_number")
+
+    def __init__(self, content=(None,)*9):
+        '''See class docstring.'''
+        self.oem_id, self.bytes_per_sector, self.sectors_per_cluster, \
+        self.total_sectors, self.mft_lcn, self.mftmirr_lcn, \
+        self.mft_record_size, self.index_record_size, \
+        self.serial_number = content
+
+    @classmethod
+    def get_representation_size(cls):
+        '''Return the size of the boot sector that is interpreted'''
+        return cls._REPR.size
+
+    @classmethod
+    def create_from_binary(cls, binary_view):
+        '''Creates a new object BootSector from a binary stream. The binary
+        stream can be represented by a byte string, bytearray or a memoryview of the
+        bytearray.
+
+        Args:
+            binary_view (memoryview of bytearray) - A binary stream with the
+                information of the boot sector
+
+        Returns:
+            BootSector: New object using the binary stream as source
+        '''
+        return cls.create_from_buffer(binary_view, 0)
+
+    @classmethod
+    def create_from_buffer(cls, buffer, offset):
+        '''Creates a new object BootSector from a buffer, where the boot sector
+        starts at ``offset``.
+
+        Args:
+            buffer (memoryview of bytearray) - A binary stream with the
+                information of the boot sector
+            offset (int) - Where the boot sector starts in the buffer
+
+        Returns:
+            BootSector: New object using the binary stream as source
+        '''
+        oem_id, bytes_per_sector, sectors_per_cluster, total_sectors, mft_lcn, \
+        mftmirr_lcn, clusters_per_record, clusters_per_index, serial_number = \
+            cls._REPR.unpack_from(buffer, offset)
+
+        if oem_id != cls._OEM_ID:
+            raise MFTError("Boot sector doesn't have a NTFS signature.")
+        if not bytes_per_sector or bytes_per_sector & (bytes_per_sector - 1):
+            raise MFTError(f"Invalid number of bytes per sector ({bytes_per_sector}).")
+        #big clusters have the number of sectors stored as a power of 2
+        if sectors_per_cluster > 0x80:
+            sectors_per_cluster = 1 << (256 - sectors_per_cluster)
+        cluster_size = bytes_per_sector * sectors_per_cluster
+
+        nw_obj = cls((oem_id, bytes_per_sector, sectors_per_cluster, total_sectors,
+            mft_lcn, mftmirr_lcn, cls._record_size(clusters_per_record, cluster_size),
+            cls._record_size(clusters_per_index, cluster_size), serial_number))
+
+        return nw_obj
+
+    @staticmethod
+    def _record_size(clusters_per_record, cluster_size):
+        '''A negative number of clusters means the size is 2^(-n) bytes'''
+        if clusters_per_record < 0:
+            return 1 << -clusters_per_record
+        return clusters_per_record * cluster_size
+
+    def _get_cluster_size(self):
+        return self.bytes_per_sector * self.sectors_per_cluster
+
+    cluster_size = property(_get_cluster_size, doc="Size of a cluster, in bytes")
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(oem_id={self.oem_id},'
+                f'bytes_per_sector={self.bytes_per_sector},sectors_per_cluster={self.sectors_per_cluster},'
+                f'total_sectors={self.total_sectors},mft_lcn={self.mft_lcn},'
+                f'mftmirr_lcn={self.mftmirr_lcn},mft_record_size={self.mft_record_size},'
+                f'index_record_size={self.index_record_size},serial_number={self.serial_number})'
+               )
+
+
+class NonResidentStream(io.RawIOBase):
+    '''A read only, seekable, file like object over the content of a non
+    resident attribute.
+
+    The content is described by extents, where the contiguous runs are
+    already merged, so a read that spans multiple runs is done with the least
+    amount of read calls. The extent of a position is found by a binary search
+    over the start VCNs. Sparse extents, parts of the stream without extents
+    and the content after the initialized size are read as zeros.
+
+    Reads smaller than a cluster go through a cache of the most recently used
+    clusters, so parsing small structures out of the stream doesn't hit the
+    image every time.
+
+    Args:
+        file_pointer (file): The image of the volume, opened in binary mode
+        extents (list(tuple(int, int, int))): The extents, in order, as
+            provided by ``merge_dataruns``. Each element is the (start VCN,
+            LCN, cluster count) of an extent, where the LCN is ``None`` if the
+            extent is sparse
+        cluster_size (int): Size of a cluster, in bytes
+        size (int): Logical size of the stream, in bytes
+        volume_offset (int): Where the volume starts in the image, in bytes
+        init_size (int): Initialized size of the stream, in bytes. If ``None``,
+            the whole stream is considered initialized
+        cache_clusters (int): Number of clusters kept in the cache. ``0``
+            disables the cache
+
+    Attributes:
+        size (int): Logical size of the stream, in bytes
+        init_size (int): Initialized size of the stream, in bytes
+        cluster_size (int): Size of a cluster, in bytes
+    '''
+    def __init__(self, file_pointer, extents, cluster_size, size, volume_offset=0,
+                 init_size=None, cache_clusters=64):
+        '''See class docstring.'''
+        super().__init__()
+        self._fp = file_pointer
+        self._volume_offset = volume_offset
+        self.cluster_size = cluster_size
+        self.size = size
+        self.init_size = size if init_size is None else min(init_size, size)
+        self._position = 0
+        self._read_cluster = lru_cache(cache_clusters)(self._read_cluster_from_image) if cache_clusters else None
+        self._extents = extents
+        self._vcns = _array("Q", (extent[0] for extent in extents))
+        self._total_clusters = extents[-1][0] + extents[-1][2] if extents else 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence ({whence})")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._position = position
+        return position
+
+    def tell(self):
+        return self._position
+
+    def _read_cluster_from_image(self, lcn):
+        '''Reads one cluster from the image'''
+        self._fp.seek(self._volume_offset + lcn * self.cluster_size)
+        cluster = self._fp.read(self.cluster_size)
+        if len(cluster) != self.cluster_size:
+            raise MFTError(f"Image ended before the end of the stream (cluster {lcn}).")
+        return cluster
+
+    def readinto(self, buffer):
+        '''Reads the content of the stream into ``buffer``. Returns the
+        number of bytes read.'''
+        view = memoryview(buffer).cast("B")
+        cluster_size = self.cluster_size
+        init_size = min(self.init_size, self._total_clusters * cluster_size)
+        total = min(len(view), max(self.size - self._position, 0))
+        done = 0
+
+        while done < total:
+            position = self._position + done
+            if position >= init_size:
+                #not initialized or not covered by the runlist
+                view[done:total] = bytes(total - done)
+                done = total
+                break
+            index = _bisect_right(self._vcns, position // cluster_size) - 1
+            vcn, lcn, count = self._extents[index] if index >= 0 else (0, None, 0)
+            extent_start, extent_end = vcn * cluster_size, (vcn + count) * cluster_size
+            if position >= extent_end:
+                #not covered by any extent, goes until the next one
+                lcn = None
+                chunk = min(total - done, self._vcns[index+1] * cluster_size - position)
+            else:
+                chunk = min(total - done, extent_end - position, init_size - position)
+            if lcn is None:
+                view[done:done+chunk] = bytes(chunk)
+            elif chunk < cluster_size and self._read_cluster is not None:
+                cluster_offset = position % cluster_size
+                chunk = min(chunk, cluster_size - cluster_offset)
+                cluster = self._read_cluster(lcn + (position - extent_start) // cluster_size)
+                view[done:done+chunk] = cluster[cluster_offset:cluster_offset+chunk]
+            else:
+                self._fp.seek(self._volume_offset + lcn * cluster_size + position - extent_start)
+                read = self._fp.readinto(view[done:done+chunk])
+                if read != chunk:
+                    raise MFTError(f"Image ended before the end of the stream (position {position}).")
+            done += chunk
+        view.release()
+
+        self._position += done
+        return done
+
+    def __len__(self):
+        return self.size
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(size={self.size}, init_size={self.init_size}, '
+                f'cluster_size={self.cluster_size}, extents={self._extents})')
+
+
+class NTFSVolume():
+    '''Represents a NTFS volume in a raw image (dd).
+
+    The boot sector is read to find the record 0 and the runlist of ``$MFT``
+    is followed, including the parts referenced by the ATTRIBUTE_LIST. The
+    resulting stream is given to a ``MFT`` object. The ``$MFT:$BITMAP`` is
+    loaded the same way, so records that are not allocated can be skipped.
+
+    Args:
+        file_pointer (file): The image, opened in binary mode
+        mft_config (:obj:`MFTConfig`): Configuration for the library. If the
+            entry size is not set, the size from the boot sector is used.
+        volume_offset (int): Where the volume starts in the image, in bytes.
+            Should be used if the image is from a whole disk.
+
+    Attributes:
+        file_pointer (file): The image
+        volume_offset (int): Where the volume starts in the image, in bytes
+        boot_sector (:obj:`BootSector`): The boot sector of the volume
+        cluster_size (int): Size of a cluster, in bytes
+        mft_stream (:obj:`NonResidentStream`): The content of ``$MFT``
+        mft (:obj:`MFT`): The MFT of the volume
+    '''
+    _MFT_CONFIG = MFTConfig()
+    '''Configuration used to read the record 0, everything is loaded'''
+
+    def __init__(self, file_pointer, mft_config=MFTConfig(), volume_offset=0):
+        '''See class docstring.'''
+        self.file_pointer = file_pointer
+        self.volume_offset = volume_offset
+
+        buffer = bytearray(BootSector.get_representation_size())
+        file_pointer.seek(volume_offset)
+        if file_pointer.readinto(buffer) != len(buffer):
+            raise MFTError("Image is too small to have a boot sector.")
+        self.boot_sector = BootSector.create_from_binary(buffer)
+        self.cluster_size = self.boot_sector.cluster_size
+        _MOD_LOGGER.info("Volume boot sector: %s", self.boot_sector)
+
+        mft_entry = self._load_mft_entry()
+        self.mft_stream = self._open_datastream(mft_entry.get_datastream())
+        bitmap_stream = None
+        if mft_entry.has_attribute(AttrTypes.BITMAP):
+            bitmap_stream = self._open_attribute([attr for attr in mft_entry.get_attributes(AttrTypes.BITMAP)
+                                                  if not attr.header.attr_name])
+
+        if not mft_config.entry_size:
+            mft_config = copy.copy(mft_config)
+            mft_config.entry_size = self.boot_sector.mft_record_size
+        self.mft = MFT(self.mft_stream, mft_config, bitmap_stream)
+
+    def _read_record(self, stream, record_number):
+        '''Reads and interprets one record of the MFT'''
+        record_size = self.boot_sector.mft_record_size
+        buffer = bytearray(record_size)
+
+        stream.seek(record_number * record_size)
+        if stream.readinto(buffer) != record_size:
+            raise MFTError(f"Record {record_number} of $MFT is outside of the known runlist.")
+        entry = MFTEntry.create_from_binary(self._MFT_CONFIG, buffer, record_number)
+        if entry is None:
+            raise MFTError(f"Record {record_number} of $MFT is empty.")
+
+        return entry
+
+    def _open_datastream(self, datastream):
+        '''Returns a stream with the content of a non resident datastream'''
+        if datastream is None or datastream.is_resident:
+            raise MFTError("Record 0 ($MFT) has no non resident DATA attribute.")
+
+        return datastream.open(self)
+
+    def _open_attribute(self, attrs):
+        '''Returns a stream with the content of a non resident attribute
+        that can be split in multiple parts.'''
+        size, init_size, parts = 0, 0, []
+
+        for attr in sorted(attrs, key=lambda a: a.header.start_vcn):
+            if not attr.header.non_resident:
+                raise MFTError("Only non resident attributes can be opened.")
+            if not attr.header.start_vcn:
+                size, init_size = attr.header.curr_sstream, attr.header.init_sstream
+            parts.append((attr.header.start_vcn, attr.header.data_runs))
+
+        return NonResidentStream(self.file_pointer, merge_dataruns(parts), self.cluster_size,
+            size, self.volume_offset, init_size)
+
+    def _load_mft_entry(self):
+        '''Loads the record 0 (``$MFT``) and merges the records referenced by
+        its ATTRIBUTE_LIST, so the whole runlist is known.
+
+        Returns:
+            :obj:`MFTEntry`: The entry of ``$MFT``
+        '''
+        record_size = self.boot_sector.mft_record_size
+        boot_stream = NonResidentStream(self.file_pointer,
+            [(0, self.boot_sector.mft_lcn, -(-record_size // self.cluster_size))],
+            self.cluster_size, record_size, self.volume_offset)
+        mft_entry = self._read_record(boot_stream, 0)
+
+        if mft_entry.has_attribute(AttrTypes.ATTRIBUTE_LIST):
+            attr = mft_entry.get_attributes(AttrTypes.ATTRIBUTE_LIST)[0]
+            if attr.header.non_resident:
+                attr_list = AttributeList.create_from_binary(
+                    memoryview(self._open_attribute([attr]).read()))
+            else:
+                attr_list = attr.content
+            records = sorted({entry.file_ref for entry in attr_list
+                              if entry.attr_type in (AttrTypes.DATA, AttrTypes.BITMAP) and entry.file_ref})
+            #the records are read using the part of the runlist that is already
+            #known, Windows keeps them in the first fragment of the MFT
+            for record_number in records:
+                _MOD_LOGGER.debug("Loading $MFT extension record %d", record_number)
+                stream = self._open_datastream(mft_entry.get_datastream())
+                mft_entry.merge_entries(self._read_record(stream, record_number))
+
+        return mft_entry
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return (f'{self.__class__.__name__}(volume_offset={self.volume_offset}, '
+                f'boot_sector={self.boot_sector}, mft_stream={self.mft_stream})')
+
+
+class _IntervalTree():
+    '''Centered interval tree of half-open intervals.
+
+    Each node has a center, the intervals that contain it (sorted by start
+    and by end) and the subtrees with the intervals that are completely to
+    the left and to the right of the center. Finding the intervals that
+    overlap a range is O(log n + k).
+
+    Args:
+        intervals (list(tuple(int, int, int))): The intervals as tuples of
+            (start, end, value), sorted by start
+    '''
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, intervals):
+        '''See class docstring.'''
+        self._size = len(intervals)
+        self._root = self._build(intervals)
+
+    @classmethod
+    def _build(cls, intervals):
+        '''Builds a node and its subtrees. The node is a tuple of (center,
+        intervals by start, intervals by end, left, right).'''
+        if not intervals:
+            return None
+        #the median start is inside at least one interval, so every node
+        #takes at least one interval and no side gets more than half of them
+        center = intervals[len(intervals) // 2][0]
+        left, right, by_start = [], [], []
+        for interval in intervals:
+            if interval[1] <= center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                by_start.append(interval)
+        by_end = sorted(by_start, key=lambda interval: interval[1], reverse=True)
+        return (center, by_start, by_end, cls._build(left), cls._build(right))
+
+    def overlap(self, start, end):
+        '''Returns the intervals that overlap the range [start, end).
+
+        Returns:
+            list(tuple(int, int, int)): The intervals, in no particular order
+        '''
+        result = []
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+            center, by_start, by_end, left, right = node
+            if end <= center:
+                for interval in by_start:
+                    if interval[0] >= end:
+                        break
+                    result.append(interval)
+                nodes.append(left)
+            elif start > center:
+                for interval in by_end:
+                    if interval[1] <= start:
+                        break
+                    result.append(interval)
+                nodes.append(right)
+            else:
+                result.extend(by_start)
+                nodes.append(left)
+                nodes.append(right)
+        return result
+
+    def __len__(self):
+        '''Returns the number of intervals in the tree'''
+        return self._size
+
+class ClusterMap():
+    '''Maps the clusters of the volume to the entries that own them.
+
+    All the non resident attributes of the entries (datastreams, indexes,
+    bitmaps, etc.) are converted to extents and sorted by their first cluster.
+    The extents that do not overlap (normally all the extents of the entries
+    in use) are kept in sorted arrays and found by binary search. Extents can
+    overlap when deleted entries are included; these are kept in an interval
+    tree, so finding the owners of a cluster is O(log n + k) in both cases
+    and all the owners are returned.
+
+    The owners are returned as tuples of (entry number, attribute type,
+    attribute name, VCN), where the VCN is the position of the cluster inside
+    the attribute.
+
+    Args:
+        mft (:obj:`MFT`): The MFT of the volume. The dataruns must have been
+            loaded (``MFTConfig.load_dataruns``)
+        include_deleted (bool): If ``True``, the entries that are not in use
+            are also mapped
+
+    Attributes:
+        mft (:obj:`MFT`): The MFT of the volume
+    '''
+    def __init__(self, mft, include_deleted=False):
+        '''See class docstring.'''
+        if not mft.mft_config.load_dataruns:
+            raise MFTError("The dataruns must be loaded to map the clusters.")
+        self.mft = mft
+        extents = []
+
+        for entry in mft:
+            if entry.is_deleted and not include_deleted:
+                continue
+            self._add_entry(extents, entry)
+        #the entries in use go first, so they are the ones kept in the arrays
+        extents.sort(key=lambda extent: (extent[0], extent[6]))
+
+        self._starts, self._ends, self._indexes = _array("Q"), _array("Q"), _array("Q")
+        overlapping = []
+        last_end = 0
+        for index, extent in enumerate(extents):
+            if extent[0] >= last_end:
+                self._starts.append(extent[0])
+                self._ends.append(extent[1])
+                self._indexes.append(index)
+                last_end = extent[1]
+            else:
+                overlapping.append((extent[0], extent[1], index))
+        self._owners = [extent[2:6] for extent in extents]
+        self._overlapping = _IntervalTree(overlapping)
+        _MOD_LOGGER.info("Cluster map created with %d extents (%d overlapping)", len(extents), len(overlapping))
+
+    @staticmethod
+    def _add_entry(extents, entry):
+        '''Adds the extents of all non resident attributes of an entry'''
+        number, deleted = entry.header.mft_record, entry.is_deleted
+        parts = {}
+
+        for stream in entry.data_streams:
+            if not stream.is_resident:
+                for vcn, lcn, count in stream.extents:
+                    if lcn is not None:
+                        extents.append((lcn, lcn + count, vcn, number, AttrTypes.DATA, stream.name, deleted))
+        for attrs in entry.attrs.values():
+            for attr in attrs:
+                header = attr.header
+                if header.non_resident and header.data_runs is not None:
+                    parts.setdefault((header.attr_type_id, header.attr_name), []).append(
+                        (header.start_vcn, header.data_runs))
+        for (attr_type, name), attr_parts in parts.items():
+            attr_parts.sort(key=lambda part: part[0])
+            for vcn, lcn, count in merge_dataruns(attr_parts):
+                if lcn is not None:
+                    extents.append((lcn, lcn + count, vcn, number, attr_type, name, deleted))
+
+    def find_range(self, lcn, count=1):
+        '''Returns the owners of the clusters in a range.
+
+        Args:
+            lcn (int): The first cluster of the range
+            count (int): Number of clusters in the range
+
+        Returns:
+            list(tuple(int, AttrTypes, str, int)): The owners of the range. The
+                VCN is the position of the first owned cluster of the range
+        '''
+        end = lcn + count
+        starts, ends, indexes = self._starts, self._ends, self._indexes
+        found = []
+
+        #the extents in the arrays do not overlap, so the ends are sorted too
+        index = _bisect_right(starts, end - 1) - 1
+        while index >= 0 and ends[index] > lcn:
+            found.append((starts[index], indexes[index]))
+            index -= 1
+        if len(self._overlapping):
+            found.extend((start, index) for start, _, index in self._overlapping.overlap(lcn, end))
+        found.sort()
+
+        owners = []
+        for start, index in found:
+            vcn, number, attr_type, name = self._owners[index]
+            owners.append((number, attr_type, name, vcn + max(lcn - start, 0)))
+        return owners
+
+    def find(self, lcn):
+        '''Returns the owners of a cluster.
+
+        Args:
+            lcn (int): The cluster
+
+        Returns:
+            list(tuple(int, AttrTypes, str, int)): The owners of the cluster,
+                normally only one. An empty list if the cluster is not used
+        '''
+        return self.find_range(lcn, 1)
+
+    def find_many(self, lcns):
+        '''Returns the owners of multiple clusters.
+
+        Args:
+            lcns (Iterable of int): The clusters
+
+        Returns:
+            list(list(tuple(int, AttrTypes, str, int))): The owners of each
+                cluster, in the same order as the input
+        '''
+        find_range = self.find_range
+        return [find_range(lcn, 1) for lcn in lcns]
+
+    def __contains__(self, lcn):
+        '''Checks if a cluster is used by any entry'''
+        index = _bisect_right(self._starts, lcn) - 1
+        if index >= 0 and self._ends[index] > lcn:
+            return True
+        return bool(len(self._overlapping) and self._overlapping.overlap(lcn, lcn + 1))
+
+    def __len__(self):
+        '''Returns the number of extents in the map'''
+        return len(self._owners)
+
+    def __repr__(self):
+        'Return a nicely formatted representation string'
+        return f'{self.__class__.__name__}(extents={len(self._owners)})'
@@ -5,6 +5,7 @@ import logging
 import libmft.api
 from libmft.flagsandtypes import AttrTypes, FileInfoFlags, MftUsageFlags
 from libmft.exceptions import EntryError
+from libmft.query import plan_query
 
 _MOD_LOGGER = logging.getLogger("libmft")
 sh = logging.StreamHandler()
@@ -78,18 +79,10 @@ def test_my_mft():
     #test = "../../MFT_C.bin"
     #test = "../../my_mft.bin"
     test = "c:/cases/my_mft.bin"
-    mft_config = libmft.api.MFTConfig()
-    mft_config.load_dataruns = False
-    mft_config.load_object_id = False
-    mft_config.load_sec_desc = False
-    mft_config.load_idx_root = False
-    mft_config.load_idx_alloc = False
-    mft_config.load_bitmap = False
-    mft_config.load_reparse = False
-    mft_config.load_ea_info = False
-    mft_config.load_ea = False
-    mft_config.load_log_tool_str = False
-    mft_config.load_attr_list = False
+    #the plan finds the cheapest way to read the columns and the MFTConfig
+    #for it, no need to disable the load_* options one by one
+    plan = plan_query(["record", "path", "size", "si.created", "si.changed", "deleted"])
+    print(plan.explain())
 
     '''Entries to play:
         my_mft/75429 - datastream (multiple data attributes accross many entries)
@@ -98,18 +91,10 @@ def test_my_mft():
     '''
 
     with open(test, "rb") as mft_file:
-        #mft = libmft.api.MFT(mft_file)
-        mft = libmft.api.MFT(mft_file, mft_config)
-        #print(mft[75429])
-        for entry in mft:
-            # if entry.has_attribute(AttrTypes.REPARSE_POINT):
-            #     attrs = entry.get_attributes(AttrTypes.REPARSE_POINT)
-            #     for attr in attrs:
-            #         try:
-            #             print(entry.header.mft_record, str(attr.content.reparse_type), "\n", attr.content.data.target_name, attr.content.data.print_name)
-            #         except AttributeError as e:
-            #             pass
-            #     print("*"*80)
+        mft = plan.open(mft_file)
+        for record, path, size, created, changed, deleted in plan.rows(mft):
+            # if size is not None and size > 100 * 1024 * 1024:
+            #     print(record, path, size, created, changed, deleted)
             pass
 
 
@@ -22,4 +22,8 @@ setup(
     keywords = "mft parser library python",
     python_requires = ">=3.6",
     packages = find_packages(exclude=['contrib', 'docs', 'tests*']),
+    extras_require = {
+        "zstd": ["zstandard"],
+        "lz4": ["lz4"],
+    },
 )
@@ -4,7 +4,7 @@ import datetime
 #import libmft.api
 #from libmft.flagsandtypes import AttrTypes, FileInfoFlags, MftUsageFlags
 
-from libmft.attrcontent import Timestamps, StandardInformation, FileName
+from libmft.attribute import Timestamps, StandardInformation, FileName
 from libmft.util.functions import convert_filetime
 from libmft.exceptions import *
 
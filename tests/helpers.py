@@ -0,0 +1,119 @@
+'''Functions shared by the tests to load the samples and to create MFTs with
+situations that are not in the samples.'''
+import os
+import glob
+import struct
+
+SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "..", "mft_samples")
+SAMPLES = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.bin")))
+RECORD_SIZE = 1024
+
+_IN_USE = 0x1
+_DIRECTORY = 0x2
+
+def read_sample(name):
+    '''Returns the content of a sample'''
+    with open(os.path.join(SAMPLES_DIR, name), "rb") as mft_file:
+        return mft_file.read()
+
+def _remove_fixup(record):
+    '''Returns a copy of the record with the fix up array applied'''
+    record = bytearray(record)
+    offset, count = struct.unpack_from("<2H", record, 4)
+    for i in range(1, count):
+        record[i*512-2:i*512] = record[offset+2*i:offset+2*i+2]
+    return record
+
+def _add_fixup(record):
+    '''Returns a copy of the record protected by the fix up array'''
+    record = bytearray(record)
+    offset, count = struct.unpack_from("<2H", record, 4)
+    usn = record[offset:offset+2]
+    for i in range(1, count):
+        record[offset+2*i:offset+2*i+2] = record[i*512-2:i*512]
+        record[i*512-2:i*512] = usn
+    return bytes(record)
+
+def _attributes(record):
+    '''Returns the (type, offset, length) of the attributes of a record'''
+    offset, attributes = struct.unpack_from("<H", record, 20)[0], []
+    while True:
+        attr_type, length = struct.unpack_from("<2I", record, offset)
+        if attr_type == 0xFFFFFFFF:
+            return attributes
+        attributes.append((attr_type, offset, length))
+        offset += length
+
+def move_to_extension(data, attr_type=0x80, count=4):
+    '''Moves the first resident unnamed attribute of a type (DATA by default)
+    of some base records to a free record (an extension record) and adds an
+    ATTRIBUTE_LIST to the base records pointing to it, as NTFS does when a
+    record is full.
+
+    Every other change, the base record (if it is not a directory) is also
+    moved to the last free record and the extension record takes its place,
+    so some extension records come before their base records.
+
+    Args:
+        data (bytes): The MFT
+        attr_type (int): Type of the attribute moved
+        count (int): Number of base records changed
+
+    Returns:
+        tuple(bytes, dict(int : int)): The new MFT and the extension record of
+            each changed base record
+    '''
+    data = bytearray(data)
+    records = [_remove_fixup(data[i*RECORD_SIZE:(i+1)*RECORD_SIZE])
+               if data[i*RECORD_SIZE:i*RECORD_SIZE+4] == b"FILE" else None
+               for i in range(len(data) // RECORD_SIZE)]
+    in_use = lambda record: record is not None and struct.unpack_from("<H", record, 22)[0] & _IN_USE
+    free = [i for i in range(24, len(records)) if not in_use(records[i])]
+    moved = {}
+
+    for number in range(30, len(records)):
+        record, base = records[number], number
+        if len(moved) >= count or not free:
+            break
+        if not in_use(record) or struct.unpack_from("<Q", record, 32)[0]:
+            continue
+        attributes = _attributes(record)
+        candidates = [attr for attr in attributes if attr[0] == attr_type and not record[attr[1]+8] and not record[attr[1]+9]]
+        if not candidates:
+            continue
+        _, moved_offset, moved_length = candidates[0]
+        first_attr = struct.unpack_from("<H", record, 20)[0]
+        extension = free[-1]
+        if len(moved) % 2 and not struct.unpack_from("<H", record, 22)[0] & _DIRECTORY:
+            base, extension = extension, base
+
+        ext_record = bytearray(record[:first_attr]) + bytearray(RECORD_SIZE - first_attr)
+        ext_record[first_attr:first_attr+moved_length] = record[moved_offset:moved_offset+moved_length]
+        ext_record[first_attr+moved_length:first_attr+moved_length+8] = b"\xFF\xFF\xFF\xFF" + bytes(4)
+        seq_number = struct.unpack_from("<H", record, 16)[0]
+        struct.pack_into("<HI", ext_record, 22, _IN_USE, first_attr + moved_length + 8)
+        struct.pack_into("<Q", ext_record, 32, base | (seq_number << 48))
+        struct.pack_into("<I", ext_record, 44, extension)
+
+        list_entry = struct.pack("<IHBBQQH6x", attr_type, 32, 0, 0x1A, 0, extension | (seq_number << 48), 0)
+        attr_list = struct.pack("<2I2B3HIH2B", 0x20, 24 + len(list_entry), 0, 0, 0x18, 0, 99,
+                                len(list_entry), 0x18, 0, 0) + list_entry
+        parts = [record[offset:offset+length] for _, offset, length in attributes if offset != moved_offset]
+        parts.append(attr_list)
+        parts.sort(key=lambda part: struct.unpack_from("<I", part)[0])
+        body = b"".join(parts) + b"\xFF\xFF\xFF\xFF" + bytes(4)
+        if first_attr + len(body) > RECORD_SIZE - 8:
+            continue
+        base_record = bytearray(record[:first_attr]) + body
+        base_record += bytearray(RECORD_SIZE - len(base_record))
+        struct.pack_into("<I", base_record, 24, first_attr + len(body))
+        struct.pack_into("<I", base_record, 44, base)
+
+        records[base], records[extension] = base_record, ext_record
+        free.pop()
+        moved[base] = extension
+
+    for i, record in enumerate(records):
+        if record is not None:
+            data[i*RECORD_SIZE:(i+1)*RECORD_SIZE] = _add_fixup(record)
+    return bytes(data), moved
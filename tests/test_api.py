@@ -0,0 +1,555 @@
+import io
+import asyncio
+import itertools
+import operator
+import os
+import random
+import threading
+import unittest
+
+from collections import Counter
+
+from libmft.api import MFT, MFTConfig, StreamingMFT, TimestampIndex, HeaderFilter, Projection
+from libmft.attribute import FileName, Bitmap
+from libmft.flagsandtypes import AttrTypes, MftUsageFlags
+
+from tests.helpers import SAMPLES, RECORD_SIZE, read_sample, move_to_extension
+
+class _Pipe(io.RawIOBase):
+    '''Non seekable file that returns the data in chunks of random size'''
+    def __init__(self, data):
+        self._data, self._position = data, 0
+        self._random = random.Random(len(data))
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._random.randint(1, 3000), len(self._data) - self._position)
+        buffer[:size] = self._data[self._position:self._position+size]
+        self._position += size
+        return size
+
+def _config(load_attr_list=True):
+    config = MFTConfig()
+    config.load_attr_list = load_attr_list
+    return config
+
+class TestStreamingMFT(unittest.TestCase):
+    def test_samples(self):
+        for sample in SAMPLES:
+            with open(sample, "rb") as mft_file:
+                data = mft_file.read()
+            with self.subTest(sample=os.path.basename(sample)):
+                expected = sorted(repr(entry) for entry in MFT(io.BytesIO(data)))
+                self.assertEqual(sorted(repr(entry) for entry in StreamingMFT(_Pipe(data))), expected)
+
+    def test_extension_records(self):
+        data, moved = move_to_extension(read_sample("MFT_simplefs.bin"))
+        self.assertTrue(any(extension < base for base, extension in moved.items()))
+        self.assertTrue(any(extension > base for base, extension in moved.items()))
+        for load_attr_list in (True, False):
+            with self.subTest(load_attr_list=load_attr_list):
+                expected = sorted(repr(entry) for entry in MFT(io.BytesIO(data), _config(load_attr_list)))
+                streaming = StreamingMFT(_Pipe(data), _config(load_attr_list))
+                entries, yielded_at = [], {}
+                for entry in streaming:
+                    entries.append(repr(entry))
+                    yielded_at[entry.header.mft_record] = streaming.records_read
+                self.assertEqual(sorted(entries), expected)
+                for base, extension in moved.items():
+                    #the entry is returned as soon as both records are read
+                    self.assertEqual(yielded_at[base], max(base, extension) + 1)
+                    self.assertNotIn(extension, yielded_at)
+
+def _reference_timestamps(mft, which):
+    '''Returns the (datetime, record number) of a timestamp of all the
+    entries, read from the entries themselves.'''
+    prefix, _, name = which.partition(".")
+    values = []
+    for entry in mft:
+        if prefix == "si":
+            attrs = entry.get_attributes(AttrTypes.STANDARD_INFORMATION) or []
+        elif prefix == "fn":
+            main = entry.get_main_filename_attr()
+            attrs = [main] if main is not None else []
+        else:
+            attrs = entry.get_attributes(AttrTypes.FILE_NAME) or []
+        values.extend((getattr(attr.content.timestamps, name), entry.header.mft_record) for attr in attrs)
+    return values
+
+class TestTimestampIndex(unittest.TestCase):
+    def _check(self, data, prepass=True):
+        config = MFTConfig()
+        config.create_initial_information = prepass
+        mft = MFT(io.BytesIO(data), config)
+        mft.build_timestamp_index()
+        for which in TimestampIndex.TIMESTAMPS:
+            self.assertIn(which, mft.timestamp_index)
+            reference = _reference_timestamps(MFT(io.BytesIO(data)), which)
+            self.assertEqual(Counter(mft.between(which=which)), Counter(record for _, record in reference))
+            for value in {value for value, _ in reference}:
+                self.assertEqual(sorted(mft.between(value, value, which)),
+                                 sorted(record for time, record in reference if time == value))
+            if reference:
+                ordered = sorted(reference)
+                self.assertEqual(sorted(mft.between(end=ordered[0][0], which=which)),
+                                 sorted(record for time, record in reference if time == ordered[0][0]))
+
+    def test_samples(self):
+        for sample in SAMPLES:
+            with open(sample, "rb") as mft_file:
+                data = mft_file.read()
+            with self.subTest(sample=os.path.basename(sample)):
+                self._check(data)
+
+    def test_extension_records(self):
+        for attr_type in (AttrTypes.FILE_NAME, AttrTypes.STANDARD_INFORMATION):
+            data, moved = move_to_extension(read_sample("MFT_simplefs.bin"), attr_type.value)
+            self.assertTrue(moved)
+            for prepass in (True, False):
+                with self.subTest(attr_type=attr_type, prepass=prepass):
+                    self._check(data, prepass)
+
+    def test_unknown_timestamp(self):
+        with self.assertRaises(ValueError):
+            MFT(io.BytesIO(read_sample("MFT_simplefs.bin"))).build_timestamp_index(["si.bogus"])
+
+def _names(entries):
+    '''Returns the objects of the names of the entries, by value'''
+    names = {}
+    for entry in entries:
+        for attr in itertools.chain.from_iterable(entry.attrs.values()):
+            if attr.header.attr_name is not None:
+                names.setdefault(attr.header.attr_name, {})[id(attr.header.attr_name)] = attr
+            if attr.header.attr_type_id is AttrTypes.FILE_NAME:
+                names.setdefault(attr.content.name, {})[id(attr.content.name)] = attr
+            elif attr.header.attr_type_id is AttrTypes.INDEX_ROOT:
+                for index_entry in attr.content.index_entry_list:
+                    if isinstance(index_entry.content, FileName):
+                        name = index_entry.content.name
+                        names.setdefault(name, {})[id(name)] = attr
+    return names
+
+class TestInternNames(unittest.TestCase):
+    def test_names_shared(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=os.path.basename(sample)):
+                entries = list(MFT(io.BytesIO(read_sample(sample))))
+                for name, objects in _names(entries).items():
+                    self.assertEqual(len(objects), 1, name)
+
+    def test_disabled(self):
+        config = MFTConfig()
+        config.intern_names = False
+        entries = list(MFT(io.BytesIO(read_sample("MFT_simplefs.bin")), config))
+        interned = list(MFT(io.BytesIO(read_sample("MFT_simplefs.bin"))))
+        self.assertEqual([repr(entry) for entry in entries], [repr(entry) for entry in interned])
+        self.assertTrue(any(len(objects) > 1 for objects in _names(entries).values()))
+
+class _ReadLog(io.BytesIO):
+    '''In memory file that keeps the record numbers read'''
+    def __init__(self, data):
+        super().__init__(data)
+        self.records = set()
+
+    def readinto(self, buffer):
+        start = self.tell()
+        read = super().readinto(buffer)
+        self.records.update(range(start // RECORD_SIZE, (start + read + RECORD_SIZE - 1) // RECORD_SIZE))
+        return read
+
+def _in_use_bitmap(data, cleared=()):
+    '''Returns a $MFT:$BITMAP built from the flags of the records, without
+    the records in ``cleared``'''
+    bitmap = bytearray((len(data) // RECORD_SIZE + 7) // 8 + 8)
+    for number in range(len(data) // RECORD_SIZE):
+        record = data[number*RECORD_SIZE:(number+1)*RECORD_SIZE]
+        if record[:4] == b"FILE" and record[22] & 0x1 and number not in cleared:
+            bitmap[number // 8] |= 1 << (number % 8)
+    return bytes(bitmap)
+
+def _skip_config(skip_unallocated=True, read_ahead=0):
+    config = MFTConfig()
+    config.skip_unallocated = skip_unallocated
+    config.read_ahead = read_ahead
+    return config
+
+class TestSkipUnallocated(unittest.TestCase):
+    def test_same_entries(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            expected = [repr(entry) for entry in MFT(io.BytesIO(data)) if not entry.is_deleted]
+            for read_ahead in (0, 2):
+                with self.subTest(sample=os.path.basename(sample), read_ahead=read_ahead):
+                    mft = MFT(io.BytesIO(data), _skip_config(True, read_ahead), io.BytesIO(_in_use_bitmap(data)))
+                    self.assertEqual([repr(entry) for entry in mft], expected)
+
+    def test_free_not_read(self):
+        data = read_sample("MFT_simplefs.bin")
+        in_use = [entry.header.mft_record for entry in MFT(io.BytesIO(data)) if not entry.is_deleted]
+        cleared = set(in_use[-3:])
+        for read_ahead in (0, 2):
+            with self.subTest(read_ahead=read_ahead):
+                log = _ReadLog(data)
+                mft = MFT(log, _skip_config(True, read_ahead), io.BytesIO(_in_use_bitmap(data, cleared)))
+                log.records.clear()
+                self.assertEqual([entry.header.mft_record for entry in mft], in_use[:-3])
+                self.assertFalse(log.records & cleared)
+                self.assertTrue(log.records)
+
+    def test_bitmap_lazy(self):
+        data = read_sample("MFT_simplefs.bin")
+        mft = MFT(io.BytesIO(data), bitmap_file_pointer=io.BytesIO(_in_use_bitmap(data)))
+        self.assertFalse(mft._bitmap_loaded)
+        list(mft)
+        self.assertFalse(mft._bitmap_loaded)
+        self.assertIsInstance(mft.bitmap, Bitmap)
+        self.assertTrue(mft._bitmap_loaded)
+
+    def test_not_resident(self):
+        #the samples have a non resident $MFT:$BITMAP, so everything is read
+        data = read_sample("MFT_simplefs.bin")
+        mft = MFT(io.BytesIO(data), _skip_config())
+        self.assertIsNone(mft.bitmap)
+        self.assertEqual([repr(entry) for entry in mft], [repr(entry) for entry in MFT(io.BytesIO(data))])
+
+    def test_unallocated(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            with self.subTest(sample=os.path.basename(sample)):
+                expected = [entry.header.mft_record for entry in MFT(io.BytesIO(data)).unallocated_generator()]
+                self.assertEqual(expected, [entry.header.mft_record for entry in MFT(io.BytesIO(data))
+                                            if entry.is_deleted])
+                mft = MFT(io.BytesIO(data), bitmap_file_pointer=io.BytesIO(_in_use_bitmap(data)))
+                self.assertEqual([entry.header.mft_record for entry in mft.unallocated_generator()], expected)
+
+class _FailingFile(io.BytesIO):
+    '''In memory file that fails once too many records are read'''
+    def __init__(self, data, allowed):
+        super().__init__(data)
+        self.allowed = allowed
+
+    def readinto(self, buffer):
+        self.allowed -= 1
+        if self.allowed < 0:
+            raise OSError("Read failed")
+        return super().readinto(buffer)
+
+def _read_ahead_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "libmft-read-ahead"]
+
+class TestReadAhead(unittest.TestCase):
+    def test_same_entries(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            expected = [repr(entry) for entry in MFT(io.BytesIO(data))]
+            for read_ahead, read_ahead_size in ((1, RECORD_SIZE), (2, 3 * RECORD_SIZE), (4, 4 * 1024 * 1024)):
+                with self.subTest(sample=os.path.basename(sample), read_ahead=read_ahead,
+                                  read_ahead_size=read_ahead_size):
+                    config = _skip_config(False, read_ahead)
+                    config.read_ahead_size = read_ahead_size
+                    self.assertEqual([repr(entry) for entry in MFT(io.BytesIO(data), config)], expected)
+
+    def test_interrupted(self):
+        config = _skip_config(False, 2)
+        config.read_ahead_size = RECORD_SIZE
+        entries = iter(MFT(io.BytesIO(read_sample("MFT_simplefs.bin")), config))
+        next(entries)
+        self.assertTrue(_read_ahead_threads())
+        entries.close()
+        self.assertFalse(_read_ahead_threads())
+
+    def test_read_error(self):
+        config = _skip_config(False, 2)
+        config.read_ahead_size = 4 * RECORD_SIZE
+        mft = MFT(io.BytesIO(read_sample("MFT_simplefs.bin")), config)
+        mft.file_pointer = _FailingFile(read_sample("MFT_simplefs.bin"), 3)
+        with self.assertRaises(OSError):
+            list(mft)
+        self.assertFalse(_read_ahead_threads())
+
+def _async_config(batch_size):
+    config = MFTConfig()
+    config.async_batch_size = batch_size
+    return config
+
+class TestAsync(unittest.TestCase):
+    def test_aget(self):
+        mft = MFT(io.BytesIO(read_sample("MFT_simplefs.bin")))
+        async def read_all():
+            return await asyncio.gather(*(mft.aget(i) for i in range(mft.total_amount_entries)))
+        entries = asyncio.run(read_all())
+        self.assertEqual([repr(entry) for entry in entries],
+                         [repr(mft[i]) for i in range(mft.total_amount_entries)])
+
+    def test_aget_many(self):
+        data = read_sample("MFT_simplefs.bin")
+        mft = MFT(io.BytesIO(data), _async_config(5))
+        numbers = list(range(mft.total_amount_entries))
+        numbers = numbers[::-3] + numbers[::7] + [0, 0]
+        entries = asyncio.run(mft.aget_many(numbers))
+        reference = MFT(io.BytesIO(data))
+        self.assertEqual([repr(entry) for entry in entries], [repr(reference[i]) for i in numbers])
+
+    def test_aiter_entries(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            with self.subTest(sample=os.path.basename(sample)):
+                mft = MFT(io.BytesIO(data), _async_config(3))
+                async def read_all():
+                    return [entry async for entry in mft.aiter_entries()]
+                self.assertEqual([repr(entry) for entry in asyncio.run(read_all())],
+                                 [repr(entry) for entry in MFT(io.BytesIO(data))])
+
+    def test_aiter_entries_interrupted(self):
+        mft = MFT(io.BytesIO(read_sample("MFT_simplefs.bin")), _async_config(1))
+        async def read_some():
+            entries = mft.aiter_entries()
+            first = [await entries.__anext__() for _ in range(2)]
+            await entries.aclose()
+            return first
+        entries = asyncio.run(asyncio.wait_for(read_some(), 10))
+        self.assertEqual([repr(entry) for entry in entries], [repr(entry) for entry in list(mft)[:2]])
+
+    def test_aiter_entries_error(self):
+        data = read_sample("MFT_simplefs.bin")
+        mft = MFT(io.BytesIO(data), _async_config(2))
+        mft.file_pointer = _FailingFile(data, 5)
+        async def read_all():
+            return [entry async for entry in mft.aiter_entries()]
+        with self.assertRaises(OSError):
+            asyncio.run(asyncio.wait_for(read_all(), 10))
+
+class _CountingFile(io.BytesIO):
+    '''In memory file that counts the calls to readinto'''
+    reads = 0
+
+    def readinto(self, buffer):
+        self.reads += 1
+        return super().readinto(buffer)
+
+class TestGetMany(unittest.TestCase):
+    def _check(self, data, **kwargs):
+        mft = MFT(io.BytesIO(data))
+        numbers = list(range(mft.total_amount_entries))
+        numbers = numbers[::-1] + numbers[5:40:3]
+        expected = [repr(mft[i]) for i in numbers]
+        self.assertEqual([repr(entry) for entry in mft.get_many(numbers, **kwargs)], expected)
+        many = dict(mft.iter_many(numbers, **kwargs))
+        self.assertEqual(sorted(many), sorted(set(numbers)))
+        self.assertEqual([repr(many[i]) for i in numbers], expected)
+
+    def test_samples(self):
+        for sample in SAMPLES:
+            for kwargs in ({}, {"max_gap": 0}, {"max_gap": 2, "max_read": 3 * RECORD_SIZE}):
+                with self.subTest(sample=os.path.basename(sample), **kwargs):
+                    self._check(read_sample(sample), **kwargs)
+
+    def test_extension_records(self):
+        for sample in SAMPLES:
+            data, moved = move_to_extension(read_sample(sample))
+            if not moved:
+                continue
+            for kwargs in ({}, {"max_gap": 0, "max_read": RECORD_SIZE}):
+                with self.subTest(sample=os.path.basename(sample), **kwargs):
+                    self._check(data, **kwargs)
+                    mft = MFT(io.BytesIO(data))
+                    for base in moved:
+                        self.assertEqual(repr(mft.get_many([base], **kwargs)[0]), repr(mft[base]))
+
+    def test_coalesced(self):
+        data = read_sample("MFT_simplefs.bin")
+        mft = MFT(io.BytesIO(data))
+        mft.file_pointer = _CountingFile(data)
+        mft.get_many([40, 30, 33, 31, 45])
+        self.assertEqual(mft.file_pointer.reads, 1)
+        mft.file_pointer = _CountingFile(data)
+        mft.get_many([40, 30, 33, 31, 45], max_gap=2)
+        self.assertEqual(mft.file_pointer.reads, 3)
+        mft.file_pointer = _CountingFile(data)
+        mft.get_many([30, 31, 32, 33], max_read=2 * RECORD_SIZE)
+        self.assertEqual(mft.file_pointer.reads, 2)
+
+    def test_out_of_bounds(self):
+        mft = MFT(io.BytesIO(read_sample("MFT_simplefs.bin")))
+        for number in (-1, mft.total_amount_entries):
+            with self.assertRaises(IndexError):
+                mft.get_many([0, number])
+
+def _header_filters(lsns):
+    '''Returns the filters tested and the equivalent test on an entry'''
+    middle_lsn = sorted(lsns)[len(lsns) // 2]
+    flags = lambda entry: entry.header.usage_flags
+    return ((HeaderFilter(), lambda entry: True),
+            (HeaderFilter(in_use=True), lambda entry: flags(entry) & MftUsageFlags.IN_USE),
+            (HeaderFilter(in_use=False), lambda entry: not flags(entry) & MftUsageFlags.IN_USE),
+            (HeaderFilter(directory=True), lambda entry: flags(entry) & MftUsageFlags.DIRECTORY),
+            (HeaderFilter(in_use=True, directory=False),
+             lambda entry: flags(entry) & MftUsageFlags.IN_USE and not flags(entry) & MftUsageFlags.DIRECTORY),
+            (HeaderFilter(start=10, end=40), lambda entry: 10 <= entry.header.mft_record < 40),
+            (HeaderFilter(min_lsn=middle_lsn), lambda entry: entry.header.lsn >= middle_lsn),
+            (HeaderFilter(max_lsn=middle_lsn), lambda entry: entry.header.lsn <= middle_lsn),
+            (HeaderFilter(has_base=False), lambda entry: True),
+            (HeaderFilter(baad=False), lambda entry: not entry.header.baad),
+            (HeaderFilter(predicate=lambda number, header: number % 3 == 0),
+             lambda entry: entry.header.mft_record % 3 == 0),
+           )
+
+class TestHeaderFilter(unittest.TestCase):
+    def test_samples(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            entries = list(MFT(io.BytesIO(data)))
+            for header_filter, test in _header_filters([entry.header.lsn for entry in entries]):
+                expected = [repr(entry) for entry in entries if test(entry)]
+                with self.subTest(sample=os.path.basename(sample), header_filter=header_filter):
+                    mft = MFT(io.BytesIO(data))
+                    self.assertEqual([repr(entry) for entry in
+                                      mft.splice_generator(0, mft.total_amount_entries, header_filter)], expected)
+                    config = MFTConfig()
+                    config.header_filter = header_filter
+                    self.assertEqual([repr(entry) for entry in MFT(io.BytesIO(data), config)], expected)
+
+    def test_extension_records(self):
+        data, moved = move_to_extension(read_sample("MFT_simplefs.bin"))
+        extensions = set(moved.values())
+        config = MFTConfig()
+        config.create_initial_information = False
+        mft = MFT(io.BytesIO(data), config)
+        numbers = lambda header_filter: {entry.header.mft_record for entry in
+                                         mft.splice_generator(0, mft.total_amount_entries, header_filter)}
+        self.assertEqual(numbers(HeaderFilter(has_base=True)), extensions)
+        self.assertFalse(numbers(HeaderFilter(has_base=False)) & extensions)
+
+    def test_clamp(self):
+        self.assertEqual(HeaderFilter().clamp(5, 50), (5, 50))
+        self.assertEqual(HeaderFilter(start=10, end=20).clamp(5, 50), (10, 20))
+        self.assertEqual(HeaderFilter(start=60).clamp(5, 50), (60, 60))
+
+def _entry_values(entry):
+    '''Returns the values of an EntryView, taken from an entry'''
+    main_fn = entry.get_main_filename_attr()
+    si_attrs = entry.get_attributes(AttrTypes.STANDARD_INFORMATION)
+    stream = entry.get_datastream()
+    return (entry.header.mft_record, entry.header.usage_flags,
+            main_fn.content.name if main_fn is not None else None,
+            main_fn.content.parent_ref if main_fn is not None else None,
+            repr(si_attrs[0].content.timestamps) if si_attrs else None,
+            stream.size if stream is not None else None)
+
+class TestEntryView(unittest.TestCase):
+    def test_samples(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            with self.subTest(sample=os.path.basename(sample)):
+                expected = [_entry_values(entry) for entry in MFT(io.BytesIO(data))]
+                views, values = [], []
+                for view in MFT(io.BytesIO(data)).iter_views():
+                    views.append(view)
+                    values.append((view.record_number, view.flags, view.main_name, view.parent_ref,
+                                   repr(view.si_times) if view.si_times is not None else None,
+                                   view.data_size))
+                self.assertEqual(values, expected)
+                self.assertTrue(all(view is views[0] for view in views))
+                self.assertIsNone(views[0].record_number)
+
+    def test_range(self):
+        mft = MFT(io.BytesIO(read_sample("MFT_simplefs.bin")))
+        numbers = [view.record_number for view in mft.iter_views(10, 30)]
+        self.assertEqual(numbers, [entry.header.mft_record for entry in mft.splice_generator(10, 30)])
+        numbers = [view.record_number for view in mft.iter_views(header_filter=HeaderFilter(directory=True))]
+        self.assertEqual(numbers, [entry.header.mft_record for entry in mft if entry.is_directory])
+
+def _entry_names(entries, include_unnamed=False):
+    '''Returns the rows of iter_names, taken from the entries'''
+    rows = []
+    for entry in entries:
+        main_fn, stream = entry.get_main_filename_attr(), entry.get_datastream()
+        size = stream.size if stream is not None else None
+        header = entry.header
+        if main_fn is not None:
+            content = main_fn.content
+            rows.append((header.mft_record, header.seq_number, content.parent_ref, content.parent_seq,
+                         content.name, int(header.usage_flags), size))
+        elif include_unnamed:
+            rows.append((header.mft_record, header.seq_number, None, None, None, int(header.usage_flags), size))
+    return rows
+
+class TestIterNames(unittest.TestCase):
+    def test_samples(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            entries = list(MFT(io.BytesIO(data)))
+            for include_unnamed in (False, True):
+                with self.subTest(sample=os.path.basename(sample), include_unnamed=include_unnamed):
+                    self.assertEqual(list(MFT(io.BytesIO(data)).iter_names(include_unnamed=include_unnamed)),
+                                     _entry_names(entries, include_unnamed))
+
+    def test_extension_records(self):
+        for attr_type in (AttrTypes.DATA, AttrTypes.FILE_NAME):
+            for sample in SAMPLES:
+                data, moved = move_to_extension(read_sample(sample), attr_type.value)
+                if not moved:
+                    continue
+                expected = _entry_names(MFT(io.BytesIO(data)))
+                for prepass in (True, False):
+                    with self.subTest(sample=os.path.basename(sample), attr_type=attr_type, prepass=prepass):
+                        config = MFTConfig()
+                        config.create_initial_information = prepass
+                        rows = list(MFT(io.BytesIO(data), config).iter_names())
+                        self.assertEqual(rows, expected)
+                        self.assertTrue(set(moved) <= {row[0] for row in rows})
+
+_PROJECTION = {"HEADER" : ["lsn", "usage_flags", "seq_number", "hard_link_count"],
+               "STANDARD_INFORMATION" : ["timestamps.created", "flags", "timestamps.accessed"],
+               "FILE_NAME" : ["name", "parent_ref", "parent_seq", "name_type", "timestamps.changed"],
+               "DATA" : ["size", "init_size"]}
+
+def _entry_projection(entry, projection=_PROJECTION):
+    '''Returns the values of a projection, taken from an entry'''
+    si_attrs = entry.get_attributes(AttrTypes.STANDARD_INFORMATION)
+    main_fn, stream = entry.get_main_filename_attr(), entry.get_datastream()
+    sources = {"HEADER" : entry.header,
+               "STANDARD_INFORMATION" : si_attrs[0].content if si_attrs else None,
+               "FILE_NAME" : main_fn.content if main_fn is not None else None,
+               "DATA" : stream}
+    values = []
+    for source, fields in projection.items():
+        for field in fields:
+            values.append(operator.attrgetter(field)(sources[source]) if sources[source] is not None else None)
+    return values
+
+class TestProjection(unittest.TestCase):
+    def _check(self, data, prepass=True):
+        config = MFTConfig()
+        config.create_initial_information = prepass
+        projection = Projection(_PROJECTION)
+        rows = [(number, list(values)) for number, values in MFT(io.BytesIO(data), config).iter_projection(projection)]
+        self.assertEqual(rows, [(entry.header.mft_record, _entry_projection(entry))
+                                for entry in MFT(io.BytesIO(data))])
+        return rows
+
+    def test_samples(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=os.path.basename(sample)):
+                self._check(read_sample(sample))
+
+    def test_extension_records(self):
+        for attr_type in (AttrTypes.DATA, AttrTypes.FILE_NAME, AttrTypes.STANDARD_INFORMATION):
+            data, moved = move_to_extension(read_sample("MFT_simplefs.bin"), attr_type.value)
+            self.assertTrue(moved)
+            for prepass in (True, False):
+                with self.subTest(attr_type=attr_type, prepass=prepass):
+                    self._check(data, prepass)
+
+    def test_columns(self):
+        projection = Projection({AttrTypes.FILE_NAME : ["name"], "DATA" : ["size"]})
+        self.assertEqual(projection.columns, ("FILE_NAME.name", "DATA.size"))
+        for invalid in ({"VOLUME_NAME" : ["name"]}, {"DATA" : ["name"]}, {"FILE_NAME" : ["bogus"]}):
+            with self.subTest(projection=invalid):
+                with self.assertRaises(ValueError):
+                    Projection(invalid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import io
+import os
+import random
+import struct
+import unittest
+
+from libmft.api import MFT, Attribute
+from libmft.attribute import SecurityDescriptor, BasicACE, ObjectACE, Bitmap
+from libmft.flagsandtypes import AttrTypes, ACEType
+
+from tests.helpers import SAMPLES, RECORD_SIZE, read_sample, _remove_fixup, _attributes
+
+#junk added before the records, so nothing is parsed from offset 0
+_PADDING = b"\xAA" * 13
+
+def _records(data):
+    '''Yields the records in use of an MFT, without the fix up array'''
+    for number in range(len(data) // RECORD_SIZE):
+        record = data[number*RECORD_SIZE:(number+1)*RECORD_SIZE]
+        if record[:4] == b"FILE" and struct.unpack_from("<H", record, 22)[0] & 0x1:
+            yield number, _remove_fixup(record)
+
+class TestParseInPlace(unittest.TestCase):
+    def test_buffer_matches_binary(self):
+        for sample in SAMPLES:
+            for number, record in _records(read_sample(sample)):
+                buffer = memoryview(bytearray(_PADDING) + record)
+                for attr_type, offset, length in _attributes(record):
+                    non_resident = bool(record[offset+8])
+                    with self.subTest(sample=os.path.basename(sample), record=number, attr_type=attr_type):
+                        in_place = Attribute.create_from_buffer(non_resident, True, buffer,
+                                                                offset + len(_PADDING))
+                        copied = Attribute.create_from_binary(non_resident, True,
+                                                              memoryview(record[offset:offset+length]))
+                        self.assertEqual(repr(in_place), repr(copied))
+                        self.assertEqual(len(in_place), length)
+                        if not non_resident:
+                            content_len, content_offset = struct.unpack_from("<IH", record, offset+16)
+                            start = offset + content_offset
+                            content = type(in_place.content).create_from_binary(
+                                memoryview(record[start:start+content_len]))
+                            self.assertEqual(repr(content), repr(in_place.content))
+
+def _sid(*sub_authorities):
+    return bytes([1, len(sub_authorities), 0, 0, 0, 0, 0, 5]) + \
+        struct.pack(f"<{len(sub_authorities)}I", *sub_authorities)
+
+def _descriptor(owner_rid, ace_types=(ACEType.ACCESS_ALLOWED_ACE_TYPE,)):
+    '''Creates a self relative security descriptor with a DACL that has one
+    ACE per type. Object ACEs have both GUIDs.'''
+    owner, group = _sid(21, owner_rid), _sid(32, 544)
+    aces = b""
+    for ace_type in ace_types:
+        if ace_type in (ACEType.ACCESS_ALLOWED_OBJECT_ACE_TYPE, ACEType.ACCESS_DENIED_OBJECT_ACE_TYPE):
+            body = struct.pack("<2I", 0x1F01FF, 3) + bytes(range(32)) + group
+        else:
+            body = struct.pack("<I", 0x1F01FF) + group
+        aces += struct.pack("<BBH", ace_type.value, 0, 4 + len(body)) + body
+    acl = struct.pack("<BxHH2x", 2, 8 + len(aces), len(ace_types)) + aces
+    owner_offset = 20 + len(acl)
+    return struct.pack("<BxH4I", 1, 0x8004, owner_offset, owner_offset + len(owner), 0, 20) + \
+        acl + owner + group
+
+class TestSecurityDescriptor(unittest.TestCase):
+    def test_shared(self):
+        raw = _descriptor(5000)
+        first = SecurityDescriptor.create_from_binary(memoryview(raw))
+        second = SecurityDescriptor.create_from_buffer(memoryview(b"padding" + raw), 7, len(raw))
+        self.assertIs(first, second)
+        self.assertIsNot(SecurityDescriptor.create_from_binary(memoryview(_descriptor(5001))), first)
+
+    def test_samples_shared(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=os.path.basename(sample)):
+                by_raw = {}
+                data = read_sample(sample)
+                for entry in MFT(io.BytesIO(data)):
+                    for attr in entry.get_attributes(AttrTypes.SECURITY_DESCRIPTOR) or []:
+                        record = _remove_fixup(data[entry.header.mft_record*RECORD_SIZE:][:RECORD_SIZE])
+                        offset = [offset for attr_type, offset, _ in _attributes(record) if attr_type == 0x50][0]
+                        content_len, content_offset = struct.unpack_from("<IH", record, offset+16)
+                        raw = bytes(record[offset+content_offset:offset+content_offset+content_len])
+                        self.assertIs(by_raw.setdefault(raw, attr.content), attr.content)
+                self.assertTrue(by_raw)
+
+    def test_lazy_aces(self):
+        descriptor = SecurityDescriptor.create_from_binary(memoryview(_descriptor(5002)))
+        self.assertIsNone(descriptor.dacl._aces)
+        self.assertEqual(descriptor.dacl.ace_count, 1)
+        aces = descriptor.dacl.aces
+        self.assertIsNotNone(descriptor.dacl._aces)
+        self.assertIs(descriptor.dacl.aces, aces)
+        self.assertEqual(str(aces[0].basic_ace.SID), "S-1-5-32-544")
+
+    def test_ace_dispatch(self):
+        types = (ACEType.ACCESS_ALLOWED_ACE_TYPE, ACEType.ACCESS_DENIED_OBJECT_ACE_TYPE,
+                 ACEType.SYSTEM_MANDATORY_LABEL_ACE_TYPE, ACEType.ACCESS_ALLOWED_OBJECT_ACE_TYPE)
+        aces = SecurityDescriptor.create_from_binary(memoryview(_descriptor(5003, types))).dacl.aces
+        self.assertEqual([ace.header.type for ace in aces], list(types))
+        for ace, expected in zip(aces, (BasicACE, ObjectACE, BasicACE, ObjectACE)):
+            with self.subTest(ace_type=ace.header.type):
+                parsed = ace.object_ace if expected is ObjectACE else ace.basic_ace
+                self.assertIsInstance(parsed, expected)
+                self.assertIsNone(ace.basic_ace if expected is ObjectACE else ace.object_ace)
+                self.assertEqual(str(parsed.SID if expected is BasicACE else parsed.sid), "S-1-5-32-544")
+
+def _naive_bits(data):
+    '''Returns the value of each bit of a bitmap'''
+    return [bool(data[index // 8] & (1 << (index % 8))) for index in range(len(data) * 8)]
+
+def _naive_runs(bits, value=True):
+    '''Returns the (start, length) of the runs of bits with a value'''
+    runs = []
+    for index, bit in enumerate(bits):
+        if bit == value:
+            if runs and runs[-1][0] + runs[-1][1] == index:
+                runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+            else:
+                runs.append((index, 1))
+    return runs
+
+def _random_bitmaps(count=200):
+    '''Returns bitmaps mixing zeroed, full and partial bytes'''
+    rand = random.Random(30)
+    bitmaps = [b"", b"\x00", b"\xff", b"\x00" * 5, b"\xff" * 5, b"\x01\x80\xff\x7f"]
+    for _ in range(count):
+        bitmaps.append(bytes(rand.choice((0, 0xFF, rand.randrange(256))) for _ in range(rand.randrange(1, 40))))
+    return bitmaps
+
+class TestBitmap(unittest.TestCase):
+    def test_against_naive(self):
+        for data in _random_bitmaps():
+            with self.subTest(data=data.hex()):
+                bitmap, bits = Bitmap(data), _naive_bits(data)
+                allocated = [index for index, bit in enumerate(bits) if bit]
+                self.assertEqual(list(bitmap.allocated_entries()), allocated)
+                self.assertEqual(list(bitmap.allocated_indexes()), allocated)
+                self.assertEqual(bitmap.allocated_count(), len(allocated))
+                self.assertEqual(bitmap.free_count(), len(bits) - len(allocated))
+                self.assertEqual(bitmap.allocated_runs(), _naive_runs(bits))
+                self.assertEqual(bitmap.free_runs(), _naive_runs(bits, False))
+                self.assertEqual([bitmap.entry_allocated(index) for index in range(len(bits))], bits)
+                self.assertEqual(bitmap.get_next_empty(), bits.index(False) if False in bits else None)
+
+    def test_operations(self):
+        bitmaps = _random_bitmaps(40)
+        for first, second in zip(bitmaps, reversed(bitmaps)):
+            size = max(len(first), len(second))
+            first_bits = _naive_bits(first.ljust(size, b"\x00"))
+            second_bits = _naive_bits(second.ljust(size, b"\x00"))
+            with self.subTest(first=first.hex(), second=second.hex()):
+                for operation, expected in ((Bitmap.__and__, lambda a, b: a and b),
+                                            (Bitmap.__or__, lambda a, b: a or b),
+                                            (Bitmap.__xor__, lambda a, b: a != b),
+                                            (Bitmap.__sub__, lambda a, b: a and not b)):
+                    result = operation(Bitmap(first), Bitmap(second))
+                    self.assertEqual(len(result), size)
+                    self.assertEqual([result.entry_allocated(index) for index in range(size * 8)],
+                                     [expected(a, b) for a, b in zip(first_bits, second_bits)])
+                inverted = ~Bitmap(first)
+                self.assertEqual(list(inverted.allocated_entries()),
+                                 [index for index, bit in enumerate(_naive_bits(first)) if not bit])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import io
+import os
+import gzip
+import json
+import zlib
+import random
+import shutil
+import zipfile
+import tempfile
+import unittest
+
+from libmft.api import MFT
+from libmft.backends import CompressedFile, HintedFile, open_source, open_zip_member
+from libmft.exceptions import MFTError
+
+from tests.helpers import SAMPLES, read_sample
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+def _deflate(data, flush_every=None, wbits=31):
+    '''Compresses with zlib, flushing every ``flush_every`` bytes, as done by
+    pigz or gzip --rsyncable'''
+    compressor, parts = zlib.compressobj(6, zlib.DEFLATED, wbits), []
+    step = flush_every or len(data) + 1
+    for i in range(0, len(data), step):
+        parts.append(compressor.compress(data[i:i+step]))
+        if flush_every:
+            parts.append(compressor.flush(zlib.Z_FULL_FLUSH if i % 2 else zlib.Z_SYNC_FLUSH))
+    parts.append(compressor.flush())
+    return b"".join(parts)
+
+def _entries(file_pointer):
+    return [repr(entry) for entry in MFT(file_pointer)]
+
+def _random_reads(test, stream, plain, count=50):
+    rng = random.Random(len(plain))
+    for _ in range(count):
+        position, size = rng.randrange(len(plain)), rng.randint(1, 70000)
+        stream.seek(position)
+        test.assertEqual(stream.read(size), plain[position:position+size])
+
+class TestCompressedFile(unittest.TestCase):
+    def setUp(self):
+        self.plain = read_sample("MFT_simplefs.bin")
+        self.expected = _entries(io.BytesIO(self.plain))
+
+    def test_gzip(self):
+        source = open_source(io.BytesIO(gzip.compress(self.plain)), seek_interval=32768, block_size=4096)
+        self.assertIsInstance(source, CompressedFile)
+        self.assertEqual(_entries(source), self.expected)
+        _random_reads(self, source, self.plain)
+
+    def test_gzip_members(self):
+        half = len(self.plain) // 2
+        data = gzip.compress(self.plain[:half]) + gzip.compress(self.plain[half:])
+        source = open_source(io.BytesIO(data), block_size=4096)
+        self.assertEqual(_entries(source), self.expected)
+        _random_reads(self, source, self.plain)
+
+    def test_flushed_gzip_index(self):
+        data = _deflate(self.plain, 16384)
+        source = CompressedFile(io.BytesIO(data), "gzip", seek_interval=32768, block_size=4096)
+        self.assertEqual(source.read(), self.plain)
+        index = io.StringIO()
+        source.save_index(index)
+        saved = json.loads(index.getvalue())
+        self.assertEqual(saved["size"], len(self.plain))
+        #the flush points are saved with their window
+        self.assertTrue(any(len(point) == 3 for point in saved["points"]))
+
+        loaded = CompressedFile(io.BytesIO(data), "gzip", seek_interval=32768, block_size=4096)
+        loaded.load_index(io.StringIO(index.getvalue()))
+        self.assertEqual(len(loaded), len(self.plain))
+        _random_reads(self, loaded, self.plain)
+        loaded.seek(0)
+        self.assertEqual(_entries(loaded), self.expected)
+
+    def test_index_codec(self):
+        index = io.StringIO()
+        CompressedFile(io.BytesIO(gzip.compress(self.plain)), "gzip").save_index(index)
+        with self.assertRaises(MFTError):
+            CompressedFile(io.BytesIO(_deflate(self.plain, wbits=-15)), "deflate").load_index(io.StringIO(index.getvalue()))
+
+    def test_raw_deflate(self):
+        source = CompressedFile(io.BytesIO(_deflate(self.plain, 16384, -15)), "deflate", seek_interval=32768)
+        self.assertEqual(_entries(source), self.expected)
+        _random_reads(self, source, self.plain)
+
+    def test_zip(self):
+        for compression in (zipfile.ZIP_DEFLATED, zipfile.ZIP_STORED):
+            with self.subTest(compression=compression):
+                data = io.BytesIO()
+                with zipfile.ZipFile(data, "w", compression) as archive:
+                    archive.writestr("readme.txt", b"not the MFT")
+                    archive.writestr("C/$MFT", self.plain)
+                source = open_source(data)
+                self.assertEqual(_entries(source), self.expected)
+                _random_reads(self, source, self.plain)
+                self.assertEqual(open_zip_member(data, "readme.txt").read(), b"not the MFT")
+
+    def test_uncompressed(self):
+        data = io.BytesIO(self.plain)
+        self.assertIs(open_source(data), data)
+
+    @unittest.skipIf(zstandard is None, "zstandard is not installed")
+    def test_zstd(self):
+        source = open_source(io.BytesIO(zstandard.ZstdCompressor().compress(self.plain)))
+        self.assertEqual(_entries(source), self.expected)
+        _random_reads(self, source, self.plain)
+
+    @unittest.skipIf(lz4 is None, "lz4 is not installed")
+    def test_lz4(self):
+        source = open_source(io.BytesIO(lz4.frame.compress(self.plain)))
+        self.assertEqual(_entries(source), self.expected)
+        _random_reads(self, source, self.plain)
+
+class TestHintedFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_read(self):
+        path = os.path.join(self.temp_dir, "data.bin")
+        data = os.urandom(1024 * 1024 + 123)
+        with open(path, "wb") as data_file:
+            data_file.write(data)
+        for direct in (False, True):
+            with self.subTest(direct=direct):
+                with HintedFile(path, direct=direct, window=65536) as hinted:
+                    self.assertEqual(hinted.read(), data)
+                    self.assertEqual(len(hinted), len(data))
+                    _random_reads(self, hinted, data)
+
+    def test_samples(self):
+        for sample in SAMPLES[:3]:
+            for direct in (False, True):
+                with self.subTest(sample=os.path.basename(sample), direct=direct):
+                    with HintedFile(sample, direct=direct) as hinted:
+                        with open(sample, "rb") as mft_file:
+                            self.assertEqual(_entries(hinted), _entries(mft_file))
+
+if __name__ == '__main__':
+    unittest.main()
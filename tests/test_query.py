@@ -0,0 +1,190 @@
+import io
+import os
+import unittest
+import fnmatch
+import datetime
+
+from libmft.api import MFT
+from libmft.query import Query, ScanBatch, plan_query
+from libmft.flagsandtypes import AttrTypes, MftUsageFlags
+
+from tests.helpers import SAMPLES, read_sample, move_to_extension
+
+def _reference_rows(data):
+    '''Parses every entry of a MFT and returns the values used by the
+    queries, computed directly from the entries.'''
+    mft = MFT(io.BytesIO(data))
+    for entry in mft:
+        fn = entry.get_main_filename_attr()
+        si = entry.get_attributes(AttrTypes.STANDARD_INFORMATION)
+        stream = entry.get_datastream()
+        yield {"record" : entry.header.mft_record,
+               "lsn" : entry.header.lsn,
+               "name" : fn.content.name if fn is not None else None,
+               "path" : mft.get_full_path(fn)[1] if fn is not None else None,
+               "size" : stream.size if stream is not None else None,
+               "deleted" : not entry.header.usage_flags & MftUsageFlags.IN_USE,
+               "directory" : bool(entry.header.usage_flags & MftUsageFlags.DIRECTORY),
+               "created" : si[0].content.timestamps.created if si else None}
+
+def _match(pattern, value):
+    return value is not None and fnmatch.fnmatch(value.lower(), pattern)
+
+_NOV_2017 = datetime.datetime(2017, 11, 1, tzinfo=datetime.timezone.utc)
+
+QUERIES = (
+    ("name:*.txt", lambda row: _match("*.txt", row["name"])),
+    ("name:$* AND NOT directory", lambda row: _match("$*", row["name"]) and not row["directory"]),
+    ("deleted", lambda row: row["deleted"]),
+    ("NOT deleted AND size > 1KB", lambda row: not row["deleted"] and row["size"] is not None and row["size"] > 1024),
+    ("si.created >= 2017-11-01 OR (record >= 30 AND record < 34)",
+        lambda row: (row["created"] is not None and row["created"] >= _NOV_2017) or 30 <= row["record"] < 34),
+    ("record > 5 AND record <= 20 AND lsn >= 1000", lambda row: 5 < row["record"] <= 20 and row["lsn"] >= 1000),
+    ('path:"*\\$extend\\*"', lambda row: _match("*\\$extend\\*", row["path"])),
+    ("size = 0", lambda row: row["size"] == 0),
+)
+
+class TestQuery(unittest.TestCase):
+    def test_samples_exist(self):
+        self.assertTrue(SAMPLES)
+
+    def test_query_matches_full_parse(self):
+        for sample in SAMPLES:
+            with open(sample, "rb") as mft_file:
+                data = mft_file.read()
+            reference = list(_reference_rows(data))
+            mft = MFT(io.BytesIO(data))
+            for query, predicate in QUERIES:
+                with self.subTest(sample=os.path.basename(sample), query=query):
+                    expected = [(row["record"], row["path"]) for row in reference if predicate(row)]
+                    self.assertEqual(list(mft.query(query)), expected)
+
+    def test_query_with_timestamp_index(self):
+        queries = ("si.created >= 2017-11-01", "si.changed < 2017-10-24 AND NOT deleted",
+                   "fn.created = 2017-10-23T19:01:32.863304 OR deleted",
+                   "si.created > 2017-10-23T19:01:32.863304 AND si.created <= 2017-11-09T13:46:00.612306")
+        for sample in SAMPLES:
+            with open(sample, "rb") as mft_file:
+                data = mft_file.read()
+            mft, indexed = MFT(io.BytesIO(data)), MFT(io.BytesIO(data))
+            indexed.build_timestamp_index()
+            for query in queries:
+                with self.subTest(sample=os.path.basename(sample), query=query):
+                    self.assertEqual(list(indexed.query(query, ("record", "si.created"))),
+                                     list(mft.query(query, ("record", "si.created"))))
+
+    def test_plan_rows_match_full_parse(self):
+        columns = ("record", "name", "size", "deleted", "directory")
+        for sample in SAMPLES:
+            with open(sample, "rb") as mft_file:
+                data = mft_file.read()
+            expected = [tuple(row[column] for column in columns) for row in _reference_rows(data)]
+            plan = plan_query(columns)
+            with self.subTest(sample=os.path.basename(sample)):
+                self.assertEqual(plan.engine, "names")
+                self.assertEqual(list(plan.rows(plan.open(io.BytesIO(data)))), expected)
+
+    def test_header_conditions_pushed_down(self):
+        query = Query("record >= 10 AND record < 20 AND NOT deleted AND lsn > 5")
+        header_filter = query.plan.header_filter
+        self.assertEqual((header_filter.start, header_filter.end), (10, 20))
+        self.assertEqual(header_filter.min_lsn, 6)
+        self.assertTrue(header_filter.in_use)
+
+    def test_invalid_syntax(self):
+        for query in ("name:", "AND x", "(deleted", "bogus > 1", "deleted deleted"):
+            with self.subTest(query=query):
+                with self.assertRaises(ValueError):
+                    Query(query)
+
+    def test_invalid_types(self):
+        for query in ("size > abc", "si.created > 10", "name > 5", "deleted > true",
+                      "record:1*", "name_type = bogus", "size = 2024-01-01"):
+            with self.subTest(query=query):
+                with self.assertRaises(ValueError):
+                    Query(query)
+
+    def test_valid_types(self):
+        for query in ("size >= 10MB", "si.created < 2024-01-01T10:00", 'name = "a b.txt"',
+                      "deleted = false", "name_type = dos", "name_type != WIN32"):
+            with self.subTest(query=query):
+                Query(query)
+
+class TestQueryPlan(unittest.TestCase):
+    def test_engine_selection(self):
+        for columns, engine in ((("record", "deleted", "lsn"), "header"),
+                                (("record", "name", "size", "path"), "names"),
+                                (("path", "si.created", "fn.flags"), "projection"),
+                                (("FILE_NAME.reparse_value", ), "projection"),
+                                (("record", "streams"), "full"),
+                                (("entry", ), "full")):
+            with self.subTest(columns=columns):
+                plan = plan_query(columns)
+                self.assertEqual(plan.engine, engine)
+                self.assertEqual(plan.relationships, engine == "full")
+                self.assertEqual(plan.mft_config.create_initial_information, engine == "full")
+                if engine != "full":
+                    self.assertFalse(plan.mft_config.attribute_load_list)
+                    self.assertFalse(plan.header_filter.has_base)
+
+    def test_full_engine_config(self):
+        plan = plan_query(("record", "extents"))
+        self.assertEqual(plan.attributes, {AttrTypes.DATA})
+        self.assertTrue(plan.load_dataruns)
+        self.assertEqual(plan.mft_config.attribute_load_list, {AttrTypes.DATA})
+
+    def test_unknown_column(self):
+        for columns in (("bogus", ), ("FILE_NAME.bogus", )):
+            with self.subTest(columns=columns):
+                with self.assertRaises(ValueError):
+                    plan_query(columns)
+
+    def test_extension_records(self):
+        data, moved = move_to_extension(read_sample("MFT_simplefs.bin"))
+        expected = {}
+        for entry in MFT(io.BytesIO(data)):
+            stream = entry.get_datastream()
+            expected[entry.header.mft_record] = stream.size if stream is not None else None
+        self.assertTrue(all(expected[base] is not None for base in moved))
+        for columns in (("record", "size"), ("record", "size", "si.created"), ("record", "size", "streams")):
+            plan = plan_query(columns)
+            with self.subTest(engine=plan.engine):
+                rows = {row[0] : row[1] for row in plan.rows(plan.open(io.BytesIO(data)))}
+                self.assertEqual(rows, expected)
+
+class TestScanBatch(unittest.TestCase):
+    BATCH = (("name:*.txt", ("path", )),
+             ("deleted", ("record", "name")),
+             ("NOT deleted AND size > 1KB", ("record", "size", "path")),
+             ("si.created >= 2017-11-01 OR (record >= 30 AND record < 34)", ("record", )),
+             ("record > 5 AND record <= 20 AND lsn >= 1000", ("name", "lsn")))
+
+    def test_matches_single_queries(self):
+        for sample in SAMPLES:
+            with open(sample, "rb") as mft_file:
+                data = mft_file.read()
+            mft = MFT(io.BytesIO(data))
+            batch, visited = ScanBatch(), []
+            for query, columns in self.BATCH:
+                batch.add(query, columns)
+            batch.add(None, ("record", "streams"), visited.append)
+            self.assertEqual(len(batch), len(self.BATCH) + 1)
+            self.assertEqual(batch.plan().engine, "full")
+            results = batch.run(mft)
+            with self.subTest(sample=os.path.basename(sample)):
+                for (query, columns), rows in zip(self.BATCH, results):
+                    self.assertEqual(rows, list(mft.query(query, columns)))
+                self.assertIsNone(results[-1])
+                self.assertEqual([row[0] for row in visited], [entry.header.mft_record for entry in mft])
+
+    def test_cheapest_engine(self):
+        batch = ScanBatch()
+        batch.add("deleted", ("record", ))
+        batch.add("size > 10MB", ("record", "name"))
+        plan = batch.plan()
+        self.assertEqual(plan.engine, "names")
+        #the filters are combined, so the deleted records are still read
+        self.assertIsNone(plan.header_filter.in_use)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import io
+import os
+import struct
+import unittest
+
+from libmft.api import MFT
+from libmft.secure import Secure
+from libmft.flagsandtypes import AttrTypes
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "mft_samples", "MFT_simplefs.bin")
+BLOCK_SIZE = 0x40000
+
+def _sid(*sub_authorities):
+    return bytes([1, len(sub_authorities), 0, 0, 0, 0, 0, 5]) + \
+        struct.pack(f"<{len(sub_authorities)}I", *sub_authorities)
+
+def _descriptor(owner_rid):
+    '''Creates a self relative security descriptor with an owner, a group and
+    a DACL with one ACE.'''
+    owner, group = _sid(21, owner_rid), _sid(32, 544)
+    ace = struct.pack("<BBHI", 0, 0, 8 + len(group), 0x1F01FF) + group
+    acl = struct.pack("<BxHH2x", 2, 8 + len(ace), 1) + ace
+    dacl_offset = 20
+    owner_offset = dacl_offset + len(acl)
+    group_offset = owner_offset + len(owner)
+    return struct.pack("<BxH4I", 1, 0x8004, owner_offset, group_offset, 0, dacl_offset) + acl + owner + group
+
+def _create_sds(security_ids, extra_block_ids=()):
+    '''Creates a $SDS stream with one descriptor per security id (owner RID
+    is the security id + 1000). The first block is mirrored and the ids in
+    ``extra_block_ids`` go to the third block.
+
+    Returns:
+        tuple(bytes, dict): The stream and the location of each descriptor
+    '''
+    sds = bytearray(BLOCK_SIZE * 3)
+    locations = {}
+    for block, ids in ((0, security_ids), (2, extra_block_ids)):
+        offset = block * BLOCK_SIZE
+        for security_id in ids:
+            descriptor = _descriptor(security_id + 1000)
+            length = 20 + len(descriptor)
+            struct.pack_into("<2IQI", sds, offset, 0xABC, security_id, offset, length)
+            sds[offset+20:offset+length] = descriptor
+            locations[security_id] = (offset, length)
+            offset += length + (-length % 16)
+    sds[BLOCK_SIZE:BLOCK_SIZE*2] = sds[0:BLOCK_SIZE]
+    return bytes(sds), locations
+
+def _create_sii(locations, record_size=4096):
+    '''Creates a $SII stream with one index record (fixup applied) that has
+    all the locations.'''
+    record = bytearray(record_size)
+    fixup_count = record_size // 512 + 1
+    struct.pack_into("<4s2H16xI", record, 0, b"INDX", 0x28, fixup_count, 0x28)
+    struct.pack_into("<4I", record, 0x18, 0x28, 0, 0, 0)
+    offset = 0x18 + 0x28
+    for security_id, (sds_offset, length) in sorted(locations.items()):
+        struct.pack_into("<2H4x3H2xI2IQI", record, offset, 0x14, 20, 0x28, 4, 0,
+                         security_id, 0xABC, security_id, sds_offset, length)
+        offset += 0x28
+    struct.pack_into("<2H4x3H2x", record, offset, 0, 0, 16, 0, 2) #last entry
+    usn = b"\x01\x00"
+    record[0x28:0x2A] = usn
+    for sector in range(fixup_count - 1):
+        position = 512 * (sector + 1) - 2
+        record[0x2A+2*sector:0x2C+2*sector] = record[position:position+2]
+        record[position:position+2] = usn
+    return bytes(record)
+
+class TestSecure(unittest.TestCase):
+    def test_sds_scan(self):
+        sds, _ = _create_sds((256, 257, 258, 300), (400, ))
+        secure = Secure(io.BytesIO(sds))
+        self.assertEqual(sorted(secure), [256, 257, 258, 300, 400])
+        self.assertEqual(len(secure), 5)
+        self.assertEqual(str(secure[256].owner_sid), "S-1-5-21-1256")
+        self.assertEqual(str(secure[400].owner_sid), "S-1-5-21-1400")
+        self.assertEqual(len(secure[300].dacl.aces), 1)
+        self.assertIsNone(secure.get(9999))
+        self.assertNotIn(9999, secure)
+        with self.assertRaises(KeyError):
+            secure[9999]
+
+    def test_sii_index(self):
+        sds, locations = _create_sds((256, 257, 258, 300))
+        sii = _create_sii(locations)
+        secure = Secure(io.BytesIO(sds), io.BytesIO(sii + bytes(4096)))
+        self.assertEqual(sorted(secure), [256, 257, 258, 300])
+        self.assertEqual(str(secure[258].owner_sid), "S-1-5-21-1258")
+
+    def test_same_descriptor_object(self):
+        sds, _ = _create_sds((256, 257))
+        secure = Secure(io.BytesIO(sds))
+        self.assertIs(secure[256], secure[256])
+
+    def test_entry_security_descriptor(self):
+        with open(SAMPLE, "rb") as mft_file:
+            mft = MFT(io.BytesIO(mft_file.read()))
+        ids = set()
+        for entry in mft:
+            std_info = entry.get_attributes(AttrTypes.STANDARD_INFORMATION)
+            if std_info and std_info[0].content.security_id is not None:
+                ids.add(std_info[0].content.security_id)
+        sds, _ = _create_sds(sorted(ids))
+        secure = Secure(io.BytesIO(sds))
+
+        resolved = 0
+        for entry in mft:
+            std_info = entry.get_attributes(AttrTypes.STANDARD_INFORMATION)
+            if entry.get_attributes(AttrTypes.SECURITY_DESCRIPTOR) or not std_info:
+                continue
+            descriptor = entry.get_security_descriptor(secure)
+            self.assertEqual(str(descriptor.owner_sid), f"S-1-5-21-{std_info[0].content.security_id + 1000}")
+            self.assertIsNone(entry.get_security_descriptor())
+            resolved += 1
+        self.assertTrue(resolved)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import io
+import os
+import tempfile
+import unittest
+
+from libmft.api import MFT
+from libmft.query import PathResolver
+from libmft.timeline import TimelineBuilder, _READ_BUFFER, _WRITE_BUFFER
+
+from tests.helpers import SAMPLES, read_sample
+
+#events allowed in memory before a run file is written
+_EVENTS_BUDGET = 2000
+
+def _spilling_builder(mft, temp_dir, max_runs=2):
+    '''Returns a builder with a budget small enough to write many runs'''
+    reserved = PathResolver(mft).memory_size() + max_runs * _READ_BUFFER + _WRITE_BUFFER
+    return TimelineBuilder(mft, reserved + _EVENTS_BUDGET, temp_dir, max_runs)
+
+class TestTimelineBuilder(unittest.TestCase):
+    def test_sorted(self):
+        for sample in SAMPLES:
+            with self.subTest(sample=os.path.basename(sample)):
+                events = list(TimelineBuilder(MFT(io.BytesIO(read_sample(sample)))).events())
+                self.assertTrue(events)
+                keys = [event[:2] for event in events]
+                self.assertEqual(keys, sorted(keys))
+
+    def test_spill_matches_memory(self):
+        for sample in SAMPLES:
+            data = read_sample(sample)
+            with self.subTest(sample=os.path.basename(sample)), \
+                 tempfile.TemporaryDirectory() as temp_dir:
+                in_memory = TimelineBuilder(MFT(io.BytesIO(data)))
+                spilling = _spilling_builder(MFT(io.BytesIO(data), TimelineBuilder.create_config()),
+                                             temp_dir)
+
+                self.assertEqual(list(spilling.events()), list(in_memory.events()))
+                for write in ("write_csv", "write_bodyfile"):
+                    expected, output = io.StringIO(newline=""), io.StringIO(newline="")
+                    self.assertEqual(getattr(spilling, write)(output),
+                                     getattr(in_memory, write)(expected))
+                    self.assertEqual(output.getvalue(), expected.getvalue())
+                self.assertEqual(os.listdir(temp_dir), [])
+
+    def test_invalid_budget(self):
+        mft = MFT(io.BytesIO(read_sample(SAMPLES[0])))
+        for kwargs in ({"memory_budget": 0}, {"max_runs": 1}):
+            with self.subTest(**kwargs):
+                with self.assertRaises(ValueError):
+                    TimelineBuilder(mft, **kwargs)
+        with self.assertRaises(ValueError):
+            list(TimelineBuilder(mft, memory_budget=1000).events())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,262 @@
+import io
+import os
+import random
+import struct
+import unittest
+
+from types import SimpleNamespace
+
+from libmft.api import MFT, MFTConfig, Datastream
+from libmft.attribute import DataRuns
+from libmft.volume import NTFSVolume, NonResidentStream, ClusterMap
+from libmft.flagsandtypes import AttrFlags, AttrTypes
+from libmft.util.functions import merge_dataruns
+from libmft.exceptions import DataStreamError
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "mft_samples", "MFT_simplefs.bin")
+CLUSTER_SIZE = 4096
+RECORD_SIZE = 1024
+
+def _encode_runs(runs):
+    '''Encodes a list of (length, lcn) as a runlist.'''
+    encoded, previous = b"", 0
+    for length, lcn in runs:
+        length_bytes = length.to_bytes((length.bit_length() + 8) // 8, "little")
+        delta, previous = lcn - previous, lcn
+        size = 1
+        while not -(1 << (8 * size - 1)) <= delta < 1 << (8 * size - 1):
+            size += 1
+        offset_bytes = delta.to_bytes(size, "little", signed=True)
+        encoded += bytes([len(offset_bytes) << 4 | len(length_bytes)]) + length_bytes + offset_bytes
+    return encoded + b"\x00"
+
+def _find_attribute(record, attr_type):
+    '''Returns the offset of the first non resident attribute of a type.'''
+    offset = struct.unpack_from("<H", record, 20)[0]
+    while True:
+        current_type, length = struct.unpack_from("<2I", record, offset)
+        if current_type == 0xFFFFFFFF:
+            raise ValueError(f"Attribute {attr_type:#x} not found")
+        if current_type == attr_type and record[offset+8]:
+            return offset
+        offset += length
+
+def _patch_runlist(record, attr_type, runs, size, end_vcn):
+    '''Replaces the runlist and the sizes of a non resident attribute.'''
+    offset = _find_attribute(record, attr_type)
+    runlist_offset = struct.unpack_from("<H", record, offset + 0x20)[0]
+    encoded = _encode_runs(runs)
+    record[offset+runlist_offset:offset+runlist_offset+len(encoded)] = encoded
+    struct.pack_into("<2Q", record, offset + 0x10, 0, end_vcn)
+    struct.pack_into("<3Q", record, offset + 0x28, size, size, size)
+
+def _create_image(mft, fragments, bitmap, bitmap_lcn=130, total_clusters=140, volume_offset=0):
+    '''Creates the image of a volume with the MFT split in fragments (a list
+    of (cluster count, lcn)) and the $MFT:$BITMAP in one cluster.'''
+    mft = bytearray(mft)
+    record = bytearray(mft[0:RECORD_SIZE])
+    _patch_runlist(record, 0x80, fragments, len(mft), len(mft) // CLUSTER_SIZE - 1)
+    _patch_runlist(record, 0xB0, [(1, bitmap_lcn)], len(bitmap), 0)
+    mft[0:RECORD_SIZE] = record
+
+    image = bytearray(volume_offset + total_clusters * CLUSTER_SIZE)
+    boot_sector = bytearray(512)
+    boot_sector[3:11] = b"NTFS    "
+    struct.pack_into("<HB", boot_sector, 0x0B, 512, 8)
+    struct.pack_into("<3Q", boot_sector, 0x28, total_clusters * 8, fragments[0][1], 2)
+    boot_sector[0x40] = 0xF6 #1024 bytes per record
+    boot_sector[0x44] = 1
+    boot_sector[0x1FE:0x200] = b"\x55\xAA"
+    image[volume_offset:volume_offset+512] = boot_sector
+    position = 0
+    for count, lcn in fragments:
+        start = volume_offset + lcn * CLUSTER_SIZE
+        image[start:start+count*CLUSTER_SIZE] = mft[position:position+count*CLUSTER_SIZE]
+        position += count * CLUSTER_SIZE
+    start = volume_offset + bitmap_lcn * CLUSTER_SIZE
+    image[start:start+len(bitmap)] = bitmap
+    return bytes(image), bytes(mft)
+
+def _read_sample():
+    with open(SAMPLE, "rb") as mft_file:
+        return mft_file.read()
+
+FRAGMENTS = [(40, 10), (24, 60)]
+BITMAP = bytes([0xFF] * 3 + [0x0F] + [0] * 28)
+
+class TestNTFSVolume(unittest.TestCase):
+    def test_mft_from_image(self):
+        for volume_offset in (0, 1024 * 1024):
+            with self.subTest(volume_offset=volume_offset):
+                image, mft = _create_image(_read_sample(), FRAGMENTS, BITMAP, volume_offset=volume_offset)
+                volume = NTFSVolume(io.BytesIO(image), volume_offset=volume_offset)
+                volume.mft_stream.seek(0)
+                self.assertEqual(volume.mft_stream.read(), mft)
+                expected = [repr(entry) for entry in MFT(io.BytesIO(mft))]
+                self.assertEqual([repr(entry) for entry in volume.mft], expected)
+
+    def test_skip_unallocated(self):
+        image, _ = _create_image(_read_sample(), FRAGMENTS, BITMAP)
+        config = MFTConfig()
+        config.skip_unallocated = True
+        volume = NTFSVolume(io.BytesIO(image), config)
+        records = [entry.header.mft_record for entry in volume.mft]
+        self.assertTrue(records)
+        self.assertTrue(all(record < 28 for record in records))
+
+class TestDatastreamOpen(unittest.TestCase):
+    def test_open_non_resident(self):
+        image, mft = _create_image(_read_sample(), FRAGMENTS, BITMAP)
+        volume = NTFSVolume(io.BytesIO(image))
+        stream = volume.mft[0].get_datastream()
+        with stream.open(volume) as content:
+            self.assertEqual(content.read(), mft)
+            for _ in range(200):
+                offset, size = random.randint(0, len(mft)), random.choice((1, 7, 511, 4095, 4097, 20000))
+                content.seek(offset)
+                self.assertEqual(content.read(size), mft[offset:offset+size])
+
+    def test_open_resident(self):
+        image, _ = _create_image(_read_sample(), FRAGMENTS, BITMAP)
+        volume = NTFSVolume(io.BytesIO(image))
+        for entry in volume.mft:
+            for stream in entry.data_streams:
+                if stream.is_resident:
+                    self.assertEqual(stream.open(volume).read(), stream.content)
+
+    def test_compressed_and_encrypted(self):
+        for flag in (AttrFlags.COMPRESSED, AttrFlags.ENCRYPTED):
+            with self.subTest(flag=flag):
+                mft = bytearray(_read_sample())
+                record = 4 * RECORD_SIZE #$AttrDef, non resident
+                offset = record + _find_attribute(mft[record:record+RECORD_SIZE], 0x80)
+                struct.pack_into("<H", mft, offset + 12, flag)
+                image, _ = _create_image(mft, FRAGMENTS, BITMAP)
+                volume = NTFSVolume(io.BytesIO(image))
+                stream = volume.mft[4].get_datastream()
+                self.assertTrue(stream.flags & flag)
+                with self.assertRaises(DataStreamError):
+                    stream.open(volume)
+
+        image, _ = _create_image(_read_sample(), FRAGMENTS, BITMAP)
+        volume = NTFSVolume(io.BytesIO(image))
+        stream = volume.mft[4].get_datastream()
+        self.assertFalse(stream.flags)
+        with stream.open(volume) as content:
+            self.assertEqual(content.read(), image[35*CLUSTER_SIZE:35*CLUSTER_SIZE+stream.size])
+
+class TestNonResidentStream(unittest.TestCase):
+    def test_sparse_and_initialized_size(self):
+        data = bytes(random.getrandbits(8) for _ in range(CLUSTER_SIZE * 30))
+        extents = merge_dataruns([(0, [(2, 3), (3, 5), (1, None), (2, 20)])])
+        size, init_size = 8 * CLUSTER_SIZE - 100, 5 * CLUSTER_SIZE + 10
+        expected = (data[3*CLUSTER_SIZE:8*CLUSTER_SIZE] + bytes(CLUSTER_SIZE) + data[20*CLUSTER_SIZE:22*CLUSTER_SIZE])[:init_size]
+        expected += bytes(size - len(expected))
+        for cache_clusters in (0, 64):
+            with self.subTest(cache_clusters=cache_clusters):
+                stream = NonResidentStream(io.BytesIO(data), extents, CLUSTER_SIZE, size,
+                                           init_size=init_size, cache_clusters=cache_clusters)
+                self.assertEqual(stream.read(), expected)
+                for _ in range(200):
+                    offset, count = random.randint(0, len(expected)), random.choice((1, 100, 4095, 4097, 20000))
+                    stream.seek(offset)
+                    self.assertEqual(stream.read(count), expected[offset:offset+count])
+
+    def test_missing_extents(self):
+        data = bytes(random.getrandbits(8) for _ in range(CLUSTER_SIZE * 30))
+        extents = merge_dataruns([(2, [(3, 5), (1, None)]), (8, [(2, 20)])])
+        stream = NonResidentStream(io.BytesIO(data), extents, CLUSTER_SIZE, 10 * CLUSTER_SIZE)
+        expected = bytes(2 * CLUSTER_SIZE) + data[5*CLUSTER_SIZE:8*CLUSTER_SIZE] + \
+            bytes(3 * CLUSTER_SIZE) + data[20*CLUSTER_SIZE:22*CLUSTER_SIZE]
+        self.assertEqual(stream.read(), expected)
+        self.assertEqual(NonResidentStream(io.BytesIO(data), [], CLUSTER_SIZE, 100).read(), bytes(100))
+
+    def test_get_lcn(self):
+        runs, lcn = [], 1000
+        for _ in range(2000):
+            length = random.randint(1, 5)
+            if random.random() < 0.1:
+                runs.append((length, None))
+            else:
+                lcn += random.choice((0, random.randint(-500, 500)))
+                runs.append((length, lcn))
+                lcn += length
+        stream = Datastream()
+        stream._data_runs = [(0, DataRuns(runs))]
+        vcn = 0
+        for length, lcn in runs:
+            for i in range(length):
+                self.assertEqual(stream.get_lcn(vcn + i), None if lcn is None else lcn + i)
+            vcn += length
+        with self.assertRaises(DataStreamError):
+            stream.get_lcn(vcn)
+
+class _FakeMFT():
+    '''Minimal MFT with entries that have only an unnamed non resident
+    datastream, described by extents.'''
+    def __init__(self, entries):
+        self.mft_config = SimpleNamespace(load_dataruns=True)
+        self._entries = [SimpleNamespace(is_deleted=deleted, header=SimpleNamespace(mft_record=number), attrs={},
+                                         data_streams=[SimpleNamespace(is_resident=False, extents=extents, name=None)])
+                         for number, (extents, deleted) in enumerate(entries)]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+def _brute_force_owners(entries, lcn, count, include_deleted):
+    owners = []
+    for number, (extents, deleted) in enumerate(entries):
+        if deleted and not include_deleted:
+            continue
+        for vcn, start, length in extents:
+            if start < lcn + count and start + length > lcn:
+                owners.append((number, AttrTypes.DATA, None, vcn + max(lcn - start, 0)))
+    return sorted(owners)
+
+class TestClusterMap(unittest.TestCase):
+    def test_overlapping_extents(self):
+        rng = random.Random(1)
+        for _ in range(10):
+            entries = []
+            for _ in range(200):
+                vcn, extents = 0, []
+                for _ in range(rng.randint(1, 3)):
+                    length = rng.randint(1, 50)
+                    extents.append((vcn, rng.randint(0, 2000), length))
+                    vcn += length
+                entries.append((extents, rng.random() < 0.4))
+            for include_deleted in (False, True):
+                cluster_map = ClusterMap(_FakeMFT(entries), include_deleted)
+                for _ in range(200):
+                    lcn, count = rng.randint(0, 2100), rng.randint(1, 30)
+                    self.assertEqual(sorted(cluster_map.find_range(lcn, count)),
+                                     _brute_force_owners(entries, lcn, count, include_deleted))
+                    self.assertEqual(lcn in cluster_map, bool(_brute_force_owners(entries, lcn, 1, include_deleted)))
+
+    def test_find_many(self):
+        entries = [([(0, 10, 5), (5, 100, 5)], False), ([(0, 12, 2)], True), ([(0, 50, 1)], False)]
+        cluster_map = ClusterMap(_FakeMFT(entries), include_deleted=True)
+        self.assertEqual(len(cluster_map), 4)
+        self.assertEqual(cluster_map.find_many([12, 102, 50, 0]),
+                         [[(0, AttrTypes.DATA, None, 2), (1, AttrTypes.DATA, None, 0)],
+                          [(0, AttrTypes.DATA, None, 7)], [(2, AttrTypes.DATA, None, 0)], []])
+
+    def test_sample(self):
+        with open(SAMPLE, "rb") as mft_file:
+            mft = MFT(io.BytesIO(mft_file.read()))
+        cluster_map = ClusterMap(mft)
+        for entry in mft:
+            if entry.is_deleted:
+                continue
+            for stream in entry.data_streams:
+                if stream.is_resident:
+                    continue
+                for vcn, lcn, count in stream.extents:
+                    if lcn is None:
+                        continue
+                    for i in (0, count - 1):
+                        self.assertIn((entry.header.mft_record, AttrTypes.DATA, stream.name, vcn + i),
+                                      cluster_map.find(lcn + i))
+
+if __name__ == '__main__':
+    unittest.main()